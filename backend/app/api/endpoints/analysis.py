@@ -30,7 +30,7 @@ from app.core.reports.report_generator import ReportGenerator, ReportType
 from app.core.rag.rag_system import RAGSystem, get_rag_system
 from app.data.fetchers.polygon_fetcher import PolygonFetcher
 from app.data.fetchers.fmp_fetcher import FMPFetcher
-from app.data.processors.document_processor import DocumentProcessor
+from app.data.processors.document_processor import get_document_processor
 from app.core.utils.monitoring import get_performance_monitor
 from app.core.utils.rate_limiter import get_rate_limiter
 from app.core.utils.caching import cached_async
@@ -40,6 +40,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
+# Rate limiter key for the complete analysis endpoint
+ANALYSIS_RATE_LIMIT_KEY = "analysis.complete"
+
 
 @router.post("/complete", response_model=AnalysisResponse)
 async def run_complete_analysis(
@@ -70,7 +73,7 @@ async def run_complete_analysis(
     
     # Check rate limit
     rate_limiter = get_rate_limiter()
-    if not rate_limiter.check_endpoint_limit("analysis.complete"):
+    if not rate_limiter.check_endpoint_limit(ANALYSIS_RATE_LIMIT_KEY):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
     
     try:
@@ -211,7 +214,7 @@ async def _gather_data(request: AnalysisRequest) -> Dict[str, Any]:
         logger.info(f"Processing documents for {request.company_name}")
         
         if request.documents:
-            processor = DocumentProcessor()
+            processor = get_document_processor()
             processed_docs = []
             
             for doc_path in request.documents:
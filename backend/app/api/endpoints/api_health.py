@@ -48,8 +48,8 @@ async def check_polygon() -> APIStatus:
         from app.data.fetchers.polygon_fetcher import PolygonFetcher
         fetcher = PolygonFetcher(settings.POLYGON_API_KEY)
 
-        # Quick test - fetch ticker details
-        result = fetcher.fetch_ticker_details("AAPL")
+        # Quick test - fetch ticker details, bypassing the details cache
+        result = fetcher.fetch_ticker_details("AAPL", refresh=True)
         latency = (datetime.utcnow() - start).total_seconds() * 1000
 
         if result["success"]:
@@ -131,7 +131,8 @@ async def check_fred() -> APIStatus:
 
     try:
         from app.data.fetchers.fred_fetcher import FREDFetcher
-        fetcher = FREDFetcher(settings.FRED_API_KEY)
+        # No disk cache: the check must actually reach the API
+        fetcher = FREDFetcher(settings.FRED_API_KEY, cache_dir=None)
 
         result = fetcher.fetch_series("GDP")
         latency = (datetime.utcnow() - start).total_seconds() * 1000
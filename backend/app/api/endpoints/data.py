@@ -21,7 +21,7 @@ from app.data.fetchers.fmp_fetcher import FMPFetcher
 from app.data.fetchers.fred_fetcher import FREDFetcher
 from app.data.fetchers.trading_economics_fetcher import TradingEconomicsFetcher
 from app.data.fetchers.reddit_fetcher import RedditFetcher
-from app.data.processors.document_processor import DocumentProcessor
+from app.data.processors.document_processor import get_document_processor
 
 logger = logging.getLogger(__name__)
 
@@ -90,7 +90,7 @@ async def get_fred_data(request: EconomicDataRequest):
                 detail="FRED API key not configured"
             )
         
-        fetcher = FREDFetcher(settings.FRED_API_KEY)
+        fetcher = FREDFetcher(settings.FRED_API_KEY, cache_dir=settings.FRED_CACHE_DIR)
         
         if request.indicator:
             result = fetcher.fetch_indicator(request.indicator)
@@ -169,7 +169,7 @@ async def upload_document(file: UploadFile = File(...)):
     """
     try:
         # Validate file type
-        processor = DocumentProcessor()
+        processor = get_document_processor()
         if not processor.is_supported(file.filename):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -216,7 +216,7 @@ async def process_document(file: UploadFile = File(...)):
             )
         
         # Process the uploaded file
-        processor = DocumentProcessor()
+        processor = get_document_processor()
         result = processor.process(upload_result.file_path)
         
         return DocumentProcessResponse(**result)
@@ -4,6 +4,7 @@ Provides common functionality for all specialized agents.
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
@@ -24,29 +25,23 @@ class AgentRole(str, Enum):
     FINANCIAL_FORENSICS = "financial_forensics"
 
 
+@dataclass(slots=True, eq=False)
 class AgentResponse:
     """Standardized response from an agent."""
     
-    def __init__(
-        self,
-        agent_role: AgentRole,
-        analysis: str,
-        recommendation: str,
-        confidence: float,
-        supporting_data: Dict[str, Any],
-        frameworks_used: List[str],
-        concerns: Optional[List[str]] = None,
-        opportunities: Optional[List[str]] = None
-    ):
-        self.agent_role = agent_role
-        self.analysis = analysis
-        self.recommendation = recommendation
-        self.confidence = confidence
-        self.supporting_data = supporting_data
-        self.frameworks_used = frameworks_used
-        self.concerns = concerns or []
-        self.opportunities = opportunities or []
-        self.timestamp = datetime.utcnow()
+    agent_role: AgentRole
+    analysis: str
+    recommendation: str
+    confidence: float
+    supporting_data: Dict[str, Any]
+    frameworks_used: List[str]
+    concerns: Optional[List[str]] = None
+    opportunities: Optional[List[str]] = None
+    timestamp: datetime = field(init=False, default_factory=datetime.utcnow)
+    
+    def __post_init__(self):
+        self.concerns = self.concerns or []
+        self.opportunities = self.opportunities or []
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert response to dictionary."""
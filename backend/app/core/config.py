@@ -3,7 +3,8 @@ Central configuration module for the Fyn RAG application.
 Loads environment variables and provides application-wide settings.
 """
 
-from typing import List
+from functools import cached_property
+from typing import FrozenSet
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -23,6 +24,11 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = Field(...)
+    DB_POOL_SIZE: int = Field(default=25)
+    DB_MAX_OVERFLOW: int = Field(default=25)
+    DB_POOL_RECYCLE: int = Field(default=1800)  # seconds
+    DB_POOL_TIMEOUT: int = Field(default=30)  # seconds
+    EXTERNAL_POOLER: bool = Field(default=False)  # e.g. PgBouncer in front of Postgres
     
     # OpenAI
     OPENAI_API_KEY: str = Field(...)
@@ -37,6 +43,7 @@ class Settings(BaseSettings):
     # Data Sources - Economic Data
     TRADING_ECONOMICS_API_KEY: str = Field(default="")
     FRED_API_KEY: str = Field(default="")
+    FRED_CACHE_DIR: str = Field(default="")  # Empty disables the FRED disk cache
     
     # Data Sources - Social Media
     REDDIT_CLIENT_ID: str = Field(default="")
@@ -47,10 +54,10 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
     
-    @property
-    def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins string into a list."""
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    @cached_property
+    def cors_origins_list(self) -> FrozenSet[str]:
+        """Parse CORS origins string once into a set for O(1) origin checks."""
+        return frozenset(origin.strip() for origin in self.CORS_ORIGINS.split(","))
 
 
 # Global settings instance
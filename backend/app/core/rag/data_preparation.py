@@ -3,32 +3,27 @@ Data Preparation Module for RAG System.
 Handles semantic chunking of investment frameworks into retrievable units.
 """
 
-import json
 import logging
+from dataclasses import dataclass, field
 from typing import List, Dict, Any
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
 class FrameworkChunk:
     """Represents a semantic chunk of an investment framework."""
     
-    def __init__(
-        self,
-        chunk_id: str,
-        framework_name: str,
-        framework_category: str,
-        chunk_type: str,
-        content: str,
-        metadata: Dict[str, Any]
-    ):
-        self.chunk_id = chunk_id
-        self.framework_name = framework_name
-        self.framework_category = framework_category
-        self.chunk_type = chunk_type
-        self.content = content
-        self.metadata = metadata
+    chunk_id: str
+    framework_name: str
+    framework_category: str
+    chunk_type: str
+    content: str
+    # Excluded from eq/hash so chunks stay hashable despite the dict
+    metadata: Dict[str, Any] = field(compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert chunk to dictionary format."""
@@ -63,13 +58,12 @@ class DataPreparation:
         if not self.kb_path.exists():
             raise FileNotFoundError(f"Knowledge base not found at {self.kb_path}")
         
-        with open(self.kb_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Handle both list (legacy) and dict (enriched) formats
-            if isinstance(data, list):
-                self.frameworks = data
-            else:
-                self.frameworks = data.get("frameworks", [])
+        data = orjson.loads(self.kb_path.read_bytes())
+        # Handle both list (legacy) and dict (enriched) formats
+        if isinstance(data, list):
+            self.frameworks = data
+        else:
+            self.frameworks = data.get("frameworks", [])
         
         logger.info(f"Loaded {len(self.frameworks)} frameworks")
     
@@ -84,95 +78,42 @@ class DataPreparation:
         5. Cross-References & Related Frameworks
         """
         logger.info("Creating semantic chunks from frameworks...")
-        self.chunks = []
         
+        # (chunk_type, content builder, type-specific metadata) per chunk
+        chunk_specs = (
+            ("overview", self._build_overview_chunk,
+             lambda fw: {"description": fw.get("description", "")}),
+            ("metrics", self._build_metrics_chunk,
+             lambda fw: {"has_formulas": bool(fw.get("formulas"))}),
+            ("application", self._build_application_chunk,
+             lambda fw: {"has_case_studies": bool(fw.get("case_studies"))}),
+            ("evaluation", self._build_evaluation_chunk,
+             lambda fw: {}),
+            ("crossref", self._build_crossref_chunk,
+             lambda fw: {"related_frameworks": fw.get("related_frameworks", [])}),
+        )
+        
+        self.chunks = []
         for idx, framework in enumerate(self.frameworks):
             framework_name = framework.get("name", f"Framework_{idx}")
             category = framework.get("category", "Unknown")
             
-            # Chunk 1: Overview & Core Concept
-            overview_content = self._build_overview_chunk(framework)
-            if overview_content:
-                chunk = FrameworkChunk(
-                    chunk_id=f"{framework_name}_overview",
-                    framework_name=framework_name,
-                    framework_category=category,
-                    chunk_type="overview",
-                    content=overview_content,
-                    metadata={
-                        "framework_id": idx,
-                        "category": category,
-                        "description": framework.get("description", "")
-                    }
-                )
-                self.chunks.append(chunk)
-            
-            # Chunk 2: Key Metrics & Formulas
-            metrics_content = self._build_metrics_chunk(framework)
-            if metrics_content:
-                chunk = FrameworkChunk(
-                    chunk_id=f"{framework_name}_metrics",
-                    framework_name=framework_name,
-                    framework_category=category,
-                    chunk_type="metrics",
-                    content=metrics_content,
-                    metadata={
-                        "framework_id": idx,
-                        "category": category,
-                        "has_formulas": bool(framework.get("formulas"))
-                    }
-                )
-                self.chunks.append(chunk)
-            
-            # Chunk 3: Application & Use Cases
-            application_content = self._build_application_chunk(framework)
-            if application_content:
-                chunk = FrameworkChunk(
-                    chunk_id=f"{framework_name}_application",
-                    framework_name=framework_name,
-                    framework_category=category,
-                    chunk_type="application",
-                    content=application_content,
-                    metadata={
-                        "framework_id": idx,
-                        "category": category,
-                        "has_case_studies": bool(framework.get("case_studies"))
-                    }
-                )
-                self.chunks.append(chunk)
-            
-            # Chunk 4: Strengths & Limitations
-            evaluation_content = self._build_evaluation_chunk(framework)
-            if evaluation_content:
-                chunk = FrameworkChunk(
-                    chunk_id=f"{framework_name}_evaluation",
-                    framework_name=framework_name,
-                    framework_category=category,
-                    chunk_type="evaluation",
-                    content=evaluation_content,
-                    metadata={
-                        "framework_id": idx,
-                        "category": category
-                    }
-                )
-                self.chunks.append(chunk)
-            
-            # Chunk 5: Cross-References
-            crossref_content = self._build_crossref_chunk(framework)
-            if crossref_content:
-                chunk = FrameworkChunk(
-                    chunk_id=f"{framework_name}_crossref",
+            for chunk_type, build_content, extra_metadata in chunk_specs:
+                content = build_content(framework)
+                if not content:
+                    continue
+                self.chunks.append(FrameworkChunk(
+                    chunk_id=f"{framework_name}_{chunk_type}",
                     framework_name=framework_name,
                     framework_category=category,
-                    chunk_type="crossref",
-                    content=crossref_content,
+                    chunk_type=chunk_type,
+                    content=content,
                     metadata={
                         "framework_id": idx,
                         "category": category,
-                        "related_frameworks": framework.get("related_frameworks", [])
+                        **extra_metadata(framework)
                     }
-                )
-                self.chunks.append(chunk)
+                ))
         
         logger.info(f"Created {len(self.chunks)} semantic chunks from {len(self.frameworks)} frameworks")
         return self.chunks
@@ -305,8 +246,7 @@ class DataPreparation:
         
         chunks_data = [chunk.to_dict() for chunk in self.chunks]
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(chunks_data, f, indent=2, ensure_ascii=False)
+        output_file.write_bytes(orjson.dumps(chunks_data, option=orjson.OPT_INDENT_2))
         
         logger.info(f"Saved {len(chunks_data)} chunks to {output_file}")
     
@@ -7,12 +7,20 @@ import json
 import logging
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import faiss
-from sentence_transformers import SentenceTransformer
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+# faiss and sentence-transformers (torch) are imported where they are used:
+# they take seconds and hundreds of MB to load, which every API worker would
+# otherwise pay at import time even if it never serves a RAG query.
+if TYPE_CHECKING:
+    import faiss
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Candidates per requested result that the 'int8_refine' index rescores in FP32
+REFINE_K_FACTOR = 4
+
 
 class EmbeddingIndexer:
     """Handles embedding generation and FAISS index creation."""
@@ -20,17 +28,21 @@ class EmbeddingIndexer:
     def __init__(
         self,
         model_name: str = "sentence-transformers/all-mpnet-base-v2",
-        index_type: str = "flatl2"
+        index_type: str = "int8",
+        max_batch_size: int = 64
     ):
         """
         Initialize the embedding indexer.
         
         Args:
             model_name: Name of the sentence-transformers model to use
-            index_type: Type of FAISS index ('flatl2', 'ivfflat', 'hnsw')
+            index_type: Type of FAISS index
+                ('int8', 'int8_refine', 'flatip', 'flatl2', 'ivfflat', 'hnsw')
+            max_batch_size: Number of chunks encoded per forward pass
         """
         self.model_name = model_name
         self.index_type = index_type
+        self.max_batch_size = max_batch_size
         self.model: Optional[SentenceTransformer] = None
         self.index: Optional[faiss.Index] = None
         self.chunks: List[Dict[str, Any]] = []
@@ -38,6 +50,8 @@ class EmbeddingIndexer:
         
     def load_model(self) -> None:
         """Load the sentence-transformers model."""
+        from sentence_transformers import SentenceTransformer
+        
         logger.info(f"Loading embedding model: {self.model_name}")
         self.model = SentenceTransformer(self.model_name)
         logger.info(f"Model loaded. Embedding dimension: {self.model.get_sentence_embedding_dimension()}")
@@ -60,16 +74,22 @@ class EmbeddingIndexer:
         
         logger.info(f"Loaded {len(self.chunks)} chunks")
     
-    def generate_embeddings(self, batch_size: int = 32) -> np.ndarray:
+    def generate_embeddings(self, batch_size: Optional[int] = None) -> np.ndarray:
         """
         Generate embeddings for all chunks.
         
+        Each batch is encoded straight into a preallocated output matrix, so
+        peak memory is the matrix plus one batch rather than the matrix plus
+        every intermediate batch held until the end.
+        
         Args:
-            batch_size: Batch size for embedding generation
+            batch_size: Batch size for embedding generation (defaults to max_batch_size)
             
         Returns:
-            numpy array of embeddings
+            numpy array of L2-normalized embeddings
         """
+        import torch
+        
         if not self.model:
             raise RuntimeError("Model not loaded. Call load_model() first.")
         
@@ -80,25 +100,38 @@ class EmbeddingIndexer:
         
         # Extract content from chunks
         texts = [chunk['content'] for chunk in self.chunks]
+        batch_size = batch_size or self.max_batch_size
         
-        # Generate embeddings in batches
-        self.embeddings = self.model.encode(
-            texts,
-            batch_size=batch_size,
-            show_progress_bar=True,
-            convert_to_numpy=True
+        embeddings = np.empty(
+            (len(texts), self.model.get_sentence_embedding_dimension()),
+            dtype=np.float32
         )
         
+        # Generate embeddings in batches, skipping autograd bookkeeping
+        with torch.inference_mode():
+            for start in range(0, len(texts), batch_size):
+                embeddings[start:start + batch_size] = self.model.encode(
+                    texts[start:start + batch_size],
+                    batch_size=batch_size,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+        
+        self.embeddings = embeddings
+        
         logger.info(f"Generated embeddings with shape: {self.embeddings.shape}")
         return self.embeddings
     
-    def create_index(self) -> faiss.Index:
+    def create_index(self) -> "faiss.Index":
         """
         Create FAISS index from embeddings.
         
         Returns:
             FAISS index object
         """
+        import faiss
+        
         if self.embeddings is None:
             raise RuntimeError("Embeddings not generated. Call generate_embeddings() first.")
         
@@ -107,7 +140,28 @@ class EmbeddingIndexer:
         
         logger.info(f"Creating FAISS index (type: {self.index_type}) with dimension {dimension}")
         
-        if self.index_type == "flatl2":
+        if self.index_type in ("int8", "int8_refine"):
+            # 8-bit scalar quantization - one byte per dimension instead of
+            # four, so the index is 4x smaller with negligible recall loss
+            self.index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2
+            )
+            
+            if self.index_type == "int8_refine":
+                # Two-stage search: INT8 codes shortlist REFINE_K_FACTOR * k
+                # candidates, which are rescored against the FP32 vectors
+                self.index = faiss.IndexRefineFlat(self.index)
+                self.index.k_factor = REFINE_K_FACTOR
+            
+            # Train the per-dimension quantization ranges
+            logger.info("Training INT8 scalar quantizer...")
+            self.index.train(self.embeddings)
+            
+        elif self.index_type == "flatip":
+            # Exact inner product - cosine similarity on the normalized embeddings
+            self.index = faiss.IndexFlatIP(dimension)
+            
+        elif self.index_type == "flatl2":
             # Simple L2 distance index - best for small to medium datasets
             self.index = faiss.IndexFlatL2(dimension)
             
@@ -143,6 +197,8 @@ class EmbeddingIndexer:
         Args:
             index_path: Path to save the index file
         """
+        import faiss
+        
         if self.index is None:
             raise RuntimeError("Index not created. Call create_index() first.")
         
@@ -181,7 +237,7 @@ class EmbeddingIndexer:
         
         logger.info("Metadata saved successfully")
     
-    def load_index(self, index_path: str) -> faiss.Index:
+    def load_index(self, index_path: str) -> "faiss.Index":
         """
         Load FAISS index from disk.
         
@@ -191,6 +247,8 @@ class EmbeddingIndexer:
         Returns:
             Loaded FAISS index
         """
+        import faiss
+        
         logger.info(f"Loading FAISS index from {index_path}")
         self.index = faiss.read_index(index_path)
         logger.info(f"Index loaded. Total vectors: {self.index.ntotal}")
@@ -222,7 +280,9 @@ def build_index(
     index_output_path: str,
     metadata_output_path: str,
     model_name: str = "sentence-transformers/all-mpnet-base-v2",
-    index_type: str = "flatl2"
+    index_type: str = "int8",
+    batch_size: int = 64,
+    model: Optional["SentenceTransformer"] = None
 ) -> None:
     """
     Complete pipeline to build and save FAISS index.
@@ -233,11 +293,20 @@ def build_index(
         metadata_output_path: Path to save metadata
         model_name: Sentence-transformers model name
         index_type: Type of FAISS index
+        batch_size: Number of chunks encoded per forward pass
+        model: Already-loaded sentence-transformers model to reuse (optional)
     """
-    indexer = EmbeddingIndexer(model_name=model_name, index_type=index_type)
+    indexer = EmbeddingIndexer(
+        model_name=model_name,
+        index_type=index_type,
+        max_batch_size=batch_size
+    )
     
     # Load model and chunks
-    indexer.load_model()
+    if model is not None:
+        indexer.model = model
+    else:
+        indexer.load_model()
     indexer.load_chunks(chunks_path)
     
     # Generate embeddings and create index
@@ -264,5 +333,5 @@ if __name__ == "__main__":
         index_output_path=index_path,
         metadata_output_path=metadata_path,
         model_name="sentence-transformers/all-mpnet-base-v2",
-        index_type="flatl2"
+        index_type="int8"
     )
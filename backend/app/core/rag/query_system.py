@@ -6,34 +6,30 @@ Implements two-stage retrieval: FAISS similarity search + CrossEncoder reranking
 import json
 import logging
 import numpy as np
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional
-import faiss
-from sentence_transformers import SentenceTransformer, CrossEncoder
+from typing import TYPE_CHECKING, List, Dict, Any, Tuple, Optional
+
+# Heavy imports (torch via sentence-transformers) are deferred to initialize()
+if TYPE_CHECKING:
+    import faiss
+    from sentence_transformers import SentenceTransformer, CrossEncoder
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
 class RetrievalResult:
     """Represents a single retrieval result."""
     
-    def __init__(
-        self,
-        chunk_id: str,
-        framework_name: str,
-        framework_category: str,
-        chunk_type: str,
-        content: str,
-        score: float,
-        metadata: Dict[str, Any]
-    ):
-        self.chunk_id = chunk_id
-        self.framework_name = framework_name
-        self.framework_category = framework_category
-        self.chunk_type = chunk_type
-        self.content = content
-        self.score = score
-        self.metadata = metadata
+    chunk_id: str
+    framework_name: str
+    framework_category: str
+    chunk_type: str
+    content: str
+    score: float
+    # Excluded from eq/hash so results stay hashable despite the dict
+    metadata: Dict[str, Any] = field(compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert result to dictionary."""
@@ -56,7 +52,8 @@ class QuerySystem:
         index_path: str,
         metadata_path: str,
         embedding_model_name: str = "sentence-transformers/all-mpnet-base-v2",
-        reranker_model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+        reranker_model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        embedding_model: Optional["SentenceTransformer"] = None
     ):
         """
         Initialize the query system.
@@ -66,6 +63,7 @@ class QuerySystem:
             metadata_path: Path to metadata JSON file
             embedding_model_name: Name of embedding model
             reranker_model_name: Name of cross-encoder reranker model
+            embedding_model: Already-loaded embedding model to reuse (optional)
         """
         self.index_path = Path(index_path)
         self.metadata_path = Path(metadata_path)
@@ -73,13 +71,16 @@ class QuerySystem:
         self.reranker_model_name = reranker_model_name
         
         self.index: Optional[faiss.Index] = None
-        self.embedding_model: Optional[SentenceTransformer] = None
+        self.embedding_model: Optional[SentenceTransformer] = embedding_model
         self.reranker: Optional[CrossEncoder] = None
         self.chunks: List[Dict[str, Any]] = []
         self.metadata: Dict[str, Any] = {}
         
     def initialize(self) -> None:
         """Initialize all components of the query system."""
+        import faiss
+        from sentence_transformers import SentenceTransformer, CrossEncoder
+        
         logger.info("Initializing Query System...")
         
         # Load FAISS index
@@ -98,9 +99,10 @@ class QuerySystem:
         self.chunks = self.metadata.get('chunks', [])
         logger.info(f"Metadata loaded. Total chunks: {len(self.chunks)}")
         
-        # Load embedding model
-        logger.info(f"Loading embedding model: {self.embedding_model_name}")
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        # Load embedding model unless one was provided
+        if self.embedding_model is None:
+            logger.info(f"Loading embedding model: {self.embedding_model_name}")
+            self.embedding_model = SentenceTransformer(self.embedding_model_name)
         
         # Load reranker model
         logger.info(f"Loading reranker model: {self.reranker_model_name}")
@@ -160,7 +162,9 @@ class QuerySystem:
             List of (chunk_index, distance) tuples
         """
         # Generate query embedding
-        query_embedding = self.embedding_model.encode([query], convert_to_numpy=True)
+        query_embedding = self.embedding_model.encode(
+            [query], convert_to_numpy=True, normalize_embeddings=True
+        )
         
         # Search FAISS index
         distances, indices = self.index.search(query_embedding, top_k)
@@ -201,29 +205,34 @@ class QuerySystem:
                 pairs.append([query, chunk['content']])
                 chunk_indices.append(idx)
         
+        if not pairs or top_k <= 0:
+            return []
+        
         # Get reranking scores
-        rerank_scores = self.reranker.predict(pairs)
+        rerank_scores = np.asarray(self.reranker.predict(pairs))
+        
+        # Select the top_k scores without sorting every candidate
+        top = np.arange(len(rerank_scores))
+        if len(rerank_scores) > top_k:
+            top = np.argpartition(-rerank_scores, top_k - 1)[:top_k]
+        order = top[np.argsort(-rerank_scores[top], kind="stable")]
         
-        # Create RetrievalResult objects
+        # Create RetrievalResult objects for the selected candidates only
         results = []
-        for idx, score in zip(chunk_indices, rerank_scores):
-            chunk = self.chunks[idx]
+        for position in order:
+            chunk = self.chunks[chunk_indices[position]]
             result = RetrievalResult(
                 chunk_id=chunk['chunk_id'],
                 framework_name=chunk['framework_name'],
                 framework_category=chunk['framework_category'],
                 chunk_type=chunk['chunk_type'],
                 content=chunk['content'],
-                score=float(score),
+                score=float(rerank_scores[position]),
                 metadata=chunk.get('metadata', {})
             )
             results.append(result)
         
-        # Sort by reranking score (descending)
-        results.sort(key=lambda x: x.score, reverse=True)
-        
-        # Return top_k results
-        return results[:top_k]
+        return results
     
     def retrieve_by_category(
         self,
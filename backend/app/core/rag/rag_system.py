@@ -5,14 +5,21 @@ Provides a unified interface for the complete RAG pipeline.
 
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
 from app.core.rag.data_preparation import DataPreparation
 from app.core.rag.embedding_indexer import EmbeddingIndexer, build_index
 from app.core.rag.query_system import QuerySystem, RetrievalResult
+from app.core.utils.caching import generate_cache_key, get_cache_manager
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Seconds a query's results are served from the RAG cache
+QUERY_CACHE_TTL = 300
+
 
 class RAGSystem:
     """
@@ -26,7 +33,9 @@ class RAGSystem:
         index_dir: str,
         embedding_model: str = "sentence-transformers/all-mpnet-base-v2",
         reranker_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
-        index_type: str = "flatl2"
+        index_type: str = "int8",
+        embedding_batch_size: int = 64,
+        embedding_model_instance: Optional["SentenceTransformer"] = None
     ):
         """
         Initialize RAG System.
@@ -37,12 +46,17 @@ class RAGSystem:
             embedding_model: Sentence-transformers model name
             reranker_model: Cross-encoder reranker model name
             index_type: Type of FAISS index
+            embedding_batch_size: Number of chunks encoded per forward pass
+            embedding_model_instance: Already-loaded embedding model to reuse
+                instead of loading embedding_model again (optional)
         """
         self.kb_path = Path(kb_path)
         self.index_dir = Path(index_dir)
         self.embedding_model = embedding_model
         self.reranker_model = reranker_model
         self.index_type = index_type
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_model_instance = embedding_model_instance
         
         # Paths for index artifacts
         self.chunks_path = self.index_dir / "framework_chunks.json"
@@ -51,6 +65,9 @@ class RAGSystem:
         
         self.query_system: Optional[QuerySystem] = None
         self._initialized = False
+        
+        # Modification time of the loaded index, part of the query cache key
+        self._index_mtime_ns: Optional[int] = None
     
     def build_index(self, force_rebuild: bool = False) -> None:
         """
@@ -85,9 +102,14 @@ class RAGSystem:
             index_output_path=str(self.index_path),
             metadata_output_path=str(self.metadata_path),
             model_name=self.embedding_model,
-            index_type=self.index_type
+            index_type=self.index_type,
+            batch_size=self.embedding_batch_size,
+            model=self.embedding_model_instance
         )
         
+        # Cached results were retrieved from the previous index
+        get_cache_manager().get_cache("rag").clear()
+        
         logger.info("Index building complete!")
     
     def initialize(self, auto_build: bool = True) -> None:
@@ -118,9 +140,11 @@ class RAGSystem:
             index_path=str(self.index_path),
             metadata_path=str(self.metadata_path),
             embedding_model_name=self.embedding_model,
-            reranker_model_name=self.reranker_model
+            reranker_model_name=self.reranker_model,
+            embedding_model=self.embedding_model_instance
         )
         self.query_system.initialize()
+        self._index_mtime_ns = self.index_path.stat().st_mtime_ns
         
         self._initialized = True
         logger.info("RAG System initialized successfully!")
@@ -149,18 +173,31 @@ class RAGSystem:
         if not self._initialized:
             raise RuntimeError("RAG System not initialized. Call initialize() first.")
         
+        # Repeat queries skip the embedding and reranking passes entirely
+        cache = get_cache_manager().get_cache("rag")
+        cache_key = "rag_query:" + generate_cache_key(
+            str(self.index_path), self._index_mtime_ns, self.embedding_model,
+            self.reranker_model, query, top_k, category, chunk_type, min_score
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         # Apply filters if specified
         if category:
-            return self.query_system.retrieve_by_category(query, category, top_k)
+            results = self.query_system.retrieve_by_category(query, category, top_k)
         elif chunk_type:
-            return self.query_system.retrieve_by_chunk_type(query, chunk_type, top_k)
+            results = self.query_system.retrieve_by_chunk_type(query, chunk_type, top_k)
         else:
-            return self.query_system.retrieve(
+            results = self.query_system.retrieve(
                 query,
                 top_k=top_k * 4,  # Retrieve more candidates
                 rerank_top_k=top_k,
                 min_score=min_score
             )
+        
+        cache.set(cache_key, tuple(results), ttl=QUERY_CACHE_TTL)
+        return results
     
     def get_framework(self, framework_name: str) -> List[RetrievalResult]:
         """
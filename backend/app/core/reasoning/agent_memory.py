@@ -4,38 +4,50 @@ Provides short-term and long-term memory capabilities.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from collections import deque
-import json
+from collections import defaultdict, deque
+import re
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> set:
+    """Split text into a set of lowercase word tokens."""
+    return set(_TOKEN_RE.findall(text.lower()))
 
+
+@dataclass(slots=True, eq=False)
 class MemoryEntry:
     """Represents a single memory entry."""
     
-    def __init__(
-        self,
-        entry_id: str,
-        entry_type: str,
-        content: Dict[str, Any],
-        importance: float = 0.5,
-        tags: Optional[List[str]] = None
-    ):
-        self.entry_id = entry_id
-        self.entry_type = entry_type  # analysis, decision, feedback, learning
-        self.content = content
-        self.importance = importance  # 0-1 scale
-        self.tags = tags or []
-        self.timestamp = datetime.utcnow()
-        self.access_count = 0
+    entry_id: str
+    entry_type: str  # analysis, decision, feedback, learning
+    content: Dict[str, Any]
+    importance: float = 0.5  # 0-1 scale
+    tags: Optional[List[str]] = None
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    access_count: int = field(init=False, default=0)
+    last_accessed: datetime = field(init=False)
+    
+    def __post_init__(self):
+        self.tags = self.tags or []
         self.last_accessed = self.timestamp
     
-    def access(self) -> None:
-        """Record an access to this memory."""
+    def access(self, now: Optional[datetime] = None) -> None:
+        """
+        Record an access to this memory.
+        
+        Args:
+            now: Access time (defaults to the current UTC time)
+        """
         self.access_count += 1
-        self.last_accessed = datetime.utcnow()
+        self.last_accessed = now or datetime.utcnow()
     
     def calculate_relevance(self, current_time: datetime) -> float:
         """
@@ -59,6 +71,11 @@ class MemoryEntry:
         
         return relevance
     
+    def tokens(self) -> set:
+        """Word tokens of this entry's content values and tags, for search."""
+        text = " ".join(str(value) for value in self.content.values())
+        return _tokenize(text) | _tokenize(" ".join(self.tags))
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -88,7 +105,8 @@ class AgentMemory:
         self,
         agent_id: str,
         short_term_capacity: int = 50,
-        long_term_capacity: int = 500
+        long_term_capacity: int = 500,
+        clock: Callable[[], datetime] = datetime.utcnow
     ):
         """
         Initialize agent memory.
@@ -97,8 +115,10 @@ class AgentMemory:
             agent_id: Unique agent identifier
             short_term_capacity: Max entries in short-term memory
             long_term_capacity: Max entries in long-term memory
+            clock: Source of naive UTC timestamps for entries and relevance
         """
         self.agent_id = agent_id
+        self._clock = clock
         self.short_term_capacity = short_term_capacity
         self.long_term_capacity = long_term_capacity
         
@@ -108,6 +128,10 @@ class AgentMemory:
         # Long-term memory (dict by entry_id)
         self.long_term_memory: Dict[str, MemoryEntry] = {}
         
+        # Inverted index over both memories: token -> entry_ids
+        self._index: Dict[str, set] = defaultdict(set)
+        self._entries: Dict[str, MemoryEntry] = {}
+        
         # Entry counter for unique IDs
         self.entry_counter = 0
         
@@ -140,11 +164,12 @@ class AgentMemory:
             entry_type=entry_type,
             content=content,
             importance=importance,
-            tags=tags
+            tags=tags,
+            timestamp=self._clock()
         )
         
         # Add to short-term memory
-        self.short_term_memory.append(entry)
+        self._append_short_term(entry)
         
         # If important enough, add to long-term memory
         if importance >= 0.7:
@@ -154,6 +179,37 @@ class AgentMemory:
         
         return entry_id
     
+    def _append_short_term(self, entry: MemoryEntry) -> None:
+        """Append to short-term memory, unindexing the entry it evicts."""
+        if len(self.short_term_memory) == self.short_term_capacity:
+            evicted = self.short_term_memory[0]
+            if evicted.entry_id not in self.long_term_memory:
+                self._unindex_entry(evicted)
+        
+        self.short_term_memory.append(entry)
+        self._index_entry(entry)
+    
+    def _index_entry(self, entry: MemoryEntry) -> None:
+        """Add entry to the search index."""
+        if entry.entry_id in self._entries:
+            return
+        
+        self._entries[entry.entry_id] = entry
+        for token in entry.tokens():
+            self._index[token].add(entry.entry_id)
+    
+    def _unindex_entry(self, entry: MemoryEntry) -> None:
+        """Remove entry from the search index."""
+        if self._entries.pop(entry.entry_id, None) is None:
+            return
+        
+        for token in entry.tokens():
+            postings = self._index.get(token)
+            if postings is not None:
+                postings.discard(entry.entry_id)
+                if not postings:
+                    del self._index[token]
+    
     def _add_to_long_term(self, entry: MemoryEntry) -> None:
         """Add entry to long-term memory."""
         self.long_term_memory[entry.entry_id] = entry
@@ -164,7 +220,7 @@ class AgentMemory:
     
     def _prune_long_term_memory(self) -> None:
         """Prune long-term memory to capacity."""
-        current_time = datetime.utcnow()
+        current_time = self._clock()
         
         # Calculate relevance for all entries
         entries_with_relevance = [
@@ -179,10 +235,13 @@ class AgentMemory:
         keep_ids = set(e[0] for e in entries_with_relevance[:self.long_term_capacity])
         
         # Remove low-relevance entries
+        short_term_ids = {entry.entry_id for entry in self.short_term_memory}
         removed = 0
         for entry_id in list(self.long_term_memory.keys()):
             if entry_id not in keep_ids:
-                del self.long_term_memory[entry_id]
+                entry = self.long_term_memory.pop(entry_id)
+                if entry_id not in short_term_ids:
+                    self._unindex_entry(entry)
                 removed += 1
         
         logger.info(f"Pruned {removed} entries from long-term memory")
@@ -204,7 +263,7 @@ class AgentMemory:
         Returns:
             List of relevant memory entries
         """
-        current_time = datetime.utcnow()
+        current_time = self._clock()
         candidates = []
         
         # Collect candidates from both memories
@@ -232,12 +291,43 @@ class AgentMemory:
         
         # Mark as accessed
         for entry in unique_candidates[:limit]:
-            entry.access()
+            entry.access(current_time)
         
         logger.debug(f"Retrieved {len(unique_candidates[:limit])} context entries")
         
         return unique_candidates[:limit]
     
+    def search_memories(self, query: str, limit: int = 10) -> List[MemoryEntry]:
+        """
+        Find memories whose content or tags contain every word of a query.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of entries to return
+            
+        Returns:
+            Matching memory entries, most relevant first
+        """
+        tokens = _tokenize(query)
+        if not tokens:
+            return []
+        
+        # Intersect posting lists, smallest first
+        postings = sorted((self._index.get(token, set()) for token in tokens), key=len)
+        matched_ids = set.intersection(*postings)
+        
+        current_time = self._clock()
+        results = sorted(
+            (self._entries[entry_id] for entry_id in matched_ids),
+            key=lambda e: e.calculate_relevance(current_time),
+            reverse=True
+        )[:limit]
+        
+        for entry in results:
+            entry.access(current_time)
+        
+        return results
+    
     def _matches_filters(
         self,
         entry: MemoryEntry,
@@ -299,7 +389,7 @@ class AgentMemory:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get memory statistics."""
-        current_time = datetime.utcnow()
+        current_time = self._clock()
         
         # Count by type
         type_counts = {}
@@ -323,6 +413,8 @@ class AgentMemory:
         """Clear all memories."""
         self.short_term_memory.clear()
         self.long_term_memory.clear()
+        self._index.clear()
+        self._entries.clear()
         logger.info(f"Cleared all memories for agent {self.agent_id}")
     
     def export_to_json(self) -> str:
@@ -333,11 +425,11 @@ class AgentMemory:
             "long_term_memory": [e.to_dict() for e in self.long_term_memory.values()],
             "statistics": self.get_statistics()
         }
-        return json.dumps(data, indent=2)
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
     
     def import_from_json(self, json_str: str) -> None:
         """Import memories from JSON string."""
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         
         # Clear existing
         self.clear()
@@ -345,12 +437,13 @@ class AgentMemory:
         # Import short-term
         for entry_dict in data.get("short_term_memory", []):
             entry = self._dict_to_entry(entry_dict)
-            self.short_term_memory.append(entry)
+            self._append_short_term(entry)
         
         # Import long-term
         for entry_dict in data.get("long_term_memory", []):
             entry = self._dict_to_entry(entry_dict)
             self.long_term_memory[entry.entry_id] = entry
+            self._index_entry(entry)
         
         logger.info(f"Imported memories for agent {self.agent_id}")
     
@@ -361,9 +454,9 @@ class AgentMemory:
             entry_type=entry_dict["entry_type"],
             content=entry_dict["content"],
             importance=entry_dict["importance"],
-            tags=entry_dict["tags"]
+            tags=entry_dict["tags"],
+            timestamp=datetime.fromisoformat(entry_dict["timestamp"])
         )
-        entry.timestamp = datetime.fromisoformat(entry_dict["timestamp"])
         entry.access_count = entry_dict["access_count"]
         entry.last_accessed = datetime.fromisoformat(entry_dict["last_accessed"])
         return entry
@@ -4,6 +4,7 @@ Implements multi-round debate with conflict resolution and consensus building.
 """
 
 import logging
+from collections import Counter
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
@@ -269,14 +270,15 @@ class DebateSimulator:
         """Identify conflicting positions between agents."""
         conflicts = []
         
-        agents = list(self.agent_responses.items())
+        # Parse each recommendation once rather than once per pair
+        agents = [
+            (role, response.recommendation.split()[0])
+            for role, response in self.agent_responses.items()
+        ]
         
-        for i, (role1, resp1) in enumerate(agents):
-            for role2, resp2 in agents[i+1:]:
+        for i, (role1, rec1) in enumerate(agents):
+            for role2, rec2 in agents[i+1:]:
                 # Check if recommendations conflict
-                rec1 = resp1.recommendation.split()[0]
-                rec2 = resp2.recommendation.split()[0]
-                
                 if self._are_conflicting(rec1, rec2):
                     conflicts.append({
                         "agent1": role1,
@@ -346,7 +348,6 @@ class DebateSimulator:
                           for r in self.agent_responses.values()]
         
         # Count each recommendation
-        from collections import Counter
         counts = Counter(recommendations)
         
         # Consensus if >60% agree
@@ -357,7 +358,6 @@ class DebateSimulator:
     
     def _find_common_items(self, items: List[str]) -> List[str]:
         """Find items mentioned by multiple agents."""
-        from collections import Counter
         counts = Counter(items)
         
         # Return items mentioned by at least 2 agents
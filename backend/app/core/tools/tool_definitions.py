@@ -7,6 +7,7 @@ References:
 - https://platform.claude.com/docs/en/agents-and-tools/tool-use/implement-tool-use
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
@@ -482,6 +483,8 @@ class ToolExecutor:
     # =========================================================================
     # TOOL HANDLERS
     # =========================================================================
+    # Data fetchers are synchronous HTTP clients; handlers run them in worker
+    # threads so concurrent tool calls don't serialize on the event loop.
 
     async def _handle_get_stock_price(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle get_stock_price tool."""
@@ -496,7 +499,7 @@ class ToolExecutor:
             return self._mock_stock_price(ticker)
 
         fetcher = PolygonFetcher(settings.POLYGON_API_KEY)
-        result = fetcher.fetch_ticker_details(ticker)
+        result = await asyncio.to_thread(fetcher.fetch_ticker_details, ticker)
 
         if result["success"]:
             return result["data"]
@@ -518,9 +521,11 @@ class ToolExecutor:
 
         if data_type == "all":
             # Fetch all fundamental data
-            profile = fetcher.fetch_company_profile(ticker)
-            ratios = fetcher.fetch_key_metrics(ticker)
-            growth = fetcher.fetch_financial_growth(ticker)
+            profile, ratios, growth = await asyncio.gather(
+                asyncio.to_thread(fetcher.fetch_company_profile, ticker),
+                asyncio.to_thread(fetcher.fetch_key_metrics, ticker),
+                asyncio.to_thread(fetcher.fetch_financial_growth, ticker)
+            )
 
             return {
                 "profile": profile.get("data", {}),
@@ -528,7 +533,7 @@ class ToolExecutor:
                 "growth": growth.get("data", {})
             }
         else:
-            result = fetcher.fetch_company_profile(ticker)
+            result = await asyncio.to_thread(fetcher.fetch_company_profile, ticker)
             return result.get("data", {})
 
     async def _handle_get_economic_indicators(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -541,15 +546,17 @@ class ToolExecutor:
         if not settings.FRED_API_KEY:
             return self._mock_economic_data(indicators)
 
-        fetcher = FREDFetcher(settings.FRED_API_KEY)
-        results = {}
-
-        for indicator in indicators:
-            result = fetcher.fetch_series(indicator)
-            if result["success"]:
-                results[indicator] = result["data"]
+        fetcher = FREDFetcher(settings.FRED_API_KEY, cache_dir=settings.FRED_CACHE_DIR)
+        series = await asyncio.gather(*(
+            asyncio.to_thread(fetcher.fetch_series, indicator)
+            for indicator in indicators
+        ))
 
-        return results
+        return {
+            indicator: result["data"]
+            for indicator, result in zip(indicators, series)
+            if result["success"]
+        }
 
     async def _handle_get_economic_forecasts(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle get_economic_forecasts tool."""
@@ -562,7 +569,7 @@ class ToolExecutor:
             return self._mock_forecasts(country)
 
         fetcher = TradingEconomicsFetcher(settings.TRADING_ECONOMICS_API_KEY)
-        result = fetcher.fetch_forecasts(country)
+        result = await asyncio.to_thread(fetcher.fetch_forecasts, country)
 
         return result.get("data", {})
 
@@ -582,7 +589,7 @@ class ToolExecutor:
             settings.REDDIT_USER_AGENT
         )
 
-        result = fetcher.fetch_sentiment_snapshot(ticker)
+        result = await asyncio.to_thread(fetcher.fetch_sentiment_snapshot, ticker)
         return result.get("data", {})
 
     async def _handle_query_frameworks(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -784,12 +791,12 @@ class ToolExecutor:
         }
 
 
+_TOOL_INDEX: Dict[str, Dict[str, Any]] = {tool["name"]: tool for tool in INVESTMENT_TOOLS}
+
+
 def get_tool_by_name(name: str) -> Optional[Dict[str, Any]]:
     """Get tool definition by name."""
-    for tool in INVESTMENT_TOOLS:
-        if tool["name"] == name:
-            return tool
-    return None
+    return _TOOL_INDEX.get(name)
 
 
 # Global tool executor instance
@@ -3,14 +3,19 @@ Caching System - Provides caching for expensive operations.
 Supports in-memory and Redis-based caching with TTL.
 """
 
+import copy
 import logging
 import hashlib
+import heapq
+import threading
 import json
 import pickle
+import orjson
 from typing import Any, Optional, Callable
 from datetime import datetime, timedelta
 from functools import wraps
 import time
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -18,21 +23,21 @@ logger = logging.getLogger(__name__)
 class CacheEntry:
     """Represents a cached entry."""
     
-    def __init__(self, value: Any, ttl_seconds: int):
+    def __init__(self, value: Any, ttl_seconds: int, now: Optional[datetime] = None):
         self.value = value
-        self.created_at = datetime.utcnow()
+        self.created_at = now or datetime.utcnow()
         self.expires_at = self.created_at + timedelta(seconds=ttl_seconds)
         self.access_count = 0
         self.last_accessed = self.created_at
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
         """Check if entry has expired."""
-        return datetime.utcnow() > self.expires_at
+        return (now or datetime.utcnow()) > self.expires_at
     
-    def access(self) -> Any:
+    def access(self, now: Optional[datetime] = None) -> Any:
         """Access the cached value."""
         self.access_count += 1
-        self.last_accessed = datetime.utcnow()
+        self.last_accessed = now or datetime.utcnow()
         return self.value
 
 
@@ -44,19 +49,36 @@ class InMemoryCache:
     - Time-to-live (TTL) expiration
     - LRU eviction when capacity reached
     - Statistics tracking
+    - Thread safety, so fetchers can share it across worker threads
     """
     
-    def __init__(self, max_size: int = 1000, default_ttl: int = 3600):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: int = 3600,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        copy_values: bool = False
+    ):
         """
         Initialize cache.
         
         Args:
             max_size: Maximum number of entries
             default_ttl: Default TTL in seconds
+            clock: Source of naive UTC timestamps for entry expiry
+            copy_values: Store and return deep copies, so callers mutating a
+                cached dict cannot change what other callers get
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self.cache: dict[str, CacheEntry] = {}
+        self._clock = clock
+        self._copy_values = copy_values
+        self._lock = threading.Lock()
+        # Insertion order doubles as recency order: oldest entry first
+        self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        # Min-heap of (expires_at, key); entries for deleted or overwritten
+        # keys are left in place and skipped when popped
+        self._expiry_heap: list[tuple[datetime, str]] = []
         self.hits = 0
         self.misses = 0
         
@@ -72,20 +94,25 @@ class InMemoryCache:
         Returns:
             Cached value or None if not found/expired
         """
-        if key not in self.cache:
-            self.misses += 1
-            return None
-        
-        entry = self.cache[key]
-        
-        # Check expiration
-        if entry.is_expired():
-            del self.cache[key]
-            self.misses += 1
-            return None
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            now = self._clock()
+            
+            # Check expiration
+            if entry.is_expired(now):
+                del self.cache[key]
+                self.misses += 1
+                return None
+            
+            self.cache.move_to_end(key)
+            self.hits += 1
+            value = entry.access(now)
         
-        self.hits += 1
-        return entry.access()
+        return copy.deepcopy(value) if self._copy_values else value
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
@@ -99,11 +126,19 @@ class InMemoryCache:
         if ttl is None:
             ttl = self.default_ttl
         
-        # Evict if at capacity
-        if len(self.cache) >= self.max_size and key not in self.cache:
-            self._evict_lru()
+        if self._copy_values:
+            value = copy.deepcopy(value)
+        
+        with self._lock:
+            entry = CacheEntry(value, ttl, self._clock())
+            self.cache[key] = entry
+            self.cache.move_to_end(key)
+            self._push_expiry(key, entry)
+            
+            # Evict if over capacity
+            if len(self.cache) > self.max_size:
+                self._evict_lru()
         
-        self.cache[key] = CacheEntry(value, ttl)
         logger.debug(f"Cached key: {key} (ttl={ttl}s)")
     
     def delete(self, key: str) -> bool:
@@ -116,60 +151,72 @@ class InMemoryCache:
         Returns:
             True if key was deleted
         """
-        if key in self.cache:
-            del self.cache[key]
-            return True
-        return False
+        with self._lock:
+            return self.cache.pop(key, None) is not None
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        self.cache.clear()
-        self.hits = 0
-        self.misses = 0
+        with self._lock:
+            self.cache.clear()
+            self._expiry_heap.clear()
+            self.hits = 0
+            self.misses = 0
         logger.info("Cache cleared")
     
+    def _push_expiry(self, key: str, entry: CacheEntry) -> None:
+        """Schedule an entry's expiry, compacting stale heap items if needed."""
+        if len(self._expiry_heap) > 2 * max(len(self.cache), self.max_size):
+            self._expiry_heap = [(e.expires_at, k) for k, e in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
+        else:
+            heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+    
     def _evict_lru(self) -> None:
         """Evict least recently used entry."""
         if not self.cache:
             return
         
-        # Find LRU entry
-        lru_key = min(
-            self.cache.keys(),
-            key=lambda k: self.cache[k].last_accessed
-        )
-        
-        del self.cache[lru_key]
+        lru_key, _ = self.cache.popitem(last=False)
         logger.debug(f"Evicted LRU key: {lru_key}")
     
     def get_statistics(self) -> dict[str, Any]:
         """Get cache statistics."""
-        total_requests = self.hits + self.misses
-        hit_rate = self.hits / total_requests if total_requests > 0 else 0
+        with self._lock:
+            size = len(self.cache)
+            hits = self.hits
+            misses = self.misses
+        
+        total_requests = hits + misses
+        hit_rate = hits / total_requests if total_requests > 0 else 0
         
         return {
-            "size": len(self.cache),
+            "size": size,
             "max_size": self.max_size,
-            "hits": self.hits,
-            "misses": self.misses,
+            "hits": hits,
+            "misses": misses,
             "hit_rate": hit_rate,
             "total_requests": total_requests
         }
     
     def cleanup_expired(self) -> int:
         """Remove expired entries."""
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if entry.is_expired()
-        ]
+        removed = 0
         
-        for key in expired_keys:
-            del self.cache[key]
+        with self._lock:
+            now = self._clock()
+            
+            # Only entries at the front of the heap can have expired
+            while self._expiry_heap and self._expiry_heap[0][0] < now:
+                _, key = heapq.heappop(self._expiry_heap)
+                entry = self.cache.get(key)
+                if entry is not None and entry.is_expired(now):
+                    del self.cache[key]
+                    removed += 1
         
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired entries")
+        if removed:
+            logger.info(f"Cleaned up {removed} expired entries")
         
-        return len(expired_keys)
+        return removed
 
 
 class CacheManager:
@@ -178,8 +225,9 @@ class CacheManager:
     def __init__(self):
         # Different caches for different data types
         self.embedding_cache = InMemoryCache(max_size=5000, default_ttl=86400)  # 24h
-        self.api_cache = InMemoryCache(max_size=1000, default_ttl=3600)  # 1h
-        self.analysis_cache = InMemoryCache(max_size=500, default_ttl=7200)  # 2h
+        # API responses and analyses are mutable dicts handed to callers
+        self.api_cache = InMemoryCache(max_size=1000, default_ttl=3600, copy_values=True)  # 1h
+        self.analysis_cache = InMemoryCache(max_size=500, default_ttl=7200, copy_values=True)  # 2h
         self.rag_cache = InMemoryCache(max_size=2000, default_ttl=43200)  # 12h
         
         logger.info("Initialized CacheManager")
@@ -216,13 +264,16 @@ class CacheManager:
 
 # Global cache manager
 _cache_manager: Optional[CacheManager] = None
+_cache_manager_lock = threading.Lock()
 
 
 def get_cache_manager() -> CacheManager:
     """Get global cache manager instance."""
     global _cache_manager
     if _cache_manager is None:
-        _cache_manager = CacheManager()
+        with _cache_manager_lock:
+            if _cache_manager is None:
+                _cache_manager = CacheManager()
     return _cache_manager
 
 
@@ -238,16 +289,20 @@ def generate_cache_key(*args, **kwargs) -> str:
         Cache key string
     """
     # Create a stable representation
-    key_data = {
-        "args": args,
-        "kwargs": sorted(kwargs.items())
-    }
+    key_data = [args, sorted(kwargs.items())]
     
-    # Serialize and hash
-    key_str = json.dumps(key_data, sort_keys=True, default=str)
-    key_hash = hashlib.md5(key_str.encode()).hexdigest()
+    # Serialize and hash; orjson rejects a few inputs (e.g. >64-bit ints)
+    # that the stdlib encoder accepts, so fall back to it for those
+    try:
+        key_bytes = orjson.dumps(
+            key_data,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+    except orjson.JSONEncodeError:
+        key_bytes = json.dumps(key_data, sort_keys=True, default=str).encode()
     
-    return key_hash
+    return hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
 
 
 def cached(cache_type: str = "api", ttl: Optional[int] = None):
@@ -5,10 +5,11 @@ Provides metrics collection, alerting, and performance profiling.
 
 import logging
 import time
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, Optional, Callable
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from functools import wraps
+import numpy as np
 import psutil
 import asyncio
 
@@ -34,6 +35,55 @@ class MetricPoint:
         }
 
 
+class SampleWindow:
+    """
+    Fixed-capacity ring buffer of the most recent samples of a metric.
+    
+    Memory stays constant however many samples are recorded, and
+    percentiles are selected with np.partition instead of a full sort.
+    """
+    
+    __slots__ = ("_buf", "_idx", "count")
+    
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize the sample window.
+        
+        Args:
+            capacity: Number of most recent samples retained
+        """
+        self._buf = np.empty(capacity, dtype=np.float64)
+        self._idx = 0
+        self.count = 0
+    
+    def append(self, value: float) -> None:
+        """Record a sample, overwriting the oldest once full."""
+        self._buf[self._idx] = value
+        self._idx = (self._idx + 1) % len(self._buf)
+        if self.count < len(self._buf):
+            self.count += 1
+    
+    def stats(self) -> Dict[str, float]:
+        """Summarize the retained samples."""
+        if not self.count:
+            return {}
+        
+        count = self.count
+        ranks = [count // 2, int(count * 0.95), int(count * 0.99)]
+        values = self._buf[:count]
+        median, p95, p99 = np.partition(values, ranks)[ranks]
+        
+        return {
+            "count": count,
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": float(values.mean()),
+            "median": float(median),
+            "p95": float(p95),
+            "p99": float(p99)
+        }
+
+
 class MetricsCollector:
     """
     Collects and aggregates metrics.
@@ -58,8 +108,8 @@ class MetricsCollector:
         # Storage for different metric types
         self.counters: Dict[str, float] = defaultdict(float)
         self.gauges: Dict[str, float] = {}
-        self.histograms: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
-        self.timers: Dict[str, List[float]] = defaultdict(list)
+        self.histograms: Dict[str, SampleWindow] = defaultdict(SampleWindow)
+        self.timers: Dict[str, SampleWindow] = defaultdict(SampleWindow)
         
         # Time series data
         self.time_series: Dict[str, deque] = defaultdict(lambda: deque(maxlen=10000))
@@ -116,44 +166,14 @@ class MetricsCollector:
     def get_histogram_stats(self, name: str, tags: Optional[Dict[str, str]] = None) -> Dict[str, float]:
         """Get histogram statistics."""
         key = self._make_key(name, tags)
-        values = list(self.histograms.get(key, []))
-        
-        if not values:
-            return {}
-        
-        values_sorted = sorted(values)
-        count = len(values)
-        
-        return {
-            "count": count,
-            "min": values_sorted[0],
-            "max": values_sorted[-1],
-            "mean": sum(values) / count,
-            "median": values_sorted[count // 2],
-            "p95": values_sorted[int(count * 0.95)] if count > 0 else 0,
-            "p99": values_sorted[int(count * 0.99)] if count > 0 else 0
-        }
+        window = self.histograms.get(key)
+        return window.stats() if window else {}
     
     def get_timer_stats(self, name: str, tags: Optional[Dict[str, str]] = None) -> Dict[str, float]:
         """Get timer statistics."""
         key = self._make_key(name, tags)
-        durations = self.timers.get(key, [])
-        
-        if not durations:
-            return {}
-        
-        durations_sorted = sorted(durations)
-        count = len(durations)
-        
-        return {
-            "count": count,
-            "min": durations_sorted[0],
-            "max": durations_sorted[-1],
-            "mean": sum(durations) / count,
-            "median": durations_sorted[count // 2],
-            "p95": durations_sorted[int(count * 0.95)] if count > 0 else 0,
-            "p99": durations_sorted[int(count * 0.99)] if count > 0 else 0
-        }
+        window = self.timers.get(key)
+        return window.stats() if window else {}
     
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all metrics."""
@@ -391,46 +411,46 @@ def track_performance(metric_name: str, tags: Optional[Dict[str, str]] = None):
         metric_name: Name of the metric
         tags: Optional tags
     """
+    # Everything that does not depend on the call is built once here
+    calls_name = f"{metric_name}.calls"
+    success_tags = {**(tags or {}), "status": "success"}
+    failure_tags = {**(tags or {}), "status": "failure"}
+    
+    def record(start_ns: int, success: bool) -> None:
+        """Record the duration and outcome of one call."""
+        metrics = get_performance_monitor().metrics
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+        metrics.record_timer(metric_name, duration, tags)
+        metrics.increment_counter(
+            calls_name, tags=success_tags if success else failure_tags
+        )
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            monitor = get_performance_monitor()
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             success = True
             
             try:
-                result = await func(*args, **kwargs)
-                return result
-            except Exception as e:
+                return await func(*args, **kwargs)
+            except Exception:
                 success = False
                 raise
             finally:
-                duration = time.time() - start_time
-                monitor.metrics.record_timer(metric_name, duration, tags)
-                monitor.metrics.increment_counter(
-                    f"{metric_name}.calls",
-                    tags={**(tags or {}), "status": "success" if success else "failure"}
-                )
+                record(start_ns, success)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            monitor = get_performance_monitor()
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             success = True
             
             try:
-                result = func(*args, **kwargs)
-                return result
-            except Exception as e:
+                return func(*args, **kwargs)
+            except Exception:
                 success = False
                 raise
             finally:
-                duration = time.time() - start_time
-                monitor.metrics.record_timer(metric_name, duration, tags)
-                monitor.metrics.increment_counter(
-                    f"{metric_name}.calls",
-                    tags={**(tags or {}), "status": "success" if success else "failure"}
-                )
+                record(start_ns, success)
         
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
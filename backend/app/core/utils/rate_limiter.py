@@ -4,10 +4,11 @@ Implements token bucket and sliding window algorithms.
 """
 
 import logging
+import threading
 import time
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Optional
 from datetime import datetime, timedelta
-from collections import deque
+from collections import OrderedDict
 import asyncio
 
 logger = logging.getLogger(__name__)
@@ -20,26 +21,34 @@ class TokenBucket:
     Allows bursts while maintaining average rate limit.
     """
     
-    def __init__(self, capacity: int, refill_rate: float):
+    __slots__ = ("capacity", "refill_rate", "tokens", "last_refill", "_clock", "_lock")
+    
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize token bucket.
         
         Args:
             capacity: Maximum number of tokens
             refill_rate: Tokens added per second
+            clock: Monotonic source of seconds used for refills
         """
         self.capacity = capacity
         self.refill_rate = refill_rate
         self.tokens = capacity
-        self.last_refill = time.time()
+        # Monotonic clock so wall-clock adjustments cannot drain or flood the bucket
+        self._clock = clock
+        self.last_refill = clock()
+        self._lock = threading.Lock()
     
     def _refill(self) -> None:
         """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_refill
-        tokens_to_add = elapsed * self.refill_rate
-        
-        self.tokens = min(self.capacity, self.tokens + tokens_to_add)
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
         self.last_refill = now
     
     def consume(self, tokens: int = 1) -> bool:
@@ -52,12 +61,13 @@ class TokenBucket:
         Returns:
             True if tokens were consumed, False if rate limited
         """
-        self._refill()
-        
-        if self.tokens >= tokens:
-            self.tokens -= tokens
-            return True
-        return False
+        with self._lock:
+            self._refill()
+            
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
     
     def wait_time(self, tokens: int = 1) -> float:
         """
@@ -69,12 +79,14 @@ class TokenBucket:
         Returns:
             Wait time in seconds
         """
-        self._refill()
-        
-        if self.tokens >= tokens:
-            return 0.0
+        with self._lock:
+            self._refill()
+            
+            if self.tokens >= tokens:
+                return 0.0
+            
+            tokens_needed = tokens - self.tokens
         
-        tokens_needed = tokens - self.tokens
         wait_seconds = tokens_needed / self.refill_rate
         return wait_seconds
 
@@ -84,26 +96,54 @@ class SlidingWindowCounter:
     Sliding Window Counter rate limiter.
     
     More accurate than fixed window, prevents bursts at window boundaries.
+    The window is split into fixed sub-buckets holding request counts, so
+    memory and cleanup cost depend on the bucket count, not request volume.
+    A running total of the bucket counts keeps each check O(1).
     """
     
-    def __init__(self, max_requests: int, window_seconds: int):
+    __slots__ = (
+        "max_requests", "window_seconds", "buckets", "bucket_seconds",
+        "_counts", "_total", "_current_bucket", "_clock", "_lock"
+    )
+    
+    def __init__(
+        self,
+        max_requests: int,
+        window_seconds: int,
+        buckets: int = 10,
+        clock: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize sliding window counter.
         
         Args:
             max_requests: Maximum requests in window
             window_seconds: Window size in seconds
+            buckets: Number of sub-buckets the window is divided into
+            clock: Monotonic source of seconds used to place requests in buckets
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: deque = deque()
+        self.buckets = buckets
+        self.bucket_seconds = window_seconds / buckets
+        self._counts = [0] * buckets
+        self._total = 0
+        # Monotonic clock so wall-clock adjustments cannot skew the window
+        self._clock = clock
+        self._current_bucket = int(clock() / self.bucket_seconds)
+        self._lock = threading.Lock()
     
-    def _cleanup_old_requests(self) -> None:
-        """Remove requests outside the current window."""
-        cutoff_time = time.time() - self.window_seconds
-        
-        while self.requests and self.requests[0] < cutoff_time:
-            self.requests.popleft()
+    def _advance(self) -> None:
+        """Zero the sub-buckets that have rotated out of the current window."""
+        bucket = int(self._clock() / self.bucket_seconds)
+        elapsed = bucket - self._current_bucket
+        
+        if elapsed > 0:
+            for offset in range(1, min(elapsed, self.buckets) + 1):
+                slot = (self._current_bucket + offset) % self.buckets
+                self._total -= self._counts[slot]
+                self._counts[slot] = 0
+            self._current_bucket = bucket
     
     def is_allowed(self) -> bool:
         """
@@ -112,12 +152,14 @@ class SlidingWindowCounter:
         Returns:
             True if allowed, False if rate limited
         """
-        self._cleanup_old_requests()
-        
-        if len(self.requests) < self.max_requests:
-            self.requests.append(time.time())
-            return True
-        return False
+        with self._lock:
+            self._advance()
+            
+            if self._total < self.max_requests:
+                self._counts[self._current_bucket % self.buckets] += 1
+                self._total += 1
+                return True
+            return False
     
     def wait_time(self) -> float:
         """
@@ -126,14 +168,20 @@ class SlidingWindowCounter:
         Returns:
             Wait time in seconds
         """
-        self._cleanup_old_requests()
-        
-        if len(self.requests) < self.max_requests:
-            return 0.0
-        
-        # Wait until oldest request expires
-        oldest_request = self.requests[0]
-        wait_seconds = (oldest_request + self.window_seconds) - time.time()
+        with self._lock:
+            self._advance()
+            
+            if self._total < self.max_requests:
+                return 0.0
+            
+            # Wait until the oldest non-empty bucket leaves the window
+            oldest_bucket = self._current_bucket
+            for offset in range(self.buckets - 1, -1, -1):
+                if self._counts[(self._current_bucket - offset) % self.buckets]:
+                    oldest_bucket = self._current_bucket - offset
+                    break
+        
+        wait_seconds = (oldest_bucket + self.buckets) * self.bucket_seconds - self._clock()
         return max(0.0, wait_seconds)
 
 
@@ -148,9 +196,14 @@ class RateLimiter:
     - External API quota management
     """
     
+    # Maximum number of per-user buckets kept before LRU eviction
+    MAX_TRACKED_USERS = 10000
+    
     def __init__(self):
-        # User rate limiters (per user)
-        self.user_limiters: Dict[str, TokenBucket] = {}
+        # User rate limiters (per user, least recently used first); the lock
+        # guards the LRU reordering and eviction across request threads
+        self.user_limiters: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._user_limiters_lock = threading.Lock()
         
         # Endpoint rate limiters (per endpoint)
         self.endpoint_limiters: Dict[str, SlidingWindowCounter] = {}
@@ -217,14 +270,24 @@ class RateLimiter:
         Returns:
             True if allowed, False if rate limited
         """
-        if user_id not in self.user_limiters:
-            # Default: 100 requests per minute per user
-            self.user_limiters[user_id] = TokenBucket(
-                capacity=100,
-                refill_rate=100 / 60
-            )
-        
-        limiter = self.user_limiters[user_id]
+        with self._user_limiters_lock:
+            limiter = self.user_limiters.get(user_id)
+            
+            if limiter is None:
+                # Default: 100 requests per minute per user
+                limiter = TokenBucket(
+                    capacity=100,
+                    refill_rate=100 / 60
+                )
+                self.user_limiters[user_id] = limiter
+                
+                # Evict least recently seen users to bound memory
+                if len(self.user_limiters) > self.MAX_TRACKED_USERS:
+                    self.user_limiters.popitem(last=False)
+            else:
+                self.user_limiters.move_to_end(user_id)
+        
+        # The bucket has its own lock
         allowed = limiter.consume(tokens)
         
         if not allowed:
@@ -232,6 +295,27 @@ class RateLimiter:
         
         return allowed
     
+    def register_endpoints(
+        self,
+        endpoints: Iterable[str],
+        max_requests: int = 1000,
+        window_seconds: int = 60
+    ) -> None:
+        """
+        Pre-allocate rate limiters for known endpoints.
+        
+        Args:
+            endpoints: Endpoint identifiers
+            max_requests: Maximum requests per window (default: 1000/min)
+            window_seconds: Window size in seconds
+        """
+        for endpoint in endpoints:
+            if endpoint not in self.endpoint_limiters:
+                self.endpoint_limiters[endpoint] = SlidingWindowCounter(
+                    max_requests=max_requests,
+                    window_seconds=window_seconds
+                )
+    
     def check_endpoint_limit(self, endpoint: str) -> bool:
         """
         Check if endpoint is within rate limit.
@@ -242,14 +326,13 @@ class RateLimiter:
         Returns:
             True if allowed, False if rate limited
         """
-        if endpoint not in self.endpoint_limiters:
-            # Default: 1000 requests per minute per endpoint
-            self.endpoint_limiters[endpoint] = SlidingWindowCounter(
-                max_requests=1000,
-                window_seconds=60
-            )
+        limiter = self.endpoint_limiters.get(endpoint)
+        
+        if limiter is None:
+            # Fallback for endpoints not registered at startup
+            self.register_endpoints([endpoint])
+            limiter = self.endpoint_limiters[endpoint]
         
-        limiter = self.endpoint_limiters[endpoint]
         allowed = limiter.is_allowed()
         
         if not allowed:
@@ -5,11 +5,26 @@ Provides common functionality and interface for data retrieval.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# HTTP session shared by all fetchers, created on first use
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _utc_now_iso() -> str:
+    """Return the current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
 
 class BaseFetcher(ABC):
     """Abstract base class for data fetchers."""
@@ -24,6 +39,41 @@ class BaseFetcher(ABC):
         self.api_key = api_key
         self._validate_credentials()
     
+    @classmethod
+    def _shared_session(cls) -> requests.Session:
+        """
+        Get the HTTP session shared across fetchers.
+        
+        Keeps one keep-alive connection pool for the whole data layer and
+        retries transient failures on idempotent requests.
+        
+        Returns:
+            Shared requests session
+        """
+        global _SESSION
+        
+        if _SESSION is None:
+            with _SESSION_LOCK:
+                if _SESSION is None:
+                    retry = Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=("GET",)
+                    )
+                    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+                    
+                    session = requests.Session()
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    
+                    # Advertise every encoding urllib3 can decode here
+                    # (brotli is included when the package is installed)
+                    session.headers.update(make_headers(accept_encoding=True))
+                    _SESSION = session
+        
+        return _SESSION
+    
     @abstractmethod
     def _validate_credentials(self) -> None:
         """Validate that required credentials are present."""
@@ -59,7 +109,7 @@ class BaseFetcher(ABC):
             "success": False,
             "error": str(error),
             "source": source,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_now_iso()
         }
     
     def _success_response(self, data: Any, source: str, metadata: Optional[Dict] = None) -> Dict[str, Any]:
@@ -78,7 +128,7 @@ class BaseFetcher(ABC):
             "success": True,
             "data": data,
             "source": source,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_now_iso()
         }
         
         if metadata:
@@ -5,8 +5,11 @@ Retrieves fundamental financial data, ratios, and company information.
 
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from typing import Dict, Any, Optional, List
 
+from app.core.utils.caching import get_cache_manager
 from app.data.fetchers.base_fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
@@ -17,6 +20,21 @@ class FMPFetcher(BaseFetcher):
     
     BASE_URL = "https://financialmodelingprep.com/api/v3"
     
+    # Comprehensive fetches are cached per (ticker, day) for one hour
+    COMPREHENSIVE_CACHE_TTL = 3600
+    
+    # Response shape per endpoint: "first" unwraps the single-record list
+    _ENDPOINT_SHAPES = {
+        "profile": "first",
+        "income-statement": "list",
+        "balance-sheet-statement": "list",
+        "cash-flow-statement": "list",
+        "key-metrics": "list",
+        "ratios": "list",
+        "financial-growth": "list",
+        "discounted-cash-flow": "list"
+    }
+    
     def __init__(self, api_key: str):
         """
         Initialize FMP fetcher.
@@ -54,6 +72,25 @@ class FMPFetcher(BaseFetcher):
         
         return response.json()
     
+    def _fetch(self, endpoint: str, ticker: str, params: Optional[Dict] = None) -> Any:
+        """
+        Request a per-ticker endpoint and parse it by its declared shape.
+        
+        Args:
+            endpoint: API endpoint (without ticker)
+            ticker: Stock ticker symbol
+            params: Query parameters
+            
+        Returns:
+            Parsed response data
+        """
+        data = self._make_request(f"{endpoint}/{ticker}", params)
+        
+        # Error payloads are dicts, e.g. {"Error Message": ...}; pass them through
+        if self._ENDPOINT_SHAPES[endpoint] == "first" and isinstance(data, list) and data:
+            return data[0]
+        return data
+    
     def fetch(self, **kwargs) -> Dict[str, Any]:
         """Generic fetch method."""
         raise NotImplementedError("Use specific fetch methods")
@@ -71,12 +108,7 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "profile"})
         
         try:
-            data = self._make_request(f"profile/{ticker}")
-            
-            if isinstance(data, list) and len(data) > 0:
-                profile = data[0]
-            else:
-                profile = data
+            profile = self._fetch("profile", ticker)
             
             return self._success_response(profile, "FMP Company Profile")
             
@@ -103,8 +135,9 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "income_statement", "period": period})
         
         try:
-            data = self._make_request(
-                f"income-statement/{ticker}",
+            data = self._fetch(
+                "income-statement",
+                ticker,
                 params={"period": period, "limit": limit}
             )
             
@@ -133,8 +166,9 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "balance_sheet", "period": period})
         
         try:
-            data = self._make_request(
-                f"balance-sheet-statement/{ticker}",
+            data = self._fetch(
+                "balance-sheet-statement",
+                ticker,
                 params={"period": period, "limit": limit}
             )
             
@@ -163,8 +197,9 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "cash_flow", "period": period})
         
         try:
-            data = self._make_request(
-                f"cash-flow-statement/{ticker}",
+            data = self._fetch(
+                "cash-flow-statement",
+                ticker,
                 params={"period": period, "limit": limit}
             )
             
@@ -193,8 +228,9 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "key_metrics", "period": period})
         
         try:
-            data = self._make_request(
-                f"key-metrics/{ticker}",
+            data = self._fetch(
+                "key-metrics",
+                ticker,
                 params={"period": period, "limit": limit}
             )
             
@@ -223,8 +259,9 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "ratios", "period": period})
         
         try:
-            data = self._make_request(
-                f"ratios/{ticker}",
+            data = self._fetch(
+                "ratios",
+                ticker,
                 params={"period": period, "limit": limit}
             )
             
@@ -253,8 +290,9 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "growth", "period": period})
         
         try:
-            data = self._make_request(
-                f"financial-growth/{ticker}",
+            data = self._fetch(
+                "financial-growth",
+                ticker,
                 params={"period": period, "limit": limit}
             )
             
@@ -276,7 +314,7 @@ class FMPFetcher(BaseFetcher):
         self._log_fetch("FMP", {"ticker": ticker, "type": "dcf"})
         
         try:
-            data = self._make_request(f"discounted-cash-flow/{ticker}")
+            data = self._fetch("discounted-cash-flow", ticker)
             
             return self._success_response(data, "FMP DCF Valuation")
             
@@ -295,20 +333,41 @@ class FMPFetcher(BaseFetcher):
         """
         self._log_fetch("FMP", {"ticker": ticker, "type": "comprehensive"})
         
+        cache = get_cache_manager().get_cache("api")
+        cache_key = f"fmp_comprehensive:{ticker}:{date.today().isoformat()}"
+        
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+        
         try:
-            data = {
-                "ticker": ticker,
-                "profile": self.fetch_company_profile(ticker).get("data"),
-                "income_statement": self.fetch_income_statement(ticker).get("data"),
-                "balance_sheet": self.fetch_balance_sheet(ticker).get("data"),
-                "cash_flow": self.fetch_cash_flow(ticker).get("data"),
-                "key_metrics": self.fetch_key_metrics(ticker).get("data"),
-                "ratios": self.fetch_financial_ratios(ticker).get("data"),
-                "growth": self.fetch_financial_growth(ticker).get("data"),
-                "dcf": self.fetch_dcf(ticker).get("data")
+            sections = {
+                "profile": self.fetch_company_profile,
+                "income_statement": self.fetch_income_statement,
+                "balance_sheet": self.fetch_balance_sheet,
+                "cash_flow": self.fetch_cash_flow,
+                "key_metrics": self.fetch_key_metrics,
+                "ratios": self.fetch_financial_ratios,
+                "growth": self.fetch_financial_growth,
+                "dcf": self.fetch_dcf
             }
             
-            return self._success_response(data, "FMP Comprehensive Data")
+            # Endpoints are independent, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+                results = executor.map(lambda fetch: fetch(ticker), sections.values())
+                data = {"ticker": ticker}
+                complete = True
+                for name, result in zip(sections, results):
+                    data[name] = result.get("data")
+                    complete = complete and result.get("success", False)
+            
+            response = self._success_response(data, "FMP Comprehensive Data")
+            
+            # Don't pin partial results from transient endpoint failures
+            if complete:
+                cache.set(cache_key, response, self.COMPREHENSIVE_CACHE_TTL)
+            
+            return response
             
         except Exception as e:
             return self._handle_error(e, "FMP Comprehensive Data")
@@ -3,10 +3,18 @@ FRED (Federal Reserve Economic Data) Fetcher.
 Retrieves macroeconomic data from the Federal Reserve.
 """
 
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import cached_property
+from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
-from fredapi import Fred
 
 from app.data.fetchers.base_fetcher import BaseFetcher
 
@@ -16,6 +24,8 @@ logger = logging.getLogger(__name__)
 class FREDFetcher(BaseFetcher):
     """Fetcher for FRED economic data."""
     
+    BASE_URL = "https://api.stlouisfed.org/fred"
+    
     # Common economic indicators
     INDICATORS = {
         "gdp": "GDP",
@@ -29,22 +39,153 @@ class FREDFetcher(BaseFetcher):
         "retail_sales": "RSXFS",
         "housing_starts": "HOUST"
     }
+    _INDICATORS_LC = {name.lower(): series_id for name, series_id in INDICATORS.items()}
+    
+    # Upper bound in seconds for the whole economic snapshot
+    SNAPSHOT_TIMEOUT = 15
+    
+    # Per-request (connect, read) timeout in seconds
+    REQUEST_TIMEOUT = (5, 10)
+    
+    # Disk cache TTL in seconds, aligned with each series' release cadence
+    SERIES_CACHE_TTL = {
+        "DFF": 86400,  # Daily
+        "DGS10": 86400,  # Daily
+        "DGS2": 86400,  # Daily
+        "UNRATE": 30 * 86400,  # Monthly
+        "CPIAUCSL": 30 * 86400,  # Monthly
+        "UMCSENT": 30 * 86400,  # Monthly
+        "INDPRO": 30 * 86400,  # Monthly
+        "RSXFS": 30 * 86400,  # Monthly
+        "HOUST": 30 * 86400,  # Monthly
+        "GDP": 90 * 86400  # Quarterly
+    }
+    DEFAULT_CACHE_TTL = 7 * 86400
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_dir: Optional[str] = None):
         """
         Initialize FRED fetcher.
         
         Args:
             api_key: FRED API key
+            cache_dir: Directory for cached series (None, the default, disables caching)
         """
         super().__init__(api_key)
-        self.client = Fred(api_key=api_key)
+        self.session = self._shared_session()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+    
+    @cached_property
+    def client(self):
+        """fredapi client, created on first use."""
+        from fredapi import Fred
+        
+        return Fred(api_key=self.api_key)
     
     def _validate_credentials(self) -> None:
         """Validate FRED API key."""
         if not self.api_key:
             raise ValueError("FRED API key is required")
     
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Make HTTP request to FRED API.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            
+        Returns:
+            JSON response
+        """
+        if params is None:
+            params = {}
+        
+        params["api_key"] = self.api_key
+        params["file_type"] = "json"
+        url = f"{self.BASE_URL}/{endpoint}"
+        
+        response = self.session.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        
+        return orjson.loads(response.content)
+    
+    def _get_series_raw(
+        self,
+        series_id: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Fetch series observations straight from the FRED API.
+        
+        Args:
+            series_id: FRED series ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            
+        Returns:
+            Observation values keyed by date, None for missing values
+        """
+        params = {"series_id": series_id}
+        if start_date:
+            params["observation_start"] = start_date
+        if end_date:
+            params["observation_end"] = end_date
+        
+        data = self._make_request("series/observations", params=params)
+        
+        # FRED marks missing observations with "."
+        return {
+            observation["date"]: None if observation["value"] == "." else float(observation["value"])
+            for observation in data.get("observations", [])
+        }
+    
+    def _cache_path(
+        self,
+        series_id: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Path:
+        """Build the cache file path for a series and date range."""
+        key = hashlib.md5(f"{series_id}:{start_date}:{end_date}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.json"
+    
+    def _read_cache(self, cache_path: Path, series_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read cached series data if present and within its TTL.
+        
+        Args:
+            cache_path: Cache file path
+            series_id: FRED series ID
+            
+        Returns:
+            Cached series data or None if missing/expired
+        """
+        try:
+            with open(cache_path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        ttl = self.SERIES_CACHE_TTL.get(series_id, self.DEFAULT_CACHE_TTL)
+        if time.time() - entry["timestamp"] >= ttl:
+            return None
+        
+        return entry["data"]
+    
+    def _write_cache(self, cache_path: Path, data: Dict[str, Any]) -> None:
+        """Atomically write series data to the cache."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"timestamp": time.time(), "data": data}, f)
+            os.replace(tmp_path, cache_path)
+            
+        except OSError as e:
+            logger.warning(f"Failed to cache FRED series {data['series_id']}: {e}")
+    
     def fetch(self, **kwargs) -> Dict[str, Any]:
         """Generic fetch method."""
         raise NotImplementedError("Use specific fetch methods")
@@ -53,7 +194,8 @@ class FREDFetcher(BaseFetcher):
         self,
         series_id: str,
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        as_pandas: bool = False
     ) -> Dict[str, Any]:
         """
         Fetch a specific economic data series.
@@ -62,12 +204,49 @@ class FREDFetcher(BaseFetcher):
             series_id: FRED series ID
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
+            as_pandas: Return the observations as a pandas Series via fredapi
             
         Returns:
             Series data
         """
         self._log_fetch("FRED", {"series_id": series_id})
         
+        if as_pandas:
+            return self._fetch_series_pandas(series_id, start_date, end_date)
+        
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = self._cache_path(series_id, start_date, end_date)
+            cached_data = self._read_cache(cache_path, series_id)
+            if cached_data is not None:
+                return self._success_response(cached_data, "FRED Series")
+        
+        try:
+            observations = self._get_series_raw(series_id, start_date, end_date)
+            latest_date = next(reversed(observations), None)
+            
+            data = {
+                "series_id": series_id,
+                "data": observations,
+                "latest_value": observations[latest_date] if latest_date else None,
+                "latest_date": latest_date
+            }
+            
+            if cache_path is not None:
+                self._write_cache(cache_path, data)
+            
+            return self._success_response(data, "FRED Series")
+            
+        except Exception as e:
+            return self._handle_error(e, "FRED Series")
+    
+    def _fetch_series_pandas(
+        self,
+        series_id: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Dict[str, Any]:
+        """Fetch a series through fredapi, keeping the pandas Series."""
         try:
             series = self.client.get_series(
                 series_id,
@@ -77,7 +256,7 @@ class FREDFetcher(BaseFetcher):
             
             data = {
                 "series_id": series_id,
-                "data": series.to_dict(),
+                "data": series,
                 "latest_value": float(series.iloc[-1]) if len(series) > 0 else None,
                 "latest_date": series.index[-1].strftime("%Y-%m-%d") if len(series) > 0 else None
             }
@@ -97,7 +276,9 @@ class FREDFetcher(BaseFetcher):
         Returns:
             Indicator data
         """
-        series_id = self.INDICATORS.get(indicator_name.lower())
+        if not indicator_name.islower():
+            indicator_name = indicator_name.lower()
+        series_id = self._INDICATORS_LC.get(indicator_name)
         
         if not series_id:
             return {
@@ -108,6 +289,35 @@ class FREDFetcher(BaseFetcher):
         
         return self.fetch_series(series_id)
     
+    def _fetch_latest_observation(self, series_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch only the most recent valid observation of a series.
+        
+        Args:
+            series_id: FRED series ID
+            
+        Returns:
+            Latest value, date and series ID, or None if unavailable
+        """
+        try:
+            data = self._make_request(
+                "series/observations",
+                params={"series_id": series_id, "sort_order": "desc", "limit": 10}
+            )
+        except Exception as e:
+            logger.warning(f"Error fetching latest {series_id} observation: {e}")
+            return None
+        
+        # FRED marks missing observations with "."
+        for observation in data.get("observations", []):
+            if observation["value"] != ".":
+                return {
+                    "value": float(observation["value"]),
+                    "date": observation["date"],
+                    "series_id": series_id
+                }
+        return None
+    
     def fetch_economic_snapshot(self) -> Dict[str, Any]:
         """
         Fetch snapshot of key economic indicators.
@@ -120,19 +330,35 @@ class FREDFetcher(BaseFetcher):
         try:
             snapshot = {}
             
-            for name, series_id in self.INDICATORS.items():
+            # Series are independent I/O-bound requests, so fetch them
+            # concurrently over the session's keep-alive connections
+            executor = ThreadPoolExecutor(max_workers=len(self.INDICATORS))
+            futures = {
+                executor.submit(self._fetch_latest_observation, series_id): name
+                for name, series_id in self.INDICATORS.items()
+            }
+            
+            done, not_done = wait(futures, timeout=self.SNAPSHOT_TIMEOUT)
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+            for future in done:
+                name = futures[future]
                 try:
-                    result = self.fetch_series(series_id)
-                    if result["success"]:
-                        snapshot[name] = {
-                            "value": result["data"]["latest_value"],
-                            "date": result["data"]["latest_date"],
-                            "series_id": series_id
-                        }
+                    latest = future.result()
+                    if latest is not None:
+                        snapshot[name] = latest
                 except Exception as e:
                     logger.warning(f"Failed to fetch {name}: {e}")
                     snapshot[name] = None
             
+            for future in not_done:
+                name = futures[future]
+                logger.warning(f"Timed out fetching {name}")
+                snapshot[name] = None
+            
+            # Keep indicator order stable regardless of completion order
+            snapshot = {name: snapshot[name] for name in self.INDICATORS if name in snapshot}
+            
             return self._success_response(snapshot, "FRED Economic Snapshot")
             
         except Exception as e:
@@ -140,7 +366,6 @@ class FREDFetcher(BaseFetcher):
 
 
 if __name__ == "__main__":
-    import os
     from dotenv import load_dotenv
     
     load_dotenv()
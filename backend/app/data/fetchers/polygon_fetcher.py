@@ -4,18 +4,44 @@ Retrieves real-time and historical market data.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import cached_property
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
-from polygon import RESTClient
 
+from app.core.utils.caching import get_cache_manager
 from app.data.fetchers.base_fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
 
+# Fields extracted from each aggregate bar
+_AGGREGATE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume", "vwap", "transactions")
+
+# Price/volume columns stored as float64 so missing values become NaN
+_AGGREGATE_FLOAT_FIELDS = ("open", "high", "low", "close", "volume", "vwap", "transactions")
+
+# Ticker detail fields that move with the share price or share count
+_MARKET_DETAIL_FIELDS = (
+    "market_cap",
+    "share_class_shares_outstanding",
+    "weighted_shares_outstanding",
+    "total_employees",
+)
+
 
 class PolygonFetcher(BaseFetcher):
     """Fetcher for Polygon.io market data API."""
     
+    # Upper bound in seconds for the whole market snapshot
+    SNAPSHOT_TIMEOUT = 10
+    
+    # Static issuer metadata rarely changes, so cache it for 30 days
+    DETAILS_CACHE_TTL = 30 * 86400
+    
+    # Market cap and share counts go stale quickly, so keep them for minutes
+    DETAILS_MARKET_CACHE_TTL = 300
+    
     def __init__(self, api_key: str):
         """
         Initialize Polygon fetcher.
@@ -24,7 +50,13 @@ class PolygonFetcher(BaseFetcher):
             api_key: Polygon.io API key
         """
         super().__init__(api_key)
-        self.client = RESTClient(api_key)
+    
+    @cached_property
+    def client(self):
+        """Polygon REST client, created on first use."""
+        from polygon import RESTClient
+        
+        return RESTClient(self.api_key)
     
     def _validate_credentials(self) -> None:
         """Validate Polygon API key."""
@@ -60,11 +92,11 @@ class PolygonFetcher(BaseFetcher):
             
             data = {
                 "ticker": ticker,
-                "bid": quote.bid_price if hasattr(quote, 'bid_price') else None,
-                "ask": quote.ask_price if hasattr(quote, 'ask_price') else None,
-                "bid_size": quote.bid_size if hasattr(quote, 'bid_size') else None,
-                "ask_size": quote.ask_size if hasattr(quote, 'ask_size') else None,
-                "timestamp": quote.sip_timestamp if hasattr(quote, 'sip_timestamp') else None
+                "bid": getattr(quote, 'bid_price', None),
+                "ask": getattr(quote, 'ask_price', None),
+                "bid_size": getattr(quote, 'bid_size', None),
+                "ask_size": getattr(quote, 'ask_size', None),
+                "timestamp": getattr(quote, 'sip_timestamp', None)
             }
             
             return self._success_response(data, "Polygon.io Quote")
@@ -89,10 +121,10 @@ class PolygonFetcher(BaseFetcher):
             
             data = {
                 "ticker": ticker,
-                "price": trade.price if hasattr(trade, 'price') else None,
-                "size": trade.size if hasattr(trade, 'size') else None,
-                "exchange": trade.exchange if hasattr(trade, 'exchange') else None,
-                "timestamp": trade.sip_timestamp if hasattr(trade, 'sip_timestamp') else None
+                "price": getattr(trade, 'price', None),
+                "size": getattr(trade, 'size', None),
+                "exchange": getattr(trade, 'exchange', None),
+                "timestamp": getattr(trade, 'sip_timestamp', None)
             }
             
             return self._success_response(data, "Polygon.io Trade")
@@ -100,6 +132,19 @@ class PolygonFetcher(BaseFetcher):
         except Exception as e:
             return self._handle_error(e, "Polygon.io Trade")
     
+    def _default_date_range(
+        self,
+        from_date: Optional[str],
+        to_date: Optional[str]
+    ) -> Tuple[str, str]:
+        """Fill in the default date range: last 120 days."""
+        if not from_date:
+            from_date = (datetime.now() - timedelta(days=120)).strftime("%Y-%m-%d")
+        if not to_date:
+            to_date = datetime.now().strftime("%Y-%m-%d")
+        
+        return from_date, to_date
+    
     def fetch_aggregates(
         self,
         ticker: str,
@@ -121,11 +166,7 @@ class PolygonFetcher(BaseFetcher):
         Returns:
             Aggregates data dictionary
         """
-        # Default date range: last 120 days
-        if not from_date:
-            from_date = (datetime.now() - timedelta(days=120)).strftime("%Y-%m-%d")
-        if not to_date:
-            to_date = datetime.now().strftime("%Y-%m-%d")
+        from_date, to_date = self._default_date_range(from_date, to_date)
         
         self._log_fetch("Polygon.io", {
             "ticker": ticker,
@@ -145,18 +186,10 @@ class PolygonFetcher(BaseFetcher):
                 limit=limit
             )
             
-            bars = []
-            for agg in aggs:
-                bars.append({
-                    "timestamp": agg.timestamp if hasattr(agg, 'timestamp') else None,
-                    "open": agg.open if hasattr(agg, 'open') else None,
-                    "high": agg.high if hasattr(agg, 'high') else None,
-                    "low": agg.low if hasattr(agg, 'low') else None,
-                    "close": agg.close if hasattr(agg, 'close') else None,
-                    "volume": agg.volume if hasattr(agg, 'volume') else None,
-                    "vwap": agg.vwap if hasattr(agg, 'vwap') else None,
-                    "transactions": agg.transactions if hasattr(agg, 'transactions') else None
-                })
+            bars = [
+                {field: getattr(agg, field, None) for field in _AGGREGATE_FIELDS}
+                for agg in aggs
+            ]
             
             data = {
                 "ticker": ticker,
@@ -172,40 +205,132 @@ class PolygonFetcher(BaseFetcher):
         except Exception as e:
             return self._handle_error(e, "Polygon.io Aggregates")
     
-    def fetch_ticker_details(self, ticker: str) -> Dict[str, Any]:
+    def fetch_aggregates_columns(
+        self,
+        ticker: str,
+        timespan: str = "day",
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        limit: int = 120
+    ) -> Dict[str, Any]:
+        """
+        Fetch aggregate bars (OHLCV data) as NumPy columns.
+        
+        Intended for in-process numeric work; the arrays are not JSON
+        serializable. Bars without a timestamp or close are skipped; other
+        missing values are NaN in the float columns.
+        
+        Args:
+            ticker: Stock ticker symbol
+            timespan: Timespan (minute, hour, day, week, month, quarter, year)
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            limit: Maximum number of results
+            
+        Returns:
+            Aggregates data dictionary with one array per field
+        """
+        from_date, to_date = self._default_date_range(from_date, to_date)
+        
+        self._log_fetch("Polygon.io", {
+            "ticker": ticker,
+            "type": "aggregates_columns",
+            "timespan": timespan,
+            "from": from_date,
+            "to": to_date
+        })
+        
+        try:
+            aggs = [
+                agg
+                for agg in self.client.get_aggs(
+                    ticker=ticker,
+                    multiplier=1,
+                    timespan=timespan,
+                    from_=from_date,
+                    to=to_date,
+                    limit=limit
+                )
+                if getattr(agg, "timestamp", None) is not None
+                and getattr(agg, "close", None) is not None
+            ]
+            count = len(aggs)
+            
+            columns = {"timestamp": np.empty(count, dtype=np.int64)}
+            for field in _AGGREGATE_FLOAT_FIELDS:
+                columns[field] = np.empty(count, dtype=np.float64)
+            
+            for i, agg in enumerate(aggs):
+                columns["timestamp"][i] = agg.timestamp
+                for field in _AGGREGATE_FLOAT_FIELDS:
+                    value = getattr(agg, field, None)
+                    columns[field][i] = np.nan if value is None else value
+            
+            data = {
+                "ticker": ticker,
+                "timespan": timespan,
+                "from": from_date,
+                "to": to_date,
+                "columns": columns,
+                "count": count
+            }
+            
+            return self._success_response(data, "Polygon.io Aggregate Columns")
+            
+        except Exception as e:
+            return self._handle_error(e, "Polygon.io Aggregate Columns")
+    
+    def fetch_ticker_details(self, ticker: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Fetch detailed information about a ticker.
         
         Args:
             ticker: Stock ticker symbol
+            refresh: Bypass the cached details and refetch
             
         Returns:
             Ticker details dictionary
         """
         self._log_fetch("Polygon.io", {"ticker": ticker, "type": "details"})
         
+        cache = get_cache_manager().get_cache("api")
+        static_key = f"polygon_details:{ticker}"
+        market_key = f"polygon_details_market:{ticker}"
+        
+        if not refresh:
+            static_data = cache.get(static_key)
+            market_data = cache.get(market_key)
+            if static_data is not None and market_data is not None:
+                return self._success_response({**static_data, **market_data}, "Polygon.io Ticker Details")
+        
         try:
             details = self.client.get_ticker_details(ticker)
             
             data = {
-                "ticker": details.ticker if hasattr(details, 'ticker') else ticker,
-                "name": details.name if hasattr(details, 'name') else None,
-                "market": details.market if hasattr(details, 'market') else None,
-                "locale": details.locale if hasattr(details, 'locale') else None,
-                "primary_exchange": details.primary_exchange if hasattr(details, 'primary_exchange') else None,
-                "type": details.type if hasattr(details, 'type') else None,
-                "currency_name": details.currency_name if hasattr(details, 'currency_name') else None,
-                "market_cap": details.market_cap if hasattr(details, 'market_cap') else None,
-                "share_class_shares_outstanding": details.share_class_shares_outstanding if hasattr(details, 'share_class_shares_outstanding') else None,
-                "weighted_shares_outstanding": details.weighted_shares_outstanding if hasattr(details, 'weighted_shares_outstanding') else None,
-                "description": details.description if hasattr(details, 'description') else None,
-                "homepage_url": details.homepage_url if hasattr(details, 'homepage_url') else None,
-                "total_employees": details.total_employees if hasattr(details, 'total_employees') else None,
-                "list_date": details.list_date if hasattr(details, 'list_date') else None,
-                "sic_code": details.sic_code if hasattr(details, 'sic_code') else None,
-                "sic_description": details.sic_description if hasattr(details, 'sic_description') else None
+                "ticker": getattr(details, 'ticker', ticker),
+                "name": getattr(details, 'name', None),
+                "market": getattr(details, 'market', None),
+                "locale": getattr(details, 'locale', None),
+                "primary_exchange": getattr(details, 'primary_exchange', None),
+                "type": getattr(details, 'type', None),
+                "currency_name": getattr(details, 'currency_name', None),
+                "market_cap": getattr(details, 'market_cap', None),
+                "share_class_shares_outstanding": getattr(details, 'share_class_shares_outstanding', None),
+                "weighted_shares_outstanding": getattr(details, 'weighted_shares_outstanding', None),
+                "description": getattr(details, 'description', None),
+                "homepage_url": getattr(details, 'homepage_url', None),
+                "total_employees": getattr(details, 'total_employees', None),
+                "list_date": getattr(details, 'list_date', None),
+                "sic_code": getattr(details, 'sic_code', None),
+                "sic_description": getattr(details, 'sic_description', None)
             }
             
+            # The static part outlives the market part; a market miss refetches both
+            market_data = {field: data[field] for field in _MARKET_DETAIL_FIELDS}
+            static_data = {k: v for k, v in data.items() if k not in market_data}
+            cache.set(static_key, static_data, self.DETAILS_CACHE_TTL)
+            cache.set(market_key, market_data, self.DETAILS_MARKET_CACHE_TTL)
+            
             return self._success_response(data, "Polygon.io Ticker Details")
             
         except Exception as e:
@@ -224,18 +349,27 @@ class PolygonFetcher(BaseFetcher):
         self._log_fetch("Polygon.io", {"ticker": ticker, "type": "snapshot"})
         
         try:
-            # Fetch multiple data points
-            quote_data = self.fetch_quote(ticker)
-            trade_data = self.fetch_last_trade(ticker)
-            details_data = self.fetch_ticker_details(ticker)
+            # Fetch independent data points concurrently
+            executor = ThreadPoolExecutor(max_workers=3)
+            futures = {
+                "quote": executor.submit(self.fetch_quote, ticker),
+                "last_trade": executor.submit(self.fetch_last_trade, ticker),
+                "details": executor.submit(self.fetch_ticker_details, ticker)
+            }
+            
+            wait(futures.values(), timeout=self.SNAPSHOT_TIMEOUT)
+            executor.shutdown(wait=False, cancel_futures=True)
             
             # Combine into snapshot
-            data = {
-                "ticker": ticker,
-                "quote": quote_data.get("data") if quote_data.get("success") else None,
-                "last_trade": trade_data.get("data") if trade_data.get("success") else None,
-                "details": details_data.get("data") if details_data.get("success") else None
-            }
+            data = {"ticker": ticker}
+            for name, future in futures.items():
+                if not future.done():
+                    logger.warning(f"Timed out fetching {name} for {ticker}")
+                    data[name] = None
+                    continue
+                
+                result = future.result()
+                data[name] = result.get("data") if result.get("success") else None
             
             return self._success_response(data, "Polygon.io Market Snapshot")
             
@@ -4,18 +4,50 @@ Retrieves posts and comments from investment-related subreddits.
 """
 
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import cached_property
 from typing import Dict, Any, Optional, List
-from datetime import datetime
-import praw
 
+from app.core.utils.caching import get_cache_manager
 from app.data.fetchers.base_fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
 
 
+def _format_utc(timestamp: float) -> str:
+    """Format a Unix timestamp as an ISO 8601 UTC string (seconds precision)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp))
+
+
+# Post fields returned by fetch_subreddit_posts, read from PRAW's loaded listing data
+_POST_FIELDS = {
+    "id": lambda fields: fields["id"],
+    "title": lambda fields: fields["title"],
+    "selftext": lambda fields: fields.get("selftext", ""),
+    "author": lambda fields: str(fields.get("author")),
+    "created_utc": lambda fields: _format_utc(fields["created_utc"]),
+    "score": lambda fields: fields["score"],
+    "upvote_ratio": lambda fields: fields["upvote_ratio"],
+    "num_comments": lambda fields: fields["num_comments"],
+    "url": lambda fields: fields["url"],
+    "permalink": lambda fields: f"https://reddit.com{fields['permalink']}",
+}
+
+
 class RedditFetcher(BaseFetcher):
     """Fetcher for Reddit data via PRAW."""
     
+    # Upper bound in seconds for the whole sentiment snapshot
+    SNAPSHOT_TIMEOUT = 20
+    
+    # Ticker mention searches are cached briefly to absorb repeat queries
+    MENTIONS_CACHE_TTL = 300
+    
+    # Ticker mention bodies are truncated to this many characters
+    SELFTEXT_PREVIEW_CHARS = 500
+    
     def __init__(self, client_id: str, client_secret: str, user_agent: str):
         """
         Initialize Reddit fetcher.
@@ -29,11 +61,16 @@ class RedditFetcher(BaseFetcher):
         self.client_secret = client_secret
         self.user_agent = user_agent
         super().__init__(api_key=client_id)  # Use client_id as api_key for base class
+    
+    @cached_property
+    def reddit(self):
+        """PRAW client, created on first use."""
+        import praw
         
-        self.reddit = praw.Reddit(
-            client_id=client_id,
-            client_secret=client_secret,
-            user_agent=user_agent
+        return praw.Reddit(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            user_agent=self.user_agent
         )
     
     def _validate_credentials(self) -> None:
@@ -50,7 +87,8 @@ class RedditFetcher(BaseFetcher):
         subreddit_name: str,
         limit: int = 100,
         time_filter: str = "day",
-        sort: str = "hot"
+        sort: str = "hot",
+        fields: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Fetch posts from a subreddit.
@@ -60,6 +98,7 @@ class RedditFetcher(BaseFetcher):
             limit: Maximum number of posts to fetch
             time_filter: Time filter ('hour', 'day', 'week', 'month', 'year', 'all')
             sort: Sort method ('hot', 'new', 'top', 'rising')
+            fields: Post fields to include (all fields when omitted)
             
         Returns:
             List of posts with metadata
@@ -71,6 +110,11 @@ class RedditFetcher(BaseFetcher):
         })
         
         try:
+            unknown = set(fields or ()) - _POST_FIELDS.keys()
+            if unknown:
+                raise ValueError(f"Unknown post fields: {sorted(unknown)}")
+            extractors = [(name, _POST_FIELDS[name]) for name in (fields or _POST_FIELDS)]
+            
             subreddit = self.reddit.subreddit(subreddit_name)
             
             # Get posts based on sort method
@@ -88,18 +132,11 @@ class RedditFetcher(BaseFetcher):
             # Extract post data
             posts_data = []
             for post in posts:
-                posts_data.append({
-                    "id": post.id,
-                    "title": post.title,
-                    "selftext": post.selftext,
-                    "author": str(post.author),
-                    "created_utc": datetime.fromtimestamp(post.created_utc).isoformat(),
-                    "score": post.score,
-                    "upvote_ratio": post.upvote_ratio,
-                    "num_comments": post.num_comments,
-                    "url": post.url,
-                    "permalink": f"https://reddit.com{post.permalink}"
-                })
+                # Listing data is already loaded, so read it directly rather
+                # than through PRAW's lazy attribute lookup, building only
+                # the requested fields
+                post_fields = vars(post)
+                posts_data.append({name: extract(post_fields) for name, extract in extractors})
             
             data = {
                 "subreddit": subreddit_name,
@@ -137,6 +174,15 @@ class RedditFetcher(BaseFetcher):
             "type": "ticker_mentions"
         })
         
+        cache = get_cache_manager().get_cache("api")
+        cache_key = f"reddit_mentions:{ticker.upper()}:{subreddit_name}:{limit}"
+        
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            logger.debug(f"Cache hit: {cache_key}")
+            return cached_response
+        logger.debug(f"Cache miss: {cache_key}")
+        
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
             
@@ -144,22 +190,28 @@ class RedditFetcher(BaseFetcher):
             search_query = f"${ticker} OR {ticker}"
             posts = subreddit.search(search_query, limit=limit, time_filter="week")
             
+            # Matches the bare ticker or its $-prefixed cashtag as a whole word
+            ticker_pattern = re.compile(rf"\b{re.escape(ticker)}\b", re.IGNORECASE)
+            
             # Extract post data
             posts_data = []
             for post in posts:
+                fields = vars(post)
+                title = fields["title"]
+                selftext = fields.get("selftext", "")
+                
                 # Check if ticker is actually mentioned in title or body
-                text = f"{post.title} {post.selftext}".upper()
-                if ticker.upper() in text or f"${ticker.upper()}" in text:
+                if ticker_pattern.search(title) or ticker_pattern.search(selftext):
                     posts_data.append({
-                        "id": post.id,
-                        "title": post.title,
-                        "selftext": post.selftext[:500],  # Truncate long posts
-                        "author": str(post.author),
-                        "created_utc": datetime.fromtimestamp(post.created_utc).isoformat(),
-                        "score": post.score,
-                        "upvote_ratio": post.upvote_ratio,
-                        "num_comments": post.num_comments,
-                        "permalink": f"https://reddit.com{post.permalink}"
+                        "id": fields["id"],
+                        "title": title,
+                        "selftext": selftext[:self.SELFTEXT_PREVIEW_CHARS],  # Truncate long posts
+                        "author": str(fields.get("author")),
+                        "created_utc": _format_utc(fields["created_utc"]),
+                        "score": fields["score"],
+                        "upvote_ratio": fields["upvote_ratio"],
+                        "num_comments": fields["num_comments"],
+                        "permalink": f"https://reddit.com{fields['permalink']}"
                     })
             
             data = {
@@ -169,7 +221,10 @@ class RedditFetcher(BaseFetcher):
                 "posts": posts_data
             }
             
-            return self._success_response(data, "Reddit Ticker Mentions")
+            response = self._success_response(data, "Reddit Ticker Mentions")
+            cache.set(cache_key, response, self.MENTIONS_CACHE_TTL)
+            
+            return response
             
         except Exception as e:
             return self._handle_error(e, "Reddit Ticker Mentions")
@@ -189,15 +244,36 @@ class RedditFetcher(BaseFetcher):
         try:
             subreddits = ["wallstreetbets", "stocks", "investing"]
             all_mentions = []
+            seen_ids = set()
             
-            for sub in subreddits:
+            # Subreddit searches are independent, so run them concurrently
+            executor = ThreadPoolExecutor(max_workers=len(subreddits))
+            futures = {
+                sub: executor.submit(self.fetch_ticker_mentions, ticker, sub, 50)
+                for sub in subreddits
+            }
+            
+            wait(futures.values(), timeout=self.SNAPSHOT_TIMEOUT)
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+            for sub, future in futures.items():
+                if not future.done():
+                    logger.warning(f"Timed out fetching from r/{sub}")
+                    continue
+                
                 try:
-                    result = self.fetch_ticker_mentions(ticker, sub, limit=50)
+                    result = future.result()
                     if result["success"]:
-                        all_mentions.extend(result["data"]["posts"])
+                        # Count cross-posted threads only once
+                        for post in result["data"]["posts"]:
+                            if post["id"] not in seen_ids:
+                                seen_ids.add(post["id"])
+                                all_mentions.append(post)
                 except Exception as e:
                     logger.warning(f"Failed to fetch from r/{sub}: {e}")
             
+            all_mentions.sort(key=lambda post: post["created_utc"], reverse=True)
+            
             # Calculate basic sentiment metrics
             total_mentions = len(all_mentions)
             total_score = sum(post["score"] for post in all_mentions)
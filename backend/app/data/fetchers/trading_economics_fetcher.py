@@ -4,9 +4,10 @@ Retrieves global economic indicators and forecasts.
 """
 
 import logging
-import requests
+import orjson
 from typing import Dict, Any, Optional, List
 
+from app.core.utils.caching import generate_cache_key, get_cache_manager
 from app.data.fetchers.base_fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,9 @@ class TradingEconomicsFetcher(BaseFetcher):
     
     BASE_URL = "https://api.tradingeconomics.com"
     
+    # How long a response body is kept for conditional revalidation
+    VALIDATOR_CACHE_TTL = 86400
+    
     def __init__(self, api_key: str):
         """
         Initialize Trading Economics fetcher.
@@ -25,7 +29,8 @@ class TradingEconomicsFetcher(BaseFetcher):
             api_key: Trading Economics API key (format: KEY:SECRET)
         """
         super().__init__(api_key)
-        self.session = requests.Session()
+        self.session = self._shared_session()
+        
         # API key format: KEY:SECRET
         if ":" in api_key:
             self.key, self.secret = api_key.split(":", 1)
@@ -58,10 +63,37 @@ class TradingEconomicsFetcher(BaseFetcher):
         
         url = f"{self.BASE_URL}/{endpoint}"
         
-        response = self.session.get(url, params=params)
+        # Revalidate a previously seen response instead of re-downloading it
+        cache = get_cache_manager().get_cache("api")
+        cache_key = f"te_http:{generate_cache_key(url, **params)}"
+        cached = cache.get(cache_key)
+        
+        headers = {"Accept": "application/json"}
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        response = self.session.get(url, params=params, headers=headers)
+        
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Trading Economics response not modified: {endpoint}")
+            return orjson.loads(cached[2])
+        
         response.raise_for_status()
         
-        return response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            cache.set(
+                cache_key,
+                (etag, last_modified, response.content),
+                ttl=self.VALIDATOR_CACHE_TTL
+            )
+        
+        return orjson.loads(response.content)
     
     def fetch(self, **kwargs) -> Dict[str, Any]:
         """Generic fetch method."""
@@ -4,9 +4,11 @@ Provides common functionality for extracting data from various document formats.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from io import BytesIO
+from typing import Dict, Any, FrozenSet, Optional, Tuple, Union
 from pathlib import Path
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,9 @@ logger = logging.getLogger(__name__)
 class BaseProcessor(ABC):
     """Abstract base class for document processors."""
     
+    # Files up to this size are read into memory in a single call
+    MAX_IN_MEMORY_BYTES = 64 * 1024 * 1024
+    
     def __init__(self):
         """Initialize the processor."""
         pass
@@ -31,33 +36,60 @@ class BaseProcessor(ABC):
         """
         pass
     
-    def _validate_file(self, file_path: str, expected_extensions: list) -> Path:
+    def _validate_file(
+        self,
+        file_path: Union[str, os.PathLike],
+        expected_extensions: FrozenSet[str]
+    ) -> Tuple[Path, str, os.stat_result]:
         """
         Validate that file exists and has correct extension.
         
         Args:
             file_path: Path to the file
-            expected_extensions: List of valid extensions (e.g., ['.pdf', '.PDF'])
+            expected_extensions: Valid lowercase extensions (e.g., frozenset({'.pdf'}))
             
         Returns:
-            Path object
+            Path object, path string for parsing libraries, and stat result
             
         Raises:
             FileNotFoundError: If file doesn't exist
             ValueError: If file has wrong extension
         """
-        path = Path(file_path)
+        path_str = os.fspath(file_path)
+        path = Path(path_str)
         
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        try:
+            stat_result = os.stat(path_str)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        if path.suffix not in expected_extensions:
+        if path.suffix.lower() not in expected_extensions:
             raise ValueError(
                 f"Invalid file extension: {path.suffix}. "
-                f"Expected one of: {expected_extensions}"
+                f"Expected one of: {sorted(expected_extensions)}"
             )
         
-        return path
+        return path, path_str, stat_result
+    
+    def _open_source(self, path_str: str, file_size: int) -> Union[BytesIO, str]:
+        """
+        Get a source for zip-based readers (openpyxl, python-docx).
+        
+        Small files are read with one call into a BytesIO so the zip reader
+        seeks in memory instead of issuing many small reads against the file.
+        
+        Args:
+            path_str: Path to the file
+            file_size: Size of the file in bytes
+            
+        Returns:
+            In-memory buffer, or the path string for large files
+        """
+        if file_size <= self.MAX_IN_MEMORY_BYTES:
+            with open(path_str, "rb") as f:
+                return BytesIO(f.read())
+        
+        return path_str
     
     def _success_response(
         self,
@@ -3,16 +3,42 @@ Unified Document Processor.
 Automatically detects document type and routes to appropriate processor.
 """
 
+import importlib
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from app.data.processors.pdf_processor import PDFProcessor
-from app.data.processors.docx_processor import DOCXProcessor
-from app.data.processors.xlsx_processor import XLSXProcessor
+from app.data.processors.base_processor import BaseProcessor
 
 logger = logging.getLogger(__name__)
 
+# Processor module and class per extension, imported on first use so that
+# serving one format doesn't load every parsing library
+_PROCESSOR_CLASSES = {
+    '.pdf': ('app.data.processors.pdf_processor', 'PDFProcessor'),
+    '.docx': ('app.data.processors.docx_processor', 'DOCXProcessor'),
+    '.xlsx': ('app.data.processors.xlsx_processor', 'XLSXProcessor')
+}
+
+
+@lru_cache(maxsize=None)
+def _load_processor(extension: str) -> BaseProcessor:
+    """Import and instantiate the processor for an extension."""
+    module_name, class_name = _PROCESSOR_CLASSES[extension]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+def _process_pdf(file_path: str) -> Dict[str, Any]:
+    """Process a PDF in a worker process, without a nested page pool."""
+    from app.data.processors.pdf_processor import PDFProcessor
+    
+    return PDFProcessor(parallel=False).process(file_path)
+
 
 class DocumentProcessor:
     """
@@ -20,18 +46,6 @@ class DocumentProcessor:
     Automatically detects file type and routes to appropriate processor.
     """
     
-    def __init__(self):
-        """Initialize all processors."""
-        self.pdf_processor = PDFProcessor()
-        self.docx_processor = DOCXProcessor()
-        self.xlsx_processor = XLSXProcessor()
-        
-        self.processors = {
-            '.pdf': self.pdf_processor,
-            '.docx': self.docx_processor,
-            '.xlsx': self.xlsx_processor
-        }
-    
     def process(self, file_path: str) -> Dict[str, Any]:
         """
         Process a document file.
@@ -57,19 +71,19 @@ class DocumentProcessor:
             extension = path.suffix.lower()
             
             # Get appropriate processor
-            processor = self.processors.get(extension)
-            
-            if not processor:
+            if extension not in _PROCESSOR_CLASSES:
                 return {
                     "success": False,
-                    "error": f"Unsupported file type: {extension}. Supported: {list(self.processors.keys())}",
+                    "error": f"Unsupported file type: {extension}. Supported: {list(_PROCESSOR_CLASSES.keys())}",
                     "file_path": str(file_path)
                 }
             
+            processor = _load_processor(extension)
+            
             logger.info(f"Processing {extension} file: {path.name}")
             
             # Process the document
-            result = processor.process(str(path))
+            result = processor.process(file_path)
             
             return result
             
@@ -81,6 +95,60 @@ class DocumentProcessor:
                 "file_path": str(file_path)
             }
     
+    def process_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process several documents concurrently.
+        
+        PDF text extraction is CPU-bound and runs in worker processes, while
+        DOCX/XLSX parsing is mostly zip inflation and runs in threads.
+        
+        Args:
+            file_paths: Paths to the document files
+            
+        Returns:
+            One result per file, in completion order
+        """
+        if not file_paths:
+            return []
+        
+        pdf_paths = [p for p in file_paths if Path(p).suffix.lower() == '.pdf']
+        other_paths = [p for p in file_paths if Path(p).suffix.lower() != '.pdf']
+        
+        results = []
+        process_executor = None
+        if pdf_paths:
+            # Spawned, not forked, so workers never inherit a held PDFium lock
+            process_executor = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(pdf_paths)),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        thread_executor = ThreadPoolExecutor(max_workers=min(32, len(file_paths)))
+        
+        try:
+            futures = {}
+            for file_path in pdf_paths:
+                futures[process_executor.submit(_process_pdf, file_path)] = file_path
+            for file_path in other_paths:
+                futures[thread_executor.submit(self.process, file_path)] = file_path
+            
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error processing document {file_path}: {e}")
+                    results.append({
+                        "success": False,
+                        "error": str(e),
+                        "file_path": str(file_path)
+                    })
+        finally:
+            thread_executor.shutdown()
+            if process_executor is not None:
+                process_executor.shutdown()
+        
+        return results
+    
     def is_supported(self, file_path: str) -> bool:
         """
         Check if a file type is supported.
@@ -91,8 +159,8 @@ class DocumentProcessor:
         Returns:
             True if file type is supported, False otherwise
         """
-        extension = Path(file_path).suffix.lower()
-        return extension in self.processors
+        extension = os.path.splitext(file_path)[1].lower()
+        return extension in _PROCESSOR_CLASSES
     
     def get_supported_formats(self) -> list:
         """
@@ -101,7 +169,19 @@ class DocumentProcessor:
         Returns:
             List of supported extensions
         """
-        return list(self.processors.keys())
+        return list(_PROCESSOR_CLASSES.keys())
+
+
+# Global document processor (processors are stateless, so one is shared)
+_document_processor: Optional[DocumentProcessor] = None
+
+
+def get_document_processor() -> DocumentProcessor:
+    """Get global document processor instance."""
+    global _document_processor
+    if _document_processor is None:
+        _document_processor = DocumentProcessor()
+    return _document_processor
 
 
 if __name__ == "__main__":
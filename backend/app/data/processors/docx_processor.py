@@ -3,6 +3,7 @@ DOCX Document Processor.
 Extracts text content from Microsoft Word documents.
 """
 
+import io
 import logging
 from typing import Dict, Any
 from docx import Document
@@ -15,6 +16,8 @@ logger = logging.getLogger(__name__)
 class DOCXProcessor(BaseProcessor):
     """Processor for DOCX documents."""
     
+    _EXTENSIONS = frozenset({'.docx'})
+    
     def process(self, file_path: str) -> Dict[str, Any]:
         """
         Extract text content from a DOCX file.
@@ -27,45 +30,57 @@ class DOCXProcessor(BaseProcessor):
         """
         try:
             # Validate file
-            path = self._validate_file(file_path, ['.docx', '.DOCX'])
+            path, path_str, stat_result = self._validate_file(file_path, self._EXTENSIONS)
             
             logger.info(f"Processing DOCX: {path}")
             
             # Read DOCX
-            doc = Document(str(path))
+            doc = Document(self._open_source(path_str, stat_result.st_size))
+            
+            buf = io.StringIO()
             
             # Extract paragraphs
-            paragraphs = []
+            num_paragraphs = 0
             for para in doc.paragraphs:
                 text = para.text.strip()
                 if text:
-                    paragraphs.append(text)
+                    if num_paragraphs:
+                        buf.write("\n\n")
+                    buf.write(text)
+                    num_paragraphs += 1
             
             # Extract tables
-            tables_text = []
+            sep = " | "
+            num_tables_with_text = 0
             for table in doc.tables:
-                table_data = []
+                num_rows_with_text = 0
                 for row in table.rows:
-                    row_data = [cell.text.strip() for cell in row.cells]
-                    if any(row_data):  # Skip empty rows
-                        table_data.append(" | ".join(row_data))
+                    cells = [cell.text for cell in row.cells]
+                    if not any(cell.strip() for cell in cells):  # Skip empty rows
+                        continue
+                    
+                    if num_rows_with_text:
+                        buf.write("\n")
+                    elif num_tables_with_text:
+                        buf.write("\n\n")
+                    else:
+                        buf.write("\n\n--- Tables ---\n\n")
+                    buf.write(sep.join([cell.strip() for cell in cells]))
+                    num_rows_with_text += 1
                 
-                if table_data:
-                    tables_text.append("\n".join(table_data))
+                if num_rows_with_text:
+                    num_tables_with_text += 1
             
             # Combine all text
-            full_text = "\n\n".join(paragraphs)
-            
-            if tables_text:
-                full_text += "\n\n--- Tables ---\n\n" + "\n\n".join(tables_text)
+            full_text = buf.getvalue()
             
             # Extract metadata
             core_props = doc.core_properties
             metadata = {
-                "num_paragraphs": len(paragraphs),
+                "num_paragraphs": num_paragraphs,
                 "num_tables": len(doc.tables),
                 "file_name": path.name,
-                "file_size_bytes": path.stat().st_size,
+                "file_size_bytes": stat_result.st_size,
                 "title": core_props.title or "",
                 "author": core_props.author or "",
                 "subject": core_props.subject or "",
@@ -75,7 +90,7 @@ class DOCXProcessor(BaseProcessor):
             
             logger.info(f"Successfully extracted {len(full_text)} characters from {metadata['num_paragraphs']} paragraphs")
             
-            return self._success_response(full_text, metadata, path)
+            return self._success_response(full_text, metadata, path_str)
             
         except Exception as e:
             return self._error_response(e, file_path)
@@ -3,18 +3,69 @@ XLSX Document Processor.
 Extracts data from Microsoft Excel spreadsheets.
 """
 
+import io
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
 from openpyxl import load_workbook
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 from app.data.processors.base_processor import BaseProcessor
 
 logger = logging.getLogger(__name__)
 
 
+def _cell_to_str(cell: Any) -> str:
+    """Convert a cell value to text, rendering whole-number floats as integers."""
+    # Text cells are the common case and need no conversion
+    if type(cell) is str:
+        return cell
+    if cell is None:
+        return ""
+    if isinstance(cell, float) and cell.is_integer():
+        return str(int(cell))
+    return str(cell)
+
+
 class XLSXProcessor(BaseProcessor):
     """Processor for XLSX documents."""
     
+    _EXTENSIONS = frozenset({'.xlsx'})
+    
+    def _iter_sheets(
+        self,
+        path_str: str,
+        file_size: int
+    ) -> Iterator[Tuple[str, Iterable[Iterable[Any]]]]:
+        """
+        Iterate over the rows of every sheet in a workbook.
+        
+        Uses the Rust-backed calamine reader when installed, which returns a
+        whole sheet per call, and falls back to openpyxl otherwise.
+        
+        Args:
+            path_str: Path to the XLSX file
+            file_size: Size of the file in bytes
+            
+        Yields:
+            Sheet name and its row values
+        """
+        if CalamineWorkbook is not None:
+            wb = CalamineWorkbook.from_path(path_str)
+            for sheet_name in wb.sheet_names:
+                yield sheet_name, wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=True)
+            return
+        
+        wb = load_workbook(self._open_source(path_str, file_size), data_only=True, read_only=True)
+        try:
+            for sheet_name in wb.sheetnames:
+                yield sheet_name, wb[sheet_name].iter_rows(values_only=True)
+        finally:
+            wb.close()
+    
     def process(self, file_path: str, max_rows_per_sheet: int = 1000) -> Dict[str, Any]:
         """
         Extract data from an XLSX file.
@@ -28,77 +79,63 @@ class XLSXProcessor(BaseProcessor):
         """
         try:
             # Validate file
-            path = self._validate_file(file_path, ['.xlsx', '.XLSX'])
+            path, path_str, stat_result = self._validate_file(file_path, self._EXTENSIONS)
             
             logger.info(f"Processing XLSX: {path}")
             
-            # Load workbook
-            wb = load_workbook(str(path), data_only=True, read_only=True)
-            
-            # Extract data from all sheets
-            sheets_data = []
+            # Extract data from all sheets, writing each one to the output as
+            # soon as it is read and keeping only its counts for the metadata
+            buf = io.StringIO()
+            sheets = []
             total_rows = 0
             
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                
-                # Get sheet data
-                rows = []
-                for idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
+            for sheet_name, sheet_rows in self._iter_sheets(path_str, stat_result.st_size):
+                # The header needs the row count, so rows are buffered per sheet
+                rows_buf = io.StringIO()
+                num_rows = 0
+                num_columns = 0
+                for idx, row in enumerate(sheet_rows, 1):
                     if idx > max_rows_per_sheet:
                         logger.warning(f"Sheet '{sheet_name}' exceeded max rows ({max_rows_per_sheet}), truncating")
                         break
                     
                     # Convert row to strings and filter out empty rows
-                    row_data = [str(cell) if cell is not None else "" for cell in row]
+                    row_data = list(map(_cell_to_str, row))
                     if any(row_data):  # Skip completely empty rows
-                        rows.append(row_data)
+                        if not num_rows:
+                            num_columns = len(row_data)
+                        rows_buf.write(" | ".join(row_data))
+                        rows_buf.write("\n")
+                        num_rows += 1
                 
-                if rows:
-                    sheets_data.append({
-                        "sheet_name": sheet_name,
-                        "num_rows": len(rows),
-                        "num_columns": len(rows[0]) if rows else 0,
-                        "data": rows
+                if num_rows:
+                    buf.write(f"=== Sheet: {sheet_name} ===\n")
+                    buf.write(f"Rows: {num_rows}, Columns: {num_columns}\n\n")
+                    buf.write(rows_buf.getvalue())
+                    buf.write("\n")
+                    
+                    sheets.append({
+                        "name": sheet_name,
+                        "rows": num_rows,
+                        "columns": num_columns
                     })
-                    total_rows += len(rows)
-            
-            # Convert to text format
-            text_content = []
-            for sheet_info in sheets_data:
-                text_content.append(f"=== Sheet: {sheet_info['sheet_name']} ===")
-                text_content.append(f"Rows: {sheet_info['num_rows']}, Columns: {sheet_info['num_columns']}")
-                text_content.append("")
-                
-                # Add rows as text
-                for row in sheet_info['data']:
-                    text_content.append(" | ".join(row))
-                
-                text_content.append("")
+                    total_rows += num_rows
             
-            full_text = "\n".join(text_content)
+            # Drop the final line break so the text ends like a joined list
+            full_text = buf.getvalue()[:-1]
             
             # Extract metadata
             metadata = {
-                "num_sheets": len(sheets_data),
+                "num_sheets": len(sheets),
                 "total_rows": total_rows,
                 "file_name": path.name,
-                "file_size_bytes": path.stat().st_size,
-                "sheets": [
-                    {
-                        "name": s["sheet_name"],
-                        "rows": s["num_rows"],
-                        "columns": s["num_columns"]
-                    }
-                    for s in sheets_data
-                ]
+                "file_size_bytes": stat_result.st_size,
+                "sheets": sheets
             }
             
-            logger.info(f"Successfully extracted {total_rows} rows from {len(sheets_data)} sheets")
-            
-            wb.close()
+            logger.info(f"Successfully extracted {total_rows} rows from {len(sheets)} sheets")
             
-            return self._success_response(full_text, metadata, path)
+            return self._success_response(full_text, metadata, path_str)
             
         except Exception as e:
             return self._error_response(e, file_path)
@@ -2,9 +2,12 @@
 CRUD operations for database models.
 """
 
+import csv
+import io
 import logging
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session, lazyload
 from datetime import datetime, timedelta
 
 from app.db.models import (
@@ -16,6 +19,29 @@ from app.db.models import (
 logger = logging.getLogger(__name__)
 
 
+def _bulk_insert(db: Session, model, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert several rows of a model in one INSERT and commit.
+    
+    Args:
+        db: Database session
+        model: Mapped class to insert into
+        rows: Column values for each row
+        
+    Returns:
+        IDs of the created rows, in input order
+    """
+    if not rows:
+        return []
+    
+    ids = db.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+    db.commit()
+    return list(ids)
+
+
 # User CRUD
 def create_user(db: Session, email: str, full_name: str, hashed_password: str) -> User:
     """Create a new user."""
@@ -95,14 +121,28 @@ def get_analysis_by_request_id(db: Session, request_id: str) -> Optional[Analysi
     return db.query(Analysis).filter(Analysis.request_id == request_id).first()
 
 
+def _analyses_query(db: Session, with_responses: bool):
+    """
+    Start an analyses query, optionally skipping the agent responses.
+    
+    Agent responses are eager-loaded by default (one extra query for all
+    returned analyses); listings that never touch them opt out here.
+    """
+    query = db.query(Analysis)
+    if not with_responses:
+        query = query.options(lazyload(Analysis.agent_responses))
+    return query
+
+
 def get_analyses_by_user(
     db: Session,
     user_id: int,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    with_responses: bool = False
 ) -> List[Analysis]:
     """Get analyses by user."""
-    return db.query(Analysis).filter(
+    return _analyses_query(db, with_responses).filter(
         Analysis.user_id == user_id
     ).order_by(
         Analysis.created_at.desc()
@@ -113,10 +153,11 @@ def get_analyses_by_ticker(
     db: Session,
     ticker: str,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    with_responses: bool = False
 ) -> List[Analysis]:
     """Get analyses by ticker."""
-    return db.query(Analysis).filter(
+    return _analyses_query(db, with_responses).filter(
         Analysis.ticker == ticker
     ).order_by(
         Analysis.created_at.desc()
@@ -127,11 +168,12 @@ def get_recent_analyses(
     db: Session,
     days: int = 7,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    with_responses: bool = False
 ) -> List[Analysis]:
     """Get recent analyses."""
     cutoff_date = datetime.utcnow() - timedelta(days=days)
-    return db.query(Analysis).filter(
+    return _analyses_query(db, with_responses).filter(
         Analysis.created_at >= cutoff_date
     ).order_by(
         Analysis.created_at.desc()
@@ -171,6 +213,27 @@ def create_agent_response(
     return response
 
 
+def create_agent_responses_bulk(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    analysis_id: Optional[int] = None
+) -> List[int]:
+    """
+    Create several agent responses in one INSERT.
+    
+    Args:
+        db: Database session
+        rows: Column values for each response (same keys as create_agent_response)
+        analysis_id: If given, set on every row (rows may then omit it)
+        
+    Returns:
+        IDs of the created responses, in input order
+    """
+    if analysis_id is not None:
+        rows = [{**row, "analysis_id": analysis_id} for row in rows]
+    return _bulk_insert(db, AgentResponse, rows)
+
+
 def get_agent_responses_by_analysis(
     db: Session,
     analysis_id: int
@@ -210,6 +273,67 @@ def create_market_data(
     return data
 
 
+def create_market_data_bulk(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create several market data entries in one INSERT.
+    
+    Args:
+        db: Database session
+        rows: Column values for each entry (same keys as create_market_data)
+        
+    Returns:
+        IDs of the created entries, in input order
+    """
+    return _bulk_insert(db, MarketData, rows)
+
+
+_MARKET_DATA_COPY_COLUMNS = (
+    "ticker", "open_price", "high_price", "low_price",
+    "close_price", "volume", "date", "source"
+)
+
+
+def copy_market_data(db: Session, rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    Load market data entries with PostgreSQL COPY, for historical backfills.
+    
+    Skips per-row parameter binding and result processing entirely; on other
+    databases it falls back to create_market_data_bulk.
+    
+    Args:
+        db: Database session
+        rows: Column values for each entry (same keys as create_market_data)
+        
+    Returns:
+        Number of entries loaded
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return len(create_market_data_bulk(db, list(rows)))
+    
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    count = 0
+    for row in rows:
+        # Missing/None values become empty unquoted fields, which COPY reads as NULL
+        writer.writerow([row.get(column) for column in _MARKET_DATA_COPY_COLUMNS])
+        count += 1
+    
+    if not count:
+        return 0
+    
+    buf.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY market_data ({', '.join(_MARKET_DATA_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buf
+        )
+    finally:
+        cursor.close()
+    db.commit()
+    return count
+
+
 def get_market_data(
     db: Session,
     ticker: str,
@@ -260,6 +384,20 @@ def create_financial_data(
     return data
 
 
+def create_financial_data_bulk(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create several financial data entries in one INSERT.
+    
+    Args:
+        db: Database session
+        rows: Column values for each entry (same keys as create_financial_data)
+        
+    Returns:
+        IDs of the created entries, in input order
+    """
+    return _bulk_insert(db, FinancialData, rows)
+
+
 def get_financial_data(
     db: Session,
     ticker: str,
@@ -334,6 +472,20 @@ def create_system_metric(
     return metric
 
 
+def create_system_metrics_bulk(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create several system metric entries in one INSERT.
+    
+    Args:
+        db: Database session
+        rows: Column values for each entry (same keys as create_system_metric)
+        
+    Returns:
+        IDs of the created entries, in input order
+    """
+    return _bulk_insert(db, SystemMetrics, rows)
+
+
 def get_system_metrics(
     db: Session,
     metric_name: str,
@@ -352,30 +504,26 @@ def get_system_metrics(
 
 
 # Statistics
+def _recommendation_count(recommendation: RecommendationType):
+    """Build a SUM(CASE ...) column counting analyses with a recommendation."""
+    return func.sum(case((Analysis.final_recommendation == recommendation, 1), else_=0))
+
+
 def get_analysis_statistics(db: Session) -> dict:
     """Get analysis statistics."""
-    total_analyses = db.query(Analysis).count()
-    
-    buy_count = db.query(Analysis).filter(
-        Analysis.final_recommendation == RecommendationType.BUY
-    ).count()
-    
-    hold_count = db.query(Analysis).filter(
-        Analysis.final_recommendation == RecommendationType.HOLD
-    ).count()
-    
-    sell_count = db.query(Analysis).filter(
-        Analysis.final_recommendation == RecommendationType.SELL
-    ).count()
-    
-    avg_confidence = db.query(Analysis).with_entities(
-        db.func.avg(Analysis.confidence)
-    ).scalar() or 0.0
+    # Single scan over analyses instead of one query per statistic
+    total_analyses, buy_count, hold_count, sell_count, avg_confidence = db.query(
+        func.count(Analysis.id),
+        _recommendation_count(RecommendationType.BUY),
+        _recommendation_count(RecommendationType.HOLD),
+        _recommendation_count(RecommendationType.SELL),
+        func.avg(Analysis.confidence)
+    ).one()
     
     return {
         "total_analyses": total_analyses,
-        "buy_count": buy_count,
-        "hold_count": hold_count,
-        "sell_count": sell_count,
-        "avg_confidence": float(avg_confidence)
+        "buy_count": buy_count or 0,
+        "hold_count": hold_count or 0,
+        "sell_count": sell_count or 0,
+        "avg_confidence": float(avg_confidence or 0.0)
     }
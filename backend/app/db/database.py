@@ -1,26 +1,66 @@
 """
 Database connection and session management.
+
+When EXTERNAL_POOLER is enabled, DATABASE_URL is expected to point at a
+PgBouncer instance running with ``pool_mode = transaction``. Connection
+pooling is then left to PgBouncer and each process opens connections on
+demand (NullPool), so adding workers or replicas does not multiply the
+number of server connections held against Postgres's max_connections.
 """
 
 import logging
-from typing import Generator
-from sqlalchemy import create_engine
+import time
+from typing import Generator, Optional, Tuple
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import NullPool, QueuePool
 
 from app.core.config import settings
 from app.db.models import Base
 
 logger = logging.getLogger(__name__)
 
+# Health-check statement, built once so its compiled form is cached
+_DB_PING = text("SELECT 1")
+
+# Seconds a health-check result is reused, so frequent liveness probes
+# don't each check out a pooled connection
+DB_HEALTH_TTL = 0.5
+_db_health: Optional[Tuple[float, bool]] = None
+
+# TCP keepalive stops idle pooled PostgreSQL connections from being silently
+# dropped by load balancers and NAT. Sessions run in UTC so ad-hoc now()
+# matches the naive UTC datetimes used throughout the app; model defaults
+# use models.utc_now instead, since PgBouncer drops startup options.
+connect_args = {}
+if settings.DATABASE_URL.startswith("postgresql"):
+    connect_args = {
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "options": "-c timezone=utc"
+    }
+
+if settings.EXTERNAL_POOLER:
+    # PgBouncer owns the pool, so don't hold connections on this side too
+    pool_args = {"poolclass": NullPool}
+else:
+    pool_args = {
+        "poolclass": QueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,  # Replace connections older than this
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True  # Verify connections before using
+    }
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG  # Log SQL queries in debug mode
+    connect_args=connect_args,
+    echo=settings.DEBUG,  # Log SQL queries in debug mode
+    **pool_args
 )
 
 # Create session factory
@@ -69,20 +109,46 @@ def drop_db() -> None:
     logger.info("All tables dropped")
 
 
+def connect_db() -> Connection:
+    """
+    Check out a connection and verify it with a ping.
+    
+    Returns:
+        Open connection; closing it returns it to the pool
+    """
+    conn = engine.connect()
+    try:
+        conn.execute(_DB_PING)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
 def check_db_connection() -> bool:
     """
     Check if database connection is working.
     
+    The result is reused for DB_HEALTH_TTL seconds.
+    
     Returns:
         True if connection is successful
     """
+    global _db_health
+    now = time.monotonic()
+    if _db_health is not None and now - _db_health[0] < DB_HEALTH_TTL:
+        return _db_health[1]
+    
     try:
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
-        return True
+            conn.execute(_DB_PING)
+        ok = True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
-        return False
+        ok = False
+    
+    _db_health = (now, ok)
+    return ok
 
 
 if __name__ == "__main__":
@@ -3,13 +3,44 @@ Database models for Fyn RAG system.
 Stores analyses, users, and historical data.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey, Boolean, Enum as SQLEnum
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import DDL, Identity, Integer, String, Float, DateTime, Text, JSON, ForeignKey, Boolean, Index, Uuid, Enum as SQLEnum, event, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.orm import DeclarativeBase, Mapped, configure_mappers, mapped_column, relationship
 from datetime import datetime
+from typing import Any, List, Optional
 import enum
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Declarative base for all models."""
+
+
+# Binary JSONB on PostgreSQL (parsed once on write, GIN-indexable);
+# plain JSON on other backends
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utc_now(FunctionElement):
+    """Current UTC timestamp for server-side defaults.
+    
+    On PostgreSQL this is ``timezone('utc', now())``, so stored values do not
+    depend on the session time zone (PgBouncer in transaction mode drops the
+    ``-c timezone=utc`` startup option). Elsewhere it is plain ``now()``.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_now)
+def _compile_utc_now(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+
+@compiles(utc_now, "postgresql")
+def _compile_utc_now_postgresql(element, compiler, **kw):
+    return compiler.process(func.timezone("utc", func.now()), **kw)
 
 
 class AssetType(str, enum.Enum):
@@ -30,17 +61,17 @@ class User(Base):
     
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), unique=True, index=True, nullable=False)
-    full_name = Column(String(255), nullable=False)
-    hashed_password = Column(String(255), nullable=False)
-    is_active = Column(Boolean, default=True)
-    is_superuser = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    full_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_superuser: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     # Relationships
-    analyses = relationship("Analysis", back_populates="user")
+    analyses: Mapped[List["Analysis"]] = relationship("Analysis", back_populates="user")
     
     def __repr__(self):
         return f"<User(email='{self.email}', name='{self.full_name}')>"
@@ -51,42 +82,55 @@ class Analysis(Base):
     
     __tablename__ = "analyses"
     
-    id = Column(Integer, primary_key=True, index=True)
-    request_id = Column(String(36), unique=True, index=True, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    request_id: Mapped[str] = mapped_column(Uuid(as_uuid=False), unique=True, index=True, nullable=False)
     
     # User
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    user = relationship("User", back_populates="analyses")
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    user: Mapped["User"] = relationship("User", back_populates="analyses", lazy="joined")
     
     # Asset information
-    asset_type = Column(SQLEnum(AssetType), nullable=False)
-    ticker = Column(String(20), index=True, nullable=True)
-    company_name = Column(String(255), index=True, nullable=False)
+    asset_type: Mapped[AssetType] = mapped_column(SQLEnum(AssetType), nullable=False)
+    ticker: Mapped[Optional[str]] = mapped_column(String(20), index=True, nullable=True)
+    company_name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
     
     # Analysis results
-    final_recommendation = Column(SQLEnum(RecommendationType), nullable=False)
-    confidence = Column(Float, nullable=False)
+    final_recommendation: Mapped[RecommendationType] = mapped_column(SQLEnum(RecommendationType), nullable=False)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Agent analyses (JSON)
-    value_analysis = Column(JSON, nullable=True)
-    growth_analysis = Column(JSON, nullable=True)
-    risk_analysis = Column(JSON, nullable=True)
-    industry_analysis = Column(JSON, nullable=True)
-    forensics_analysis = Column(JSON, nullable=True)
+    value_analysis: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    growth_analysis: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    risk_analysis: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    industry_analysis: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    forensics_analysis: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
     
     # Debate results (JSON)
-    debate_results = Column(JSON, nullable=True)
+    debate_results: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
     
     # Report
-    report_markdown = Column(Text, nullable=True)
-    report_type = Column(String(50), nullable=True)
+    report_markdown: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    report_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
     # Metadata
-    analysis_duration = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    analysis_duration: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now(), index=True)
     
     # Relationships
-    agent_responses = relationship("AgentResponse", back_populates="analysis")
+    agent_responses: Mapped[List["AgentResponse"]] = relationship("AgentResponse", back_populates="analysis", lazy="selectin")
+    
+    __table_args__ = (
+        # Covers the recommendation counts and average confidence statistics
+        Index("ix_analyses_recommendation_confidence", "final_recommendation", "confidence"),
+        # Serve "latest analyses for a user/ticker" without a sort step
+        Index("idx_analyses_user_created", user_id, created_at.desc()),
+        Index(
+            "idx_analyses_ticker_created",
+            ticker,
+            created_at.desc(),
+            postgresql_where=ticker.isnot(None)
+        ),
+    )
     
     def __repr__(self):
         return f"<Analysis(id={self.id}, ticker='{self.ticker}', recommendation='{self.final_recommendation}')>"
@@ -97,29 +141,29 @@ class AgentResponse(Base):
     
     __tablename__ = "agent_responses"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Analysis reference
-    analysis_id = Column(Integer, ForeignKey("analyses.id"), nullable=False)
-    analysis = relationship("Analysis", back_populates="agent_responses")
+    analysis_id: Mapped[int] = mapped_column(Integer, ForeignKey("analyses.id"), nullable=False)
+    analysis: Mapped["Analysis"] = relationship("Analysis", back_populates="agent_responses")
     
     # Agent information
-    agent_role = Column(String(50), nullable=False)
-    agent_name = Column(String(100), nullable=False)
+    agent_role: Mapped[str] = mapped_column(String(50), nullable=False)
+    agent_name: Mapped[str] = mapped_column(String(100), nullable=False)
     
     # Response data
-    analysis_text = Column(Text, nullable=False)
-    recommendation = Column(SQLEnum(RecommendationType), nullable=False)
-    confidence = Column(Float, nullable=False)
+    analysis_text: Mapped[str] = mapped_column(Text, nullable=False)
+    recommendation: Mapped[RecommendationType] = mapped_column(SQLEnum(RecommendationType), nullable=False)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Supporting data (JSON)
-    supporting_data = Column(JSON, nullable=False)
-    frameworks_used = Column(JSON, nullable=False)
-    concerns = Column(JSON, nullable=False)
-    opportunities = Column(JSON, nullable=False)
+    supporting_data: Mapped[Any] = mapped_column(JSONType, nullable=False)
+    frameworks_used: Mapped[Any] = mapped_column(JSONType, nullable=False)
+    concerns: Mapped[Any] = mapped_column(JSONType, nullable=False)
+    opportunities: Mapped[Any] = mapped_column(JSONType, nullable=False)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now())
     
     def __repr__(self):
         return f"<AgentResponse(agent='{self.agent_role}', recommendation='{self.recommendation}')>"
@@ -130,22 +174,29 @@ class MarketData(Base):
     
     __tablename__ = "market_data"
     
-    id = Column(Integer, primary_key=True, index=True)
+    # The partition key must be part of the primary key
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True, index=True)
     
     # Asset information
-    ticker = Column(String(20), index=True, nullable=False)
+    ticker: Mapped[str] = mapped_column(String(20), nullable=False)
     
     # Price data
-    open_price = Column(Float, nullable=True)
-    high_price = Column(Float, nullable=True)
-    low_price = Column(Float, nullable=True)
-    close_price = Column(Float, nullable=False)
-    volume = Column(Integer, nullable=True)
+    open_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    high_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    low_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    close_price: Mapped[float] = mapped_column(Float, nullable=False)
+    volume: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
     # Metadata
-    date = Column(DateTime, index=True, nullable=False)
-    source = Column(String(50), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    date: Mapped[datetime] = mapped_column(DateTime, primary_key=True, nullable=False)
+    source: Mapped[str] = mapped_column(String(50), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now())
+    
+    __table_args__ = (
+        # Ticker time-series range scans; also serves ticker-only lookups
+        Index("ix_market_data_ticker_date", "ticker", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
     
     def __repr__(self):
         return f"<MarketData(ticker='{self.ticker}', date='{self.date}', close={self.close_price})>"
@@ -156,27 +207,32 @@ class FinancialData(Base):
     
     __tablename__ = "financial_data"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Company information
-    ticker = Column(String(20), index=True, nullable=False)
-    company_name = Column(String(255), nullable=False)
+    ticker: Mapped[str] = mapped_column(String(20), nullable=False)
+    company_name: Mapped[str] = mapped_column(String(255), nullable=False)
     
     # Financial metrics (JSON for flexibility)
-    income_statement = Column(JSON, nullable=True)
-    balance_sheet = Column(JSON, nullable=True)
-    cash_flow = Column(JSON, nullable=True)
-    key_metrics = Column(JSON, nullable=True)
+    income_statement: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    balance_sheet: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    cash_flow: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    key_metrics: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
     
     # Period information
-    fiscal_year = Column(Integer, nullable=False)
-    fiscal_quarter = Column(Integer, nullable=True)
-    period_type = Column(String(20), nullable=False)  # annual, quarterly
+    fiscal_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    fiscal_quarter: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    period_type: Mapped[str] = mapped_column(String(20), nullable=False)  # annual, quarterly
     
     # Metadata
-    source = Column(String(50), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    source: Mapped[str] = mapped_column(String(50), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now(), onupdate=utc_now())
+    
+    __table_args__ = (
+        # Ticker/period lookups; also serves ticker-only lookups
+        Index("ix_financial_data_ticker_period", "ticker", "fiscal_year", "fiscal_quarter"),
+    )
     
     def __repr__(self):
         return f"<FinancialData(ticker='{self.ticker}', year={self.fiscal_year})>"
@@ -187,24 +243,24 @@ class Document(Base):
     
     __tablename__ = "documents"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Document information
-    filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    file_type = Column(String(50), nullable=False)
-    file_size = Column(Integer, nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    file_size: Mapped[int] = mapped_column(Integer, nullable=False)
     
     # Associated company
-    company_name = Column(String(255), index=True, nullable=False)
+    company_name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
     
     # Processed data (JSON)
-    extracted_text = Column(Text, nullable=True)
-    processed_data = Column(JSON, nullable=True)
+    extracted_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    processed_data: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
     
     # Metadata
-    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    uploaded_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now())
     
     def __repr__(self):
         return f"<Document(filename='{self.filename}', company='{self.company_name}')>"
@@ -215,25 +271,25 @@ class RAGFramework(Base):
     
     __tablename__ = "rag_frameworks"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Framework information
-    name = Column(String(255), nullable=False, index=True)
-    category = Column(String(100), nullable=False, index=True)
-    description = Column(Text, nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    category: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
     
     # Framework content
-    methodology = Column(Text, nullable=True)
-    key_metrics = Column(JSON, nullable=True)
-    interpretation_guide = Column(Text, nullable=True)
+    methodology: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    key_metrics: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    interpretation_guide: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Examples and references
-    examples = Column(JSON, nullable=True)
-    references = Column(JSON, nullable=True)
+    examples: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
+    references: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     def __repr__(self):
         return f"<RAGFramework(name='{self.name}', category='{self.category}')>"
@@ -244,25 +300,25 @@ class AnalysisHistory(Base):
     
     __tablename__ = "analysis_history"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Reference to original analysis
-    analysis_id = Column(Integer, ForeignKey("analyses.id"), nullable=False)
+    analysis_id: Mapped[int] = mapped_column(Integer, ForeignKey("analyses.id"), nullable=False)
     
     # Actual outcome (for backtesting)
-    actual_outcome = Column(String(50), nullable=True)
-    outcome_date = Column(DateTime, nullable=True)
+    actual_outcome: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    outcome_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Performance metrics
-    accuracy_score = Column(Float, nullable=True)
-    return_achieved = Column(Float, nullable=True)
+    accuracy_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    return_achieved: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
     # Notes
-    notes = Column(Text, nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     def __repr__(self):
         return f"<AnalysisHistory(analysis_id={self.analysis_id}, outcome='{self.actual_outcome}')>"
@@ -273,18 +329,39 @@ class SystemMetrics(Base):
     
     __tablename__ = "system_metrics"
     
-    id = Column(Integer, primary_key=True, index=True)
+    # The partition key must be part of the primary key
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True, index=True)
     
     # Metric information
-    metric_name = Column(String(100), nullable=False, index=True)
-    metric_value = Column(Float, nullable=False)
-    metric_unit = Column(String(50), nullable=True)
+    metric_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    metric_value: Mapped[float] = mapped_column(Float, nullable=False)
+    metric_unit: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
     # Tags (JSON for flexibility)
-    tags = Column(JSON, nullable=True)
+    tags: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
     
     # Metadata
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, primary_key=True, server_default=utc_now(), index=True)
+    
+    __table_args__ = (
+        # Containment filters such as tags @> '{"env": "prod"}'
+        Index("ix_system_metrics_tags", "tags", postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
     def __repr__(self):
         return f"<SystemMetrics(name='{self.metric_name}', value={self.metric_value})>"
+
+
+# Time-partitioned tables get a catch-all partition so inserts work as soon as
+# the table exists; monthly partitions are created (and old ones detached) by
+# the database maintenance job, e.g. pg_partman
+_DEFAULT_PARTITION = DDL(
+    "CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT"
+).execute_if(dialect="postgresql")
+
+for _table in (MarketData.__table__, SystemMetrics.__table__):
+    event.listen(_table, "after_create", _DEFAULT_PARTITION)
+
+# Resolve relationships now rather than on the first query
+configure_mappers()
@@ -2,13 +2,18 @@
 Main FastAPI application entry point for Fyn RAG Investment Committee System.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 
 from app.core.config import settings
 from app.api.endpoints import rag, data, analysis, monitoring, advanced_analysis, api_health
+from app.core.utils.rate_limiter import get_rate_limiter
+from app.db.database import connect_db, engine
 
 # Configure logging
 logging.basicConfig(
@@ -17,12 +22,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+async def warm_db_pool() -> None:
+    """
+    Open DB_POOL_SIZE connections in parallel and return them to the pool.
+    
+    Early requests then reuse established connections instead of each paying
+    the TCP handshake and authentication cost.
+    """
+    if settings.EXTERNAL_POOLER:
+        return  # NullPool keeps nothing to warm
+    
+    results = await asyncio.gather(
+        *(asyncio.to_thread(connect_db) for _ in range(settings.DB_POOL_SIZE)),
+        return_exceptions=True
+    )
+    opened = 0
+    for result in results:
+        if isinstance(result, Exception):
+            continue
+        result.close()
+        opened += 1
+    
+    if opened < len(results):
+        logger.warning(f"Database pool warmup opened {opened}/{len(results)} connections")
+    else:
+        logger.info(f"Database pool warmed with {opened} connections")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup and clean up on shutdown."""
+    logger.info("Starting Fyn RAG Investment Committee System...")
+    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    logger.info(f"Debug mode: {settings.DEBUG}")
+    
+    await warm_db_pool()
+    
+    # Pre-allocate the enforced endpoint rate limiters so first requests
+    # skip allocation
+    get_rate_limiter().register_endpoints([analysis.ANALYSIS_RATE_LIMIT_KEY])
+    
+    # The RAG system (embedding models, FAISS index) is created and loaded by
+    # get_rag_system() on the first request that needs it
+    
+    logger.info("Startup complete!")
+    
+    yield
+    
+    logger.info("Shutting down Fyn RAG Investment Committee System...")
+    engine.dispose()
+    # TODO: Save any pending data
+    logger.info("Shutdown complete!")
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Fyn RAG Investment Committee",
     description="AI-powered Investment Analysis System with Multi-Agent Architecture",
     version="2.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -66,33 +127,6 @@ async def health_check():
     }
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on application startup."""
-    logger.info("Starting Fyn RAG Investment Committee System...")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    
-    # Initialize RAG System
-    try:
-        from app.core.rag.rag_system import get_rag_system
-        rag = get_rag_system()
-        logger.info("RAG system instance created (will initialize on first use)")
-    except Exception as e:
-        logger.error(f"Failed to create RAG system: {e}")
-    
-    logger.info("Startup complete!")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on application shutdown."""
-    logger.info("Shutting down Fyn RAG Investment Committee System...")
-    # TODO: Close database connections
-    # TODO: Save any pending data
-    logger.info("Shutdown complete!")
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -4,7 +4,11 @@ Pytest configuration and fixtures.
 
 import pytest
 import os
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+
+from pytest_asyncio import is_async_test
 
 
 def pytest_configure(config):
@@ -15,24 +19,56 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "integration: marks tests as integration tests requiring API keys"
     )
+    # Registered here too so runs without pytest-xdist don't warn about it
+    config.addinivalue_line(
+        "markers", "xdist_group(name): keep tests on one xdist worker under --dist=loadgroup"
+    )
+    # Registered here too so runs without pytest-recording don't warn about it
+    config.addinivalue_line(
+        "markers", "vcr: replay HTTP traffic from the test module's VCR cassettes"
+    )
 
 
-@pytest.fixture(scope="session")
-def test_data_dir():
-    """Provide path to test data directory."""
+def pytest_addoption(parser):
+    """Add custom pytest options."""
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="Run integration tests that require API keys"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Run every async test on one session-wide event loop and skip
+    integration tests unless --run-integration is given.
+    """
+    session_loop = pytest.mark.asyncio(scope="session")
+    run_integration = config.getoption("--run-integration")
+    skip_integration = pytest.mark.skip(reason="need --run-integration to run")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+        if not run_integration and "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+
+@lru_cache(maxsize=1)
+def _test_data_dir() -> Path:
     return Path(__file__).parent / "test_data"
 
 
-@pytest.fixture(scope="session")
-def sample_kb():
-    """Provide sample knowledge base data."""
-    return [
+@lru_cache(maxsize=1)
+def _build_kb():
+    """Build the sample knowledge base once, as read-only mappings."""
+    frameworks = [
         {
             "name": "DCF Valuation",
             "category": "Valuation",
             "description": "Discounted Cash Flow valuation method",
             "core_concept": "Present value of future cash flows",
-            "key_metrics": ["FCF", "WACC", "Terminal Value"],
+            "key_metrics": ("FCF", "WACC", "Terminal Value"),
             "application": "Used for valuing companies based on cash flow projections"
         },
         {
@@ -40,10 +76,33 @@ def sample_kb():
             "category": "Value Investing",
             "description": "Framework for identifying sustainable competitive advantages",
             "core_concept": "Economic moats protect long-term profitability",
-            "key_metrics": ["Switching costs", "Network effects", "Brand strength"],
+            "key_metrics": ("Switching costs", "Network effects", "Brand strength"),
             "application": "Identify companies with durable competitive advantages"
         }
     ]
+    return tuple(MappingProxyType(framework) for framework in frameworks)
+
+
+@pytest.fixture(scope="session")
+def test_data_dir():
+    """Provide path to test data directory."""
+    return _test_data_dir()
+
+
+@pytest.fixture(scope="session")
+def sample_kb():
+    """Provide sample knowledge base data (immutable; copy before modifying)."""
+    return _build_kb()
+
+
+@pytest.fixture(scope="session")
+def minilm_indexer():
+    """Load the small sentence-transformers model once per session."""
+    from app.core.rag.embedding_indexer import EmbeddingIndexer
+    
+    indexer = EmbeddingIndexer(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    indexer.load_model()
+    return indexer
 
 
 @pytest.fixture
@@ -3,6 +3,8 @@ Integration tests for Advanced Analysis with Tool Use.
 Tests the complete investment analysis pipeline.
 """
 
+import asyncio
+import threading
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime
@@ -57,14 +59,12 @@ class TestToolExecutor:
         """Create a ToolExecutor instance."""
         return ToolExecutor()
 
-    @pytest.mark.asyncio
     async def test_execute_unknown_tool(self, executor):
         """Test executing an unknown tool returns error."""
         result = await executor.execute("unknown_tool", {})
         assert "error" in result
         assert "Unknown tool" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_execute_stock_price_mock(self, executor):
         """Test stock price tool with mock data."""
         result = await executor.execute("get_stock_price", {"ticker": "AAPL"})
@@ -73,7 +73,6 @@ class TestToolExecutor:
         assert "result" in result
         assert result["tool"] == "get_stock_price"
 
-    @pytest.mark.asyncio
     async def test_execute_fundamental_data_mock(self, executor):
         """Test fundamental data tool with mock data."""
         result = await executor.execute("get_fundamental_data", {
@@ -84,7 +83,6 @@ class TestToolExecutor:
         assert result["success"] is True
         assert "result" in result
 
-    @pytest.mark.asyncio
     async def test_execute_query_frameworks(self, executor):
         """Test querying investment frameworks."""
         with patch('app.core.tools.tool_definitions.get_rag_system') as mock_rag:
@@ -99,6 +97,30 @@ class TestToolExecutor:
 
             assert result["success"] is True
 
+    async def test_executor_parallel_throughput(self, executor):
+        """Test concurrent tool calls overlap their (blocking) data fetches."""
+        from app.core.config import settings
+        from app.data.fetchers.polygon_fetcher import PolygonFetcher
+
+        # Each fetch waits for a partner fetch, which only arrives if the
+        # executor runs them concurrently; serialized calls time out instead
+        rendezvous = threading.Barrier(2, timeout=5)
+
+        def paired_fetch(ticker):
+            rendezvous.wait()
+            return {"success": True, "data": {"ticker": ticker}}
+
+        tickers = ["AAPL", "MSFT", "GOOGL", "AMZN"] * 5
+        with patch.object(settings, "POLYGON_API_KEY", "test-key"), \
+             patch.object(PolygonFetcher, "fetch_ticker_details", side_effect=paired_fetch):
+            results = await asyncio.gather(*[
+                executor.execute("get_stock_price", {"ticker": ticker})
+                for ticker in tickers
+            ])
+
+        assert [r["result"]["ticker"] for r in results] == tickers
+        assert not rendezvous.broken
+
 
 class TestAdvancedToolClient:
     """Tests for the AdvancedToolClient."""
@@ -130,7 +152,6 @@ class TestAdvancedToolClient:
         assert "analysis" in prompt
         assert "framework" in prompt
 
-    @pytest.mark.asyncio
     async def test_analyze_with_mock_response(self, client, mock_anthropic):
         """Test analysis with mocked Anthropic response."""
         # Mock the message response
@@ -148,7 +169,6 @@ class TestAdvancedToolClient:
 class TestToolIntegration:
     """Integration tests for the complete tool use flow."""
 
-    @pytest.mark.asyncio
     async def test_complete_analysis_flow_mock(self):
         """Test a complete analysis flow with mocked components."""
         with patch('app.core.llm.advanced_tool_client.AsyncAnthropic') as mock_anthropic:
@@ -2,9 +2,12 @@
 Comprehensive tests for specialized agents.
 """
 
+import math
+import numbers
+from collections import ChainMap
+from types import MappingProxyType
+
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
-from datetime import datetime
 
 from app.core.agents.base_agent import BaseAgent, AgentRole, AgentResponse
 from app.core.agents.value_investing_agent import ValueInvestingAgent
@@ -13,11 +16,31 @@ from app.core.agents.risk_management_agent import RiskManagementAgent
 from app.core.agents.industry_competitive_agent import IndustryCompetitiveAgent
 from app.core.agents.financial_forensics_agent import FinancialForensicsAgent
 
+_VALID_RECS = frozenset({"BUY", "HOLD", "SELL"})
+_VALID_ROLES = frozenset(AgentRole)
+_VALID_POSITIONS = frozenset({"leader", "challenger", "follower", "niche"})
+_REAL = numbers.Real
+RESPONSE_SCHEMA = {
+    "supporting_data": dict,
+    "frameworks_used": list,
+    "concerns": list,
+    "opportunities": list,
+}
+
+
+def assert_valid_response(response):
+    """Validate an AgentResponse's shape in one pass over its fields."""
+    assert isinstance(response, AgentResponse)
+    assert response.agent_role in _VALID_ROLES
+    assert response.recommendation in _VALID_RECS
+    assert math.isfinite(response.confidence) and 0.0 <= response.confidence <= 1.0
+    assert all(isinstance(getattr(response, name), kind) for name, kind in RESPONSE_SCHEMA.items())
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_context():
-    """Sample context for testing."""
-    return {
+    """Sample context for testing (read-only; overlay or copy to override)."""
+    return MappingProxyType({
         "ticker": "AAPL",
         "company_name": "Apple Inc.",
         "current_price": 180.0,
@@ -33,26 +56,26 @@ def sample_context():
         "pb_ratio": 45.0,
         "industry": "Technology",
         "sector": "Consumer Electronics"
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_rag_results():
-    """Sample RAG results for testing."""
-    return [
-        {
+    """Sample RAG results for testing (read-only)."""
+    return (
+        MappingProxyType({
             "framework": "Discounted Cash Flow",
             "description": "DCF valuation methodology",
             "category": "valuation",
             "score": 0.95
-        },
-        {
+        }),
+        MappingProxyType({
             "framework": "Porter's Five Forces",
             "description": "Industry analysis framework",
             "category": "competitive",
             "score": 0.88
-        }
-    ]
+        })
+    )
 
 
 class TestBaseAgent:
@@ -69,7 +92,6 @@ class TestBaseAgent:
         assert agent.name == "Test Agent"
         assert agent.frameworks == []
     
-    @pytest.mark.asyncio
     async def test_base_agent_analyze_not_implemented(self, sample_context, sample_rag_results):
         """Test base agent analyze raises NotImplementedError."""
         agent = BaseAgent(
@@ -84,7 +106,7 @@ class TestBaseAgent:
 class TestValueInvestingAgent:
     """Tests for Value Investing Agent."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def agent(self):
         """Create Value Investing Agent instance."""
         return ValueInvestingAgent()
@@ -96,7 +118,6 @@ class TestValueInvestingAgent:
         assert len(agent.frameworks) > 0
         assert "Discounted Cash Flow" in agent.frameworks
     
-    @pytest.mark.asyncio
     async def test_analyze_returns_response(self, agent, sample_context, sample_rag_results):
         """Test analyze returns proper AgentResponse."""
         response = await agent.analyze(
@@ -105,13 +126,10 @@ class TestValueInvestingAgent:
             sample_rag_results
         )
         
-        assert isinstance(response, AgentResponse)
+        assert_valid_response(response)
         assert response.agent_role == AgentRole.VALUE_INVESTING
-        assert response.recommendation in ["BUY", "HOLD", "SELL"]
-        assert 0 <= response.confidence <= 1
         assert len(response.frameworks_used) > 0
     
-    @pytest.mark.asyncio
     async def test_calculate_intrinsic_value(self, agent, sample_context):
         """Test intrinsic value calculation."""
         response = await agent.analyze(
@@ -123,7 +141,6 @@ class TestValueInvestingAgent:
         assert "intrinsic_value" in response.supporting_data
         assert response.supporting_data["intrinsic_value"] > 0
     
-    @pytest.mark.asyncio
     async def test_margin_of_safety_calculation(self, agent, sample_context):
         """Test margin of safety is calculated."""
         response = await agent.analyze(
@@ -134,22 +151,22 @@ class TestValueInvestingAgent:
         
         assert "margin_of_safety" in response.supporting_data
         margin = response.supporting_data["margin_of_safety"]
-        assert isinstance(margin, (int, float))
+        assert isinstance(margin, _REAL)
 
 
 class TestGrowthVCAgent:
     """Tests for Growth & VC Agent."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def agent(self):
         """Create Growth & VC Agent instance."""
         return GrowthVCAgent()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def growth_context(self, sample_context):
         """Context for growth company."""
-        context = sample_context.copy()
-        context.update({
+        return {
+            **sample_context,
             "revenue_growth": 0.25,
             "cac": 1000,
             "ltv": 5000,
@@ -158,15 +175,13 @@ class TestGrowthVCAgent:
             "tam": 100000000000,
             "sam": 20000000000,
             "som": 2000000000
-        })
-        return context
+        }
     
     def test_agent_initialization(self, agent):
         """Test agent is properly initialized."""
         assert agent.role == AgentRole.GROWTH_VC
         assert "Rule of 40" in agent.frameworks
     
-    @pytest.mark.asyncio
     async def test_rule_of_40_calculation(self, agent, growth_context):
         """Test Rule of 40 calculation."""
         response = await agent.analyze(
@@ -177,9 +192,8 @@ class TestGrowthVCAgent:
         
         assert "rule_of_40" in response.supporting_data
         rule_of_40 = response.supporting_data["rule_of_40"]
-        assert isinstance(rule_of_40, (int, float))
+        assert isinstance(rule_of_40, _REAL)
     
-    @pytest.mark.asyncio
     async def test_ltv_cac_ratio(self, agent, growth_context):
         """Test LTV/CAC ratio calculation."""
         response = await agent.analyze(
@@ -196,30 +210,28 @@ class TestGrowthVCAgent:
 class TestRiskManagementAgent:
     """Tests for Risk Management Agent."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def agent(self):
         """Create Risk Management Agent instance."""
         return RiskManagementAgent()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def risk_context(self, sample_context):
         """Context with risk data."""
-        context = sample_context.copy()
-        context.update({
+        return {
+            **sample_context,
             "volatility": 0.25,
             "beta": 1.2,
             "current_ratio": 1.5,
             "quick_ratio": 1.2,
             "debt_to_equity": 1.8
-        })
-        return context
+        }
     
     def test_agent_initialization(self, agent):
         """Test agent is properly initialized."""
         assert agent.role == AgentRole.RISK_MANAGEMENT
         assert "Value at Risk" in agent.frameworks
     
-    @pytest.mark.asyncio
     async def test_var_calculation(self, agent, risk_context):
         """Test VaR calculation."""
         response = await agent.analyze(
@@ -230,15 +242,15 @@ class TestRiskManagementAgent:
         
         assert "var_95" in response.supporting_data
         var = response.supporting_data["var_95"]
-        assert isinstance(var, (int, float))
+        assert isinstance(var, _REAL)
         assert var < 0  # VaR should be negative
     
-    @pytest.mark.asyncio
     async def test_identifies_high_risk(self, agent, risk_context):
         """Test agent identifies high risk scenarios."""
-        high_risk_context = risk_context.copy()
-        high_risk_context["debt_to_equity"] = 5.0
-        high_risk_context["current_ratio"] = 0.5
+        high_risk_context = ChainMap(
+            {"debt_to_equity": 5.0, "current_ratio": 0.5},
+            risk_context
+        )
         
         response = await agent.analyze(
             "Assess risk",
@@ -253,31 +265,29 @@ class TestRiskManagementAgent:
 class TestIndustryCompetitiveAgent:
     """Tests for Industry & Competitive Agent."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def agent(self):
         """Create Industry & Competitive Agent instance."""
         return IndustryCompetitiveAgent()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def industry_context(self, sample_context):
         """Context with industry data."""
-        context = sample_context.copy()
-        context.update({
+        return {
+            **sample_context,
             "market_share": 0.15,
             "industry_growth": 0.08,
             "competitive_position": "leader",
             "barriers_to_entry": "high",
             "supplier_power": "low",
             "buyer_power": "medium"
-        })
-        return context
+        }
     
     def test_agent_initialization(self, agent):
         """Test agent is properly initialized."""
         assert agent.role == AgentRole.INDUSTRY_COMPETITIVE
         assert "Porter's Five Forces" in agent.frameworks
     
-    @pytest.mark.asyncio
     async def test_porters_five_forces(self, agent, industry_context):
         """Test Porter's Five Forces analysis."""
         response = await agent.analyze(
@@ -289,7 +299,6 @@ class TestIndustryCompetitiveAgent:
         assert "industry_attractiveness" in response.supporting_data
         assert "competitive_position" in response.supporting_data
     
-    @pytest.mark.asyncio
     async def test_identifies_market_leader(self, agent, industry_context):
         """Test agent identifies market leaders."""
         response = await agent.analyze(
@@ -299,22 +308,22 @@ class TestIndustryCompetitiveAgent:
         )
         
         position = response.supporting_data.get("competitive_position")
-        assert position in ["leader", "challenger", "follower", "niche"]
+        assert position in _VALID_POSITIONS
 
 
 class TestFinancialForensicsAgent:
     """Tests for Financial Forensics Agent."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def agent(self):
         """Create Financial Forensics Agent instance."""
         return FinancialForensicsAgent()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def forensics_context(self, sample_context):
         """Context with forensics data."""
-        context = sample_context.copy()
-        context.update({
+        return {
+            **sample_context,
             "days_sales_outstanding": 45,
             "asset_quality_index": 1.1,
             "sales_growth_index": 1.2,
@@ -325,15 +334,13 @@ class TestFinancialForensicsAgent:
             "working_capital": 20000000000,
             "current_assets": 150000000000,
             "current_liabilities": 130000000000
-        })
-        return context
+        }
     
     def test_agent_initialization(self, agent):
         """Test agent is properly initialized."""
         assert agent.role == AgentRole.FINANCIAL_FORENSICS
         assert "Beneish M-Score" in agent.frameworks
     
-    @pytest.mark.asyncio
     async def test_m_score_calculation(self, agent, forensics_context):
         """Test M-Score calculation."""
         response = await agent.analyze(
@@ -344,9 +351,8 @@ class TestFinancialForensicsAgent:
         
         assert "m_score" in response.supporting_data
         m_score = response.supporting_data["m_score"]
-        assert isinstance(m_score, (int, float))
+        assert isinstance(m_score, _REAL)
     
-    @pytest.mark.asyncio
     async def test_z_score_calculation(self, agent, forensics_context):
         """Test Z-Score calculation."""
         response = await agent.analyze(
@@ -357,14 +363,17 @@ class TestFinancialForensicsAgent:
         
         assert "z_score" in response.supporting_data
         z_score = response.supporting_data["z_score"]
-        assert isinstance(z_score, (int, float))
+        assert isinstance(z_score, _REAL)
     
-    @pytest.mark.asyncio
     async def test_detects_red_flags(self, agent, forensics_context):
         """Test agent detects accounting red flags."""
-        suspicious_context = forensics_context.copy()
-        suspicious_context["days_sales_outstanding"] = 120  # Very high DSO
-        suspicious_context["total_accruals"] = 50000000000  # High accruals
+        suspicious_context = ChainMap(
+            {
+                "days_sales_outstanding": 120,  # Very high DSO
+                "total_accruals": 50000000000  # High accruals
+            },
+            forensics_context
+        )
         
         response = await agent.analyze(
             "Investigate financials",
@@ -375,34 +384,27 @@ class TestFinancialForensicsAgent:
         assert len(response.concerns) > 0
 
 
-@pytest.mark.asyncio
-async def test_all_agents_return_valid_responses(sample_context, sample_rag_results):
-    """Integration test: all agents return valid responses."""
-    agents = [
-        ValueInvestingAgent(),
-        GrowthVCAgent(),
-        RiskManagementAgent(),
-        IndustryCompetitiveAgent(),
-        FinancialForensicsAgent()
-    ]
+@pytest.mark.parametrize(
+    "agent_cls",
+    [
+        ValueInvestingAgent,
+        GrowthVCAgent,
+        RiskManagementAgent,
+        IndustryCompetitiveAgent,
+        FinancialForensicsAgent
+    ],
+    ids=lambda cls: cls.__name__
+)
+async def test_all_agents_return_valid_responses(agent_cls, sample_context, sample_rag_results):
+    """Integration test: every agent returns a valid response."""
+    response = await agent_cls().analyze(
+        f"Analyze {sample_context['ticker']}",
+        sample_context,
+        sample_rag_results
+    )
     
-    for agent in agents:
-        response = await agent.analyze(
-            f"Analyze {sample_context['ticker']}",
-            sample_context,
-            sample_rag_results
-        )
-        
-        # Validate response structure
-        assert isinstance(response, AgentResponse)
-        assert response.agent_role in AgentRole
-        assert response.analysis
-        assert response.recommendation in ["BUY", "HOLD", "SELL"]
-        assert 0 <= response.confidence <= 1
-        assert isinstance(response.supporting_data, dict)
-        assert isinstance(response.frameworks_used, list)
-        assert isinstance(response.concerns, list)
-        assert isinstance(response.opportunities, list)
+    assert_valid_response(response)
+    assert response.analysis
 
 
 if __name__ == "__main__":
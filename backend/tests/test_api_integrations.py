@@ -6,11 +6,32 @@ Tests FRED, Trading Economics, and Reddit APIs.
 import pytest
 from unittest.mock import patch, MagicMock
 import os
+import pandas as pd
+from praw.models import Submission
 
+from app.data.fetchers.fmp_fetcher import FMPFetcher
 from app.data.fetchers.fred_fetcher import FREDFetcher
 from app.data.fetchers.trading_economics_fetcher import TradingEconomicsFetcher
 from app.data.fetchers.reddit_fetcher import RedditFetcher
 
+FRED_KEY = os.getenv("FRED_API_KEY")
+TE_KEY = os.getenv("TRADING_ECONOMICS_API_KEY")
+REDDIT_ID = os.getenv("REDDIT_CLIENT_ID")
+REDDIT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
+REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
+
+
+@pytest.fixture(scope="module")
+def fred_fetcher():
+    """FRED fetcher with a placeholder key, shared by mocked/error tests."""
+    return FREDFetcher("test_key")
+
+
+@pytest.fixture(scope="module")
+def te_fetcher():
+    """Trading Economics fetcher with a placeholder key, shared by mocked/error tests."""
+    return TradingEconomicsFetcher("test:key")
+
 
 class TestFREDFetcher:
     """Tests for FRED API fetcher."""
@@ -19,36 +40,27 @@ class TestFREDFetcher:
     def fetcher(self):
         """Create FRED fetcher with test API key."""
         # Use environment variable or test key
-        api_key = os.getenv("FRED_API_KEY", "test_key")
+        api_key = FRED_KEY or "test_key"
         return FREDFetcher(api_key)
 
-    def test_fetcher_initialization(self, fetcher):
-        """Test fetcher initializes correctly."""
-        assert fetcher is not None
-        assert fetcher.api_key is not None
-
     @pytest.mark.integration
+    @pytest.mark.skipif(not FRED_KEY, reason="FRED_API_KEY not set")
     def test_fetch_gdp_series(self, fetcher):
         """Test fetching GDP series from FRED."""
-        if not os.getenv("FRED_API_KEY"):
-            pytest.skip("FRED_API_KEY not set")
-
         result = fetcher.fetch_series("GDP")
 
         assert result["success"] is True
         assert "data" in result
 
     @pytest.mark.integration
+    @pytest.mark.skipif(not FRED_KEY, reason="FRED_API_KEY not set")
     def test_fetch_inflation_data(self, fetcher):
         """Test fetching inflation (CPI) data."""
-        if not os.getenv("FRED_API_KEY"):
-            pytest.skip("FRED_API_KEY not set")
-
         result = fetcher.fetch_series("CPIAUCSL")
 
         assert result["success"] is True
 
-    def test_fetch_with_mock(self, fetcher):
+    def test_fetch_with_mock(self, fred_fetcher, monkeypatch):
         """Test fetching with mocked response."""
         mock_data = {
             "observations": [
@@ -57,9 +69,62 @@ class TestFREDFetcher:
             ]
         }
 
+        monkeypatch.setattr(fred_fetcher, "_make_request", lambda *args, **kwargs: mock_data)
+        result = fred_fetcher.fetch_series("TEST")
+        assert result["success"] is True
+
+    def test_series_disk_cache(self, tmp_path):
+        """Test repeated series fetches are served from the disk cache."""
+        fetcher = FREDFetcher("test_key", cache_dir=str(tmp_path))
+        mock_data = {
+            "observations": [
+                {"date": "2024-01-01", "value": "100.5"},
+                {"date": "2024-02-01", "value": "101.2"}
+            ]
+        }
+
+        with patch.object(fetcher, '_make_request', return_value=mock_data) as mock_get:
+            first = fetcher.fetch_series("GDP")
+            second = fetcher.fetch_series("GDP")
+
+        assert mock_get.call_count == 1
+        assert second["data"] == first["data"]
+        assert second["data"]["latest_date"] == "2024-02-01"
+
+    def test_disk_cache_off_by_default(self, fred_fetcher):
+        """Test the disk cache is only used when a directory is given."""
+        assert fred_fetcher.cache_dir is None
+
+    def test_fetch_series_as_pandas(self, fetcher):
+        """Test pandas output is only built through fredapi when requested."""
+        series = pd.Series([100.5, 101.2], index=pd.to_datetime(["2024-01-01", "2024-02-01"]))
+
+        with patch.object(fetcher.client, 'get_series', return_value=series):
+            result = fetcher.fetch_series("GDP", as_pandas=True)
+
+        assert result["success"] is True
+        assert isinstance(result["data"]["data"], pd.Series)
+        assert result["data"]["latest_value"] == 101.2
+
+    def test_economic_snapshot_with_mock(self, fetcher):
+        """Test snapshot uses the latest valid observation of each series."""
+        mock_data = {
+            "observations": [
+                {"date": "2024-03-01", "value": "."},
+                {"date": "2024-02-01", "value": "101.2"}
+            ]
+        }
+
         with patch.object(fetcher, '_make_request', return_value=mock_data):
-            result = fetcher.fetch_series("TEST")
-            assert result["success"] is True
+            result = fetcher.fetch_economic_snapshot()
+
+        assert result["success"] is True
+        assert list(result["data"]) == list(FREDFetcher.INDICATORS)
+        assert result["data"]["gdp"] == {
+            "value": 101.2,
+            "date": "2024-02-01",
+            "series_id": "GDP"
+        }
 
 
 class TestTradingEconomicsFetcher:
@@ -68,25 +133,35 @@ class TestTradingEconomicsFetcher:
     @pytest.fixture
     def fetcher(self):
         """Create Trading Economics fetcher."""
-        api_key = os.getenv("TRADING_ECONOMICS_API_KEY", "test_key:test_secret")
+        api_key = TE_KEY or "test_key:test_secret"
         return TradingEconomicsFetcher(api_key)
 
-    def test_fetcher_initialization(self, fetcher):
-        """Test fetcher initializes correctly."""
-        assert fetcher is not None
-
     def test_api_key_parsing(self, fetcher):
         """Test API key parsing with key:secret format."""
         te_fetcher = TradingEconomicsFetcher("mykey:mysecret")
         assert te_fetcher.key == "mykey"
         assert te_fetcher.secret == "mysecret"
 
+    def test_shares_http_session(self, fetcher):
+        """Test fetchers reuse one connection pool."""
+        fred_fetcher = FREDFetcher("test_key")
+        assert fetcher.session is fred_fetcher.session
+
+    def test_conditional_request_reuses_body(self, fetcher):
+        """Test a 304 response is served from the previously downloaded body."""
+        first = MagicMock(status_code=200, content=b'[{"Value": 1}]', headers={"ETag": '"v1"'})
+        second = MagicMock(status_code=304, content=b"", headers={})
+
+        with patch.object(fetcher.session, 'get', side_effect=[first, second]) as mock_get:
+            assert fetcher._make_request("markets/country/etag-test") == [{"Value": 1}]
+            assert fetcher._make_request("markets/country/etag-test") == [{"Value": 1}]
+
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
     @pytest.mark.integration
+    @pytest.mark.skipif(not TE_KEY, reason="TRADING_ECONOMICS_API_KEY not set")
     def test_fetch_us_indicators(self, fetcher):
         """Test fetching US economic indicators."""
-        if not os.getenv("TRADING_ECONOMICS_API_KEY"):
-            pytest.skip("TRADING_ECONOMICS_API_KEY not set")
-
         result = fetcher.fetch_indicators("united states")
 
         assert "success" in result
@@ -94,11 +169,9 @@ class TestTradingEconomicsFetcher:
             assert "data" in result
 
     @pytest.mark.integration
+    @pytest.mark.skipif(not TE_KEY, reason="TRADING_ECONOMICS_API_KEY not set")
     def test_fetch_forecasts(self, fetcher):
         """Test fetching economic forecasts."""
-        if not os.getenv("TRADING_ECONOMICS_API_KEY"):
-            pytest.skip("TRADING_ECONOMICS_API_KEY not set")
-
         result = fetcher.fetch_forecasts("united states")
 
         assert "success" in result
@@ -110,22 +183,15 @@ class TestRedditFetcher:
     @pytest.fixture
     def fetcher(self):
         """Create Reddit fetcher with test credentials."""
-        client_id = os.getenv("REDDIT_CLIENT_ID", "test_id")
-        client_secret = os.getenv("REDDIT_CLIENT_SECRET", "test_secret")
-        user_agent = os.getenv("REDDIT_USER_AGENT", "FynRAG/1.0 test")
+        client_id = REDDIT_ID or "test_id"
+        client_secret = REDDIT_SECRET or "test_secret"
+        user_agent = REDDIT_USER_AGENT or "FynRAG/1.0 test"
         return RedditFetcher(client_id, client_secret, user_agent)
 
-    def test_fetcher_initialization(self, fetcher):
-        """Test fetcher initializes correctly."""
-        assert fetcher is not None
-        assert fetcher.client_id is not None
-
     @pytest.mark.integration
+    @pytest.mark.skipif(not REDDIT_ID, reason="Reddit credentials not set")
     def test_fetch_wsb_posts(self, fetcher):
         """Test fetching posts from r/wallstreetbets."""
-        if not os.getenv("REDDIT_CLIENT_ID"):
-            pytest.skip("Reddit credentials not set")
-
         result = fetcher.fetch_subreddit_posts(
             subreddit_name="wallstreetbets",
             limit=10,
@@ -138,11 +204,9 @@ class TestRedditFetcher:
             assert "posts" in result["data"]
 
     @pytest.mark.integration
+    @pytest.mark.skipif(not REDDIT_ID, reason="Reddit credentials not set")
     def test_fetch_ticker_mentions(self, fetcher):
         """Test fetching mentions of a specific ticker."""
-        if not os.getenv("REDDIT_CLIENT_ID"):
-            pytest.skip("Reddit credentials not set")
-
         result = fetcher.fetch_ticker_mentions(
             ticker="AAPL",
             subreddit_name="wallstreetbets",
@@ -152,11 +216,9 @@ class TestRedditFetcher:
         assert "success" in result
 
     @pytest.mark.integration
+    @pytest.mark.skipif(not REDDIT_ID, reason="Reddit credentials not set")
     def test_sentiment_snapshot(self, fetcher):
         """Test getting sentiment snapshot for a ticker."""
-        if not os.getenv("REDDIT_CLIENT_ID"):
-            pytest.skip("Reddit credentials not set")
-
         result = fetcher.fetch_sentiment_snapshot("AAPL")
 
         assert "success" in result
@@ -164,22 +226,73 @@ class TestRedditFetcher:
             assert "data" in result
             assert "total_mentions" in result["data"]
 
+    def test_sentiment_snapshot_deduplicates_posts(self, fetcher):
+        """Test posts returned by several subreddits are counted once."""
+        posts = [
+            {"id": "a", "created_utc": "2024-01-01T00:00:00", "score": 10, "upvote_ratio": 0.9},
+            {"id": "b", "created_utc": "2024-01-02T00:00:00", "score": 20, "upvote_ratio": 0.8}
+        ]
+        mock_result = {"success": True, "data": {"posts": posts}}
+
+        with patch.object(fetcher, 'fetch_ticker_mentions', return_value=mock_result):
+            result = fetcher.fetch_sentiment_snapshot("AAPL")
+
+        assert result["data"]["total_mentions"] == 2
+        assert [post["id"] for post in result["data"]["recent_posts"]] == ["b", "a"]
+
+    def test_ticker_mentions_filters_listing(self, fetcher):
+        """Test only posts naming the ticker as a whole word are kept."""
+        listing = [
+            Submission(fetcher.reddit, _data={
+                "id": post_id, "title": title, "selftext": "", "author": "user",
+                "created_utc": 1704067200, "score": 1, "upvote_ratio": 1.0,
+                "num_comments": 0, "url": "", "permalink": f"/r/stocks/{post_id}"
+            })
+            for post_id, title in [("a", "$TSLA to the moon"), ("b", "TSLAQ is back")]
+        ]
+        subreddit = MagicMock()
+        subreddit.search.return_value = listing
+
+        with patch.object(fetcher.reddit, 'subreddit', return_value=subreddit):
+            result = fetcher.fetch_ticker_mentions("TSLA", subreddit_name="mentions-test")
+
+        assert [post["id"] for post in result["data"]["posts"]] == ["a"]
+        assert result["data"]["posts"][0]["permalink"] == "https://reddit.com/r/stocks/a"
+        assert result["data"]["posts"][0]["created_utc"] == "2024-01-01T00:00:00"
+
+    def test_subreddit_posts_field_projection(self, fetcher):
+        """Test only the requested post fields are built."""
+        listing = [
+            Submission(fetcher.reddit, _data={
+                "id": "a", "title": "Earnings thread", "selftext": "", "author": "user",
+                "created_utc": 1704067200, "score": 42, "upvote_ratio": 1.0,
+                "num_comments": 0, "url": "", "permalink": "/r/stocks/a"
+            })
+        ]
+        subreddit = MagicMock()
+        subreddit.hot.return_value = listing
+
+        with patch.object(fetcher.reddit, 'subreddit', return_value=subreddit):
+            result = fetcher.fetch_subreddit_posts("stocks", limit=1, fields=["title", "score"])
+            invalid = fetcher.fetch_subreddit_posts("stocks", limit=1, fields=["karma"])
+
+        assert result["data"]["posts"] == [{"title": "Earnings thread", "score": 42}]
+        assert invalid["success"] is False
+
 
 class TestAPIErrorHandling:
     """Test error handling for API integrations."""
 
-    def test_fred_invalid_key(self):
+    def test_fred_invalid_key(self, fred_fetcher):
         """Test FRED with invalid API key."""
-        fetcher = FREDFetcher("invalid_key")
-        result = fetcher.fetch_series("GDP")
+        result = fred_fetcher.fetch_series("GDP")
 
         # Should handle error gracefully
         assert "success" in result or "error" in result
 
-    def test_trading_economics_invalid_key(self):
+    def test_trading_economics_invalid_key(self, te_fetcher):
         """Test Trading Economics with invalid key."""
-        fetcher = TradingEconomicsFetcher("invalid:key")
-        result = fetcher.fetch_indicators("united states")
+        result = te_fetcher.fetch_indicators("united states")
 
         # Should handle error gracefully
         assert "success" in result or "error" in result
@@ -188,10 +301,8 @@ class TestAPIErrorHandling:
 class TestAPIResponseParsing:
     """Test parsing of API responses."""
 
-    def test_fred_response_structure(self):
+    def test_fred_response_structure(self, fred_fetcher, monkeypatch):
         """Test FRED response is properly structured."""
-        fetcher = FREDFetcher("test_key")
-
         mock_data = {
             "observations": [
                 {"date": "2024-01-01", "value": "100.5"},
@@ -199,26 +310,56 @@ class TestAPIResponseParsing:
             ]
         }
 
-        with patch.object(fetcher, '_make_request', return_value=mock_data):
-            result = fetcher.fetch_series("TEST")
+        monkeypatch.setattr(fred_fetcher, "_make_request", lambda *args, **kwargs: mock_data)
+        result = fred_fetcher.fetch_series("TEST")
 
-            assert result["success"] is True
-            assert "data" in result
-            assert "source" in result
+        assert result["success"] is True
+        assert "data" in result
+        assert "source" in result
 
-    def test_trading_economics_response_structure(self):
+    def test_trading_economics_response_structure(self, te_fetcher, monkeypatch):
         """Test Trading Economics response is properly structured."""
-        fetcher = TradingEconomicsFetcher("test:key")
-
         mock_data = [
             {"Country": "United States", "Category": "GDP", "Value": 25000}
         ]
 
-        with patch.object(fetcher, '_make_request', return_value=mock_data):
-            result = fetcher.fetch_indicators("united states")
+        monkeypatch.setattr(te_fetcher, "_make_request", lambda *args, **kwargs: mock_data)
+        result = te_fetcher.fetch_indicators("united states")
 
-            assert result["success"] is True
-            assert "data" in result
+        assert result["success"] is True
+        assert "data" in result
+
+    @pytest.mark.parametrize(
+        "payload, expected",
+        [
+            ([{"symbol": "AAPL"}], {"symbol": "AAPL"}),
+            ({"Error Message": "Invalid API KEY."}, {"Error Message": "Invalid API KEY."}),
+            ([], [])
+        ],
+        ids=["record", "error", "empty"]
+    )
+    def test_fmp_profile_shapes(self, monkeypatch, payload, expected):
+        """Test FMP profile unwraps single-record lists and passes other payloads through."""
+        fetcher = FMPFetcher("test_key")
+        monkeypatch.setattr(fetcher, "_make_request", lambda *args, **kwargs: payload)
+        result = fetcher.fetch_company_profile("AAPL")
+
+        assert result["success"] is True
+        assert result["data"] == expected
+
+
+@pytest.mark.parametrize(
+    "factory, credential_attr",
+    [
+        (lambda: FREDFetcher("k"), "api_key"),
+        (lambda: TradingEconomicsFetcher("a:b"), "key"),
+        (lambda: RedditFetcher("i", "s", "u"), "client_id")
+    ],
+    ids=["fred", "te", "reddit"]
+)
+def test_fetcher_smoke(factory, credential_attr):
+    """Test each external API fetcher initializes with its credentials."""
+    assert getattr(factory(), credential_attr)
 
 
 if __name__ == "__main__":
@@ -2,62 +2,93 @@
 Tests for Data Fetchers and Document Processors.
 """
 
+import os
+import zipfile
+import numpy as np
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
 
+from app.core.utils.caching import get_cache_manager
 from app.data.fetchers.base_fetcher import BaseFetcher
+from app.data.fetchers.polygon_fetcher import PolygonFetcher
+from app.data.fetchers.fmp_fetcher import FMPFetcher
+from app.data.fetchers.fred_fetcher import FREDFetcher
 from app.data.processors.pdf_processor import PDFProcessor
 from app.data.processors.docx_processor import DOCXProcessor
 from app.data.processors.xlsx_processor import XLSXProcessor
 from app.data.processors.document_processor import DocumentProcessor
 
+POLYGON_KEY = os.getenv("POLYGON_API_KEY")
+FMP_KEY = os.getenv("FMP_API_KEY")
+FRED_KEY = os.getenv("FRED_API_KEY")
+
+
+class _NullFetcher(BaseFetcher):
+    """Minimal concrete fetcher for exercising BaseFetcher helpers."""
+    
+    def _validate_credentials(self):
+        pass
+    
+    def fetch(self, **kwargs):
+        raise NotImplementedError
+
 
 class TestBaseFetcher:
     """Tests for BaseFetcher class."""
     
-    def test_success_response(self):
+    @pytest.fixture(scope="class")
+    def fetcher(self):
+        """Shared concrete fetcher instance."""
+        return _NullFetcher()
+    
+    def test_success_response(self, fetcher):
         """Test creating a success response."""
-        
-        class TestFetcher(BaseFetcher):
-            def _validate_credentials(self):
-                pass
-            
-            def fetch(self, **kwargs):
-                return self._success_response(
-                    data={"test": "data"},
-                    source="TestSource"
-                )
-        
-        fetcher = TestFetcher()
-        response = fetcher.fetch()
+        response = fetcher._success_response(
+            data={"test": "data"},
+            source="TestSource"
+        )
         
         assert response["success"] is True
         assert response["data"] == {"test": "data"}
         assert response["source"] == "TestSource"
         assert "timestamp" in response
     
-    def test_error_response(self):
+    def test_error_response(self, fetcher):
         """Test creating an error response."""
-        
-        class TestFetcher(BaseFetcher):
-            def _validate_credentials(self):
-                pass
-            
-            def fetch(self, **kwargs):
-                return self._handle_error(
-                    error=ValueError("Test error"),
-                    source="TestSource"
-                )
-        
-        fetcher = TestFetcher()
-        response = fetcher.fetch()
+        response = fetcher._handle_error(
+            error=ValueError("Test error"),
+            source="TestSource"
+        )
         
         assert response["success"] is False
         assert "Test error" in response["error"]
         assert response["source"] == "TestSource"
 
 
+def _write_text_pdf(path: Path, num_pages: int) -> None:
+    """Write a PDF whose page N contains the text 'Text N'."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica")
+    }))
+    
+    for page_num in range(1, num_pages + 1):
+        page = writer.add_blank_page(200, 200)
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 20 100 Td (Text {page_num}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+    
+    writer.write(str(path))
+
+
 class TestDocumentProcessors:
     """Tests for document processors."""
     
@@ -65,22 +96,28 @@ class TestDocumentProcessors:
         """Test PDF processor file validation."""
         processor = PDFProcessor()
         
-        with pytest.raises(FileNotFoundError):
-            processor.process("nonexistent.pdf")
+        result = processor.process("nonexistent.pdf")
+        
+        assert result["success"] is False
+        assert "File not found" in result["error"]
     
     def test_docx_processor_validation(self):
         """Test DOCX processor file validation."""
         processor = DOCXProcessor()
         
-        with pytest.raises(FileNotFoundError):
-            processor.process("nonexistent.docx")
+        result = processor.process("nonexistent.docx")
+        
+        assert result["success"] is False
+        assert "File not found" in result["error"]
     
     def test_xlsx_processor_validation(self):
         """Test XLSX processor file validation."""
         processor = XLSXProcessor()
         
-        with pytest.raises(FileNotFoundError):
-            processor.process("nonexistent.xlsx")
+        result = processor.process("nonexistent.xlsx")
+        
+        assert result["success"] is False
+        assert "File not found" in result["error"]
     
     def test_document_processor_supported_formats(self):
         """Test DocumentProcessor supported formats."""
@@ -101,26 +138,141 @@ class TestDocumentProcessors:
         assert processor.is_supported("test.xlsx") is True
         assert processor.is_supported("test.txt") is False
         assert processor.is_supported("test.jpg") is False
+    
+    def test_pdf_parallel_extraction_keeps_page_order(self, tmp_path):
+        """Test large PDFs extracted across processes keep page order."""
+        pdf_path = tmp_path / "report.pdf"
+        num_pages = PDFProcessor.PARALLEL_MIN_PAGES + 4
+        _write_text_pdf(pdf_path, num_pages)
+        
+        result = PDFProcessor().process(str(pdf_path))
+        
+        assert result["success"] is True
+        pages = result["content"].split("\n\n")
+        assert pages[0] == "--- Page 1 ---\nText 1"
+        assert pages[-1] == f"--- Page {num_pages} ---\nText {num_pages}"
+    
+    def test_xlsx_processor_extracts_rows(self, tmp_path):
+        """Test XLSX rows are extracted as text with empty rows skipped."""
+        from openpyxl import Workbook
+        
+        xlsx_path = tmp_path / "model.xlsx"
+        wb = Workbook()
+        wb.active.title = "Revenue"
+        wb.active.append(["Year", "Revenue"])
+        wb.active.append([None, None])
+        wb.active.append([2024, 1250.5])
+        wb.save(str(xlsx_path))
+        
+        result = XLSXProcessor().process(str(xlsx_path))
+        
+        assert result["success"] is True
+        assert result["metadata"]["total_rows"] == 2
+        assert "Year | Revenue\n2024 | 1250.5" in result["content"]
+    
+    def test_document_processor_batch(self, tmp_path):
+        """Test batch processing returns one result per file."""
+        pdf_path = tmp_path / "report.pdf"
+        _write_text_pdf(pdf_path, 2)
+        missing_path = tmp_path / "missing.docx"
+        
+        processor = DocumentProcessor()
+        results = processor.process_batch([str(pdf_path), str(missing_path)])
+        
+        by_path = {result["file_path"]: result for result in results}
+        assert by_path[str(pdf_path)]["success"] is True
+        assert by_path[str(missing_path)]["success"] is False
+    
+    def test_processors_leave_deflated_zip_writes_working(self, tmp_path):
+        """Test importing the processors does not break zipfile compression."""
+        archive = tmp_path / "out.zip"
+        for level in (6, 9):
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+                zf.writestr("word/document.xml", "<w:document/>" * 1000)
+            
+            with zipfile.ZipFile(archive) as zf:
+                assert zf.read("word/document.xml") == b"<w:document/>" * 1000
+    
+    def test_pdf_processor_sequential_mode(self, tmp_path, monkeypatch):
+        """Test a processor with parallel=False never uses the page pool."""
+        from app.data.processors import pdf_processor
+        
+        pdf_path = tmp_path / "report.pdf"
+        _write_text_pdf(pdf_path, PDFProcessor.PARALLEL_MIN_PAGES)
+        
+        pool_requests = []
+        monkeypatch.setattr(
+            pdf_processor, "_get_page_executor", lambda: pool_requests.append(1)
+        )
+        result = PDFProcessor(parallel=False).process(str(pdf_path))
+        
+        assert result["success"] is True
+        assert pool_requests == []
+        assert result["content"].count("--- Page ") == PDFProcessor.PARALLEL_MIN_PAGES
+
+
+class TestPolygonFetcher:
+    """Tests for PolygonFetcher with a stubbed client."""
+    
+    def test_aggregates_columns_skip_incomplete_bars(self):
+        """Test bars missing a timestamp or close are dropped from the columns."""
+        def bar(timestamp, close, vwap=None):
+            return SimpleNamespace(
+                timestamp=timestamp, open=1.0, high=2.0, low=0.5, close=close,
+                volume=100.0, vwap=vwap, transactions=10
+            )
+        
+        fetcher = PolygonFetcher("test_key")
+        fetcher.client = SimpleNamespace(get_aggs=lambda **kwargs: [
+            bar(1, 1.5, vwap=1.2), bar(None, 1.6), bar(3, None), bar(4, 1.8)
+        ])
+        
+        result = fetcher.fetch_aggregates_columns("AAPL", from_date="2024-01-01", to_date="2024-01-05")
+        
+        assert result["success"] is True
+        columns = result["data"]["columns"]
+        assert result["data"]["count"] == 2
+        assert columns["timestamp"].tolist() == [1, 4]
+        assert columns["close"].tolist() == [1.5, 1.8]
+        assert columns["vwap"][0] == 1.2 and np.isnan(columns["vwap"][1])
+    
+    def test_ticker_details_refetches_market_fields_after_short_ttl(self):
+        """Test market cap is refreshed while static issuer fields stay cached."""
+        calls = []
+        
+        def get_ticker_details(ticker):
+            calls.append(ticker)
+            return SimpleNamespace(ticker=ticker, name="Details Corp", market_cap=100.0 * len(calls))
+        
+        cache = get_cache_manager().get_cache("api")
+        cache.delete("polygon_details:DTLS")
+        cache.delete("polygon_details_market:DTLS")
+        fetcher = PolygonFetcher("test_key")
+        fetcher.client = SimpleNamespace(get_ticker_details=get_ticker_details)
+        
+        first = fetcher.fetch_ticker_details("DTLS")
+        second = fetcher.fetch_ticker_details("DTLS")
+        assert len(calls) == 1
+        assert second["data"] == first["data"]
+        
+        # Simulate the short-lived market entry expiring
+        cache.delete("polygon_details_market:DTLS")
+        third = fetcher.fetch_ticker_details("DTLS")
+        
+        assert len(calls) == 2
+        assert third["data"]["market_cap"] == 200.0
+        assert third["data"]["name"] == "Details Corp"
+        assert cache.get("polygon_details:DTLS").get("market_cap") is None
 
 
 class TestDataFetchersIntegration:
     """Integration tests for data fetchers (requires API keys)."""
     
     @pytest.mark.integration
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-integration"),
-        reason="Integration tests require --run-integration flag"
-    )
+    @pytest.mark.skipif(not POLYGON_KEY, reason="POLYGON_API_KEY not set")
     def test_polygon_fetcher(self):
         """Test Polygon fetcher with real API."""
-        import os
-        from app.data.fetchers.polygon_fetcher import PolygonFetcher
-        
-        api_key = os.getenv("POLYGON_API_KEY")
-        if not api_key:
-            pytest.skip("POLYGON_API_KEY not set")
-        
-        fetcher = PolygonFetcher(api_key)
+        fetcher = PolygonFetcher(POLYGON_KEY)
         result = fetcher.fetch_quote("AAPL")
         
         assert result["success"] is True
@@ -128,55 +280,25 @@ class TestDataFetchersIntegration:
         assert result["data"]["ticker"] == "AAPL"
     
     @pytest.mark.integration
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-integration"),
-        reason="Integration tests require --run-integration flag"
-    )
+    @pytest.mark.skipif(not FMP_KEY, reason="FMP_API_KEY not set")
     def test_fmp_fetcher(self):
         """Test FMP fetcher with real API."""
-        import os
-        from app.data.fetchers.fmp_fetcher import FMPFetcher
-        
-        api_key = os.getenv("FMP_API_KEY")
-        if not api_key:
-            pytest.skip("FMP_API_KEY not set")
-        
-        fetcher = FMPFetcher(api_key)
+        fetcher = FMPFetcher(FMP_KEY)
         result = fetcher.fetch_company_profile("AAPL")
         
         assert result["success"] is True
         assert "data" in result
     
     @pytest.mark.integration
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-integration"),
-        reason="Integration tests require --run-integration flag"
-    )
+    @pytest.mark.skipif(not FRED_KEY, reason="FRED_API_KEY not set")
     def test_fred_fetcher(self):
         """Test FRED fetcher with real API."""
-        import os
-        from app.data.fetchers.fred_fetcher import FREDFetcher
-        
-        api_key = os.getenv("FRED_API_KEY")
-        if not api_key:
-            pytest.skip("FRED_API_KEY not set")
-        
-        fetcher = FREDFetcher(api_key)
+        fetcher = FREDFetcher(FRED_KEY)
         result = fetcher.fetch_indicator("gdp")
         
         assert result["success"] is True
         assert "data" in result
 
 
-def pytest_addoption(parser):
-    """Add custom pytest options."""
-    parser.addoption(
-        "--run-integration",
-        action="store_true",
-        default=False,
-        help="Run integration tests that require API keys"
-    )
-
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,182 +1,280 @@
 """
 Live Integration Tests for External APIs.
-These tests call real APIs with actual credentials.
 
-Run with: pytest tests/test_live_apis.py -v --run-live
+Responses are replayed from VCR cassettes under tests/cassettes/test_live_apis,
+so the suite runs offline once they are recorded. None are committed yet, so
+the module skips until someone records them against the real APIs with actual
+credentials (and reviews them for leaked secrets before committing):
+
+    RUN_LIVE_TESTS=1 pytest tests/test_live_apis.py -v
+
+Each API's tests share an xdist group, so live runs can overlap the round
+trips of different providers while each one stays on a single worker (and
+under its rate limit):
+
+    RUN_LIVE_TESTS=1 pytest tests/test_live_apis.py -n 6 --dist=loadgroup
 """
 
 import pytest
 import os
 import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-
-# Skip all tests if not running live tests
-pytestmark = pytest.mark.skipif(
-    not os.getenv("RUN_LIVE_TESTS"),
-    reason="Live API tests disabled. Set RUN_LIVE_TESTS=1 to run."
-)
-
-
+from functools import partial
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.tools.tool_definitions import ToolExecutor
+from app.data.fetchers.polygon_fetcher import PolygonFetcher
+from app.data.fetchers.fmp_fetcher import FMPFetcher
+from app.data.fetchers.fred_fetcher import FREDFetcher
+from app.data.fetchers.trading_economics_fetcher import TradingEconomicsFetcher
+from app.data.fetchers.reddit_fetcher import RedditFetcher
+
+log = logging.getLogger(__name__)
+
+CASSETTE_DIR = Path(__file__).parent / "cassettes" / "test_live_apis"
+RECORDING = bool(os.getenv("RUN_LIVE_TESTS"))
+
+# Replay from cassettes by default; hit the network only when recording
+pytestmark = [
+    pytest.mark.vcr,
+    pytest.mark.skipif(
+        not RECORDING and not CASSETTE_DIR.is_dir(),
+        reason="No recorded cassettes. Set RUN_LIVE_TESTS=1 to record them."
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def vcr_config():
+    """Never touch the network on replay and keep credentials out of cassettes."""
+    return {
+        "record_mode": "new_episodes" if RECORDING else "none",
+        "filter_headers": ["Authorization"],
+        "filter_query_parameters": ["apikey", "api_key", "c", "s"],
+    }
+
+
+@pytest.fixture(scope="module")
+def vcr_cassette_dir():
+    """Store cassettes under tests/cassettes/test_live_apis."""
+    return str(CASSETTE_DIR)
+
+
+def _fetch_concurrently(vcr, cassette: str, calls):
+    """
+    Issue independent fetches in parallel under one cassette.
+    
+    Args:
+        vcr: pytest-vcr VCR instance
+        cassette: Cassette file name
+        calls: Mapping of result name to zero-argument fetch callable
+        
+    Returns:
+        Mapping of result name to fetch result
+    """
+    with vcr.use_cassette(cassette), ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = {name: pool.submit(call) for name, call in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def _credential(name: str, placeholder: str = "replay") -> str:
+    """Return the real credential when recording, a placeholder on replay."""
+    value = os.getenv(name)
+    if not value and RECORDING:
+        pytest.skip(f"{name} not set")
+    return value or placeholder
+
+
+@pytest.mark.xdist_group(name="polygon")
 class TestPolygonLive:
     """Live tests for Polygon.io API."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def fetcher(self):
-        from app.data.fetchers.polygon_fetcher import PolygonFetcher
-        api_key = os.getenv("POLYGON_API_KEY")
-        if not api_key:
-            pytest.skip("POLYGON_API_KEY not set")
-        return PolygonFetcher(api_key)
+        return PolygonFetcher(_credential("POLYGON_API_KEY"))
+
+    @pytest.fixture(scope="class")
+    def results(self, fetcher, vcr):
+        """Fetch everything this class checks in one concurrent batch."""
+        return _fetch_concurrently(vcr, "TestPolygonLive.yaml", {
+            "details": partial(fetcher.fetch_ticker_details, "AAPL"),
+            "aggregates": partial(fetcher.fetch_aggregates, "MSFT", timespan="day", limit=5),
+            "last_trade": partial(fetcher.fetch_last_trade, "GOOGL")
+        })
 
-    def test_fetch_ticker_details_aapl(self, fetcher):
+    def test_fetch_ticker_details_aapl(self, results):
         """Test fetching Apple ticker details."""
-        result = fetcher.fetch_ticker_details("AAPL")
+        result = results["details"]
 
         assert result["success"] is True
         assert result["data"]["ticker"] == "AAPL"
         assert result["data"]["name"] is not None
         assert "Apple" in result["data"]["name"]
-        print(f"\n✅ AAPL Details: {result['data']['name']}")
-        print(f"   Market Cap: ${result['data'].get('market_cap', 'N/A'):,}")
+        log.debug(
+            "AAPL Details: %s (market cap %s)",
+            result["data"]["name"], result["data"].get("market_cap", "N/A")
+        )
 
-    def test_fetch_aggregates_msft(self, fetcher):
+    def test_fetch_aggregates_msft(self, results):
         """Test fetching Microsoft price aggregates."""
-        result = fetcher.fetch_aggregates("MSFT", timespan="day", limit=5)
+        result = results["aggregates"]
 
         assert result["success"] is True
         assert result["data"]["ticker"] == "MSFT"
         assert len(result["data"]["bars"]) > 0
 
         latest_bar = result["data"]["bars"][-1]
-        print(f"\n✅ MSFT Latest Bar:")
-        print(f"   Close: ${latest_bar['close']}")
-        print(f"   Volume: {latest_bar['volume']:,}")
+        log.debug("MSFT Latest Bar: close=%s volume=%s", latest_bar["close"], latest_bar["volume"])
 
-    def test_fetch_last_trade_googl(self, fetcher):
+    def test_fetch_last_trade_googl(self, results):
         """Test fetching Google last trade."""
-        result = fetcher.fetch_last_trade("GOOGL")
+        result = results["last_trade"]
 
         # May fail outside market hours
         if result["success"]:
             assert result["data"]["ticker"] == "GOOGL"
-            print(f"\n✅ GOOGL Last Trade: ${result['data']['price']}")
+            log.debug("GOOGL Last Trade: %s", result["data"]["price"])
         else:
-            print(f"\n⚠️ GOOGL Trade (may be outside market hours): {result.get('error')}")
+            log.debug("GOOGL Trade (may be outside market hours): %s", result.get("error"))
 
 
+@pytest.mark.xdist_group(name="fmp")
 class TestFMPLive:
     """Live tests for Financial Modeling Prep API."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def fetcher(self):
-        from app.data.fetchers.fmp_fetcher import FMPFetcher
-        api_key = os.getenv("FMP_API_KEY")
-        if not api_key:
-            pytest.skip("FMP_API_KEY not set")
-        return FMPFetcher(api_key)
+        return FMPFetcher(_credential("FMP_API_KEY"))
+
+    @pytest.fixture(scope="class")
+    def results(self, fetcher, vcr):
+        """Fetch everything this class checks in one concurrent batch."""
+        return _fetch_concurrently(vcr, "TestFMPLive.yaml", {
+            "profile": partial(fetcher.fetch_company_profile, "AAPL"),
+            "income": partial(fetcher.fetch_income_statement, "MSFT", limit=1),
+            "metrics": partial(fetcher.fetch_key_metrics, "NVDA", limit=1),
+            "dcf": partial(fetcher.fetch_dcf, "TSLA")
+        })
 
-    def test_fetch_company_profile_aapl(self, fetcher):
+    def test_fetch_company_profile_aapl(self, results):
         """Test fetching Apple company profile."""
-        result = fetcher.fetch_company_profile("AAPL")
+        result = results["profile"]
 
         assert result["success"] is True
         assert "companyName" in result["data"] or "symbol" in result["data"]
-        print(f"\n✅ AAPL Profile: {result['data'].get('companyName', 'Apple Inc.')}")
-        print(f"   Industry: {result['data'].get('industry', 'N/A')}")
-        print(f"   CEO: {result['data'].get('ceo', 'N/A')}")
-
-    def test_fetch_income_statement_msft(self, fetcher):
+        log.debug(
+            "AAPL Profile: %s, industry=%s, CEO=%s",
+            result["data"].get("companyName", "Apple Inc."),
+            result["data"].get("industry", "N/A"),
+            result["data"].get("ceo", "N/A")
+        )
+
+    def test_fetch_income_statement_msft(self, results):
         """Test fetching Microsoft income statement."""
-        result = fetcher.fetch_income_statement("MSFT", limit=1)
+        result = results["income"]
 
         assert result["success"] is True
         assert isinstance(result["data"], list)
 
         if len(result["data"]) > 0:
             latest = result["data"][0]
-            print(f"\n✅ MSFT Income Statement:")
-            print(f"   Revenue: ${latest.get('revenue', 0):,.0f}")
-            print(f"   Net Income: ${latest.get('netIncome', 0):,.0f}")
+            log.debug(
+                "MSFT Income Statement: revenue=%.0f net income=%.0f",
+                latest.get("revenue", 0), latest.get("netIncome", 0)
+            )
 
-    def test_fetch_key_metrics_nvda(self, fetcher):
+    def test_fetch_key_metrics_nvda(self, results):
         """Test fetching NVIDIA key metrics."""
-        result = fetcher.fetch_key_metrics("NVDA", limit=1)
+        result = results["metrics"]
 
         assert result["success"] is True
 
         if len(result["data"]) > 0:
             metrics = result["data"][0]
-            print(f"\n✅ NVDA Key Metrics:")
-            print(f"   PE Ratio: {metrics.get('peRatio', 'N/A')}")
-            print(f"   ROE: {metrics.get('roe', 'N/A')}")
+            log.debug(
+                "NVDA Key Metrics: PE=%s ROE=%s",
+                metrics.get("peRatio", "N/A"), metrics.get("roe", "N/A")
+            )
 
-    def test_fetch_dcf_tsla(self, fetcher):
+    def test_fetch_dcf_tsla(self, results):
         """Test fetching Tesla DCF valuation."""
-        result = fetcher.fetch_dcf("TSLA")
+        result = results["dcf"]
 
         assert result["success"] is True
 
         if isinstance(result["data"], list) and len(result["data"]) > 0:
             dcf = result["data"][0]
-            print(f"\n✅ TSLA DCF Valuation:")
-            print(f"   DCF: ${dcf.get('dcf', 'N/A')}")
-            print(f"   Stock Price: ${dcf.get('Stock Price', 'N/A')}")
+            log.debug(
+                "TSLA DCF Valuation: DCF=%s price=%s",
+                dcf.get("dcf", "N/A"), dcf.get("Stock Price", "N/A")
+            )
 
 
+@pytest.mark.xdist_group(name="fred")
 class TestFREDLive:
     """Live tests for FRED API."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def fetcher(self):
-        from app.data.fetchers.fred_fetcher import FREDFetcher
-        api_key = os.getenv("FRED_API_KEY")
-        if not api_key:
-            pytest.skip("FRED_API_KEY not set")
-        return FREDFetcher(api_key)
+        return FREDFetcher(_credential("FRED_API_KEY"))
+
+    @pytest.fixture(scope="class")
+    def results(self, fetcher, vcr):
+        """Fetch everything this class checks in one concurrent batch."""
+        return _fetch_concurrently(vcr, "TestFREDLive.yaml", {
+            "gdp": partial(fetcher.fetch_series, "GDP"),
+            "unemployment": partial(fetcher.fetch_indicator, "unemployment"),
+            "inflation": partial(fetcher.fetch_series, "CPIAUCSL"),
+            "fed_funds": partial(fetcher.fetch_series, "DFF")
+        })
 
-    def test_fetch_gdp(self, fetcher):
+    def test_fetch_gdp(self, results):
         """Test fetching GDP data."""
-        result = fetcher.fetch_series("GDP")
+        result = results["gdp"]
 
         assert result["success"] is True
         assert result["data"]["series_id"] == "GDP"
         assert result["data"]["latest_value"] is not None
 
-        print(f"\n✅ US GDP: ${result['data']['latest_value']:,.0f}B")
-        print(f"   Date: {result['data']['latest_date']}")
+        log.debug(
+            "US GDP: %.0fB (%s)",
+            result["data"]["latest_value"], result["data"]["latest_date"]
+        )
 
-    def test_fetch_unemployment(self, fetcher):
+    def test_fetch_unemployment(self, results):
         """Test fetching unemployment rate."""
-        result = fetcher.fetch_indicator("unemployment")
+        result = results["unemployment"]
 
         assert result["success"] is True
-        print(f"\n✅ Unemployment Rate: {result['data']['latest_value']}%")
+        log.debug("Unemployment Rate: %s%%", result["data"]["latest_value"])
 
-    def test_fetch_inflation(self, fetcher):
+    def test_fetch_inflation(self, results):
         """Test fetching CPI inflation."""
-        result = fetcher.fetch_series("CPIAUCSL")
+        result = results["inflation"]
 
         assert result["success"] is True
-        print(f"\n✅ CPI: {result['data']['latest_value']}")
+        log.debug("CPI: %s", result["data"]["latest_value"])
 
-    def test_fetch_fed_funds_rate(self, fetcher):
+    def test_fetch_fed_funds_rate(self, results):
         """Test fetching Fed Funds Rate."""
-        result = fetcher.fetch_series("DFF")
+        result = results["fed_funds"]
 
         assert result["success"] is True
-        print(f"\n✅ Fed Funds Rate: {result['data']['latest_value']}%")
+        log.debug("Fed Funds Rate: %s%%", result["data"]["latest_value"])
 
 
+@pytest.mark.xdist_group(name="trading_economics")
 class TestTradingEconomicsLive:
     """Live tests for Trading Economics API."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def fetcher(self):
-        from app.data.fetchers.trading_economics_fetcher import TradingEconomicsFetcher
-        api_key = os.getenv("TRADING_ECONOMICS_API_KEY")
-        if not api_key:
-            pytest.skip("TRADING_ECONOMICS_API_KEY not set")
-        return TradingEconomicsFetcher(api_key)
+        return TradingEconomicsFetcher(
+            _credential("TRADING_ECONOMICS_API_KEY", "replay:replay")
+        )
 
     def test_fetch_us_indicators(self, fetcher):
         """Test fetching US economic indicators."""
@@ -184,65 +282,74 @@ class TestTradingEconomicsLive:
 
         if result["success"]:
             assert isinstance(result["data"], list)
-            print(f"\n✅ US Indicators: {len(result['data'])} found")
+            log.debug("US Indicators: %d found", len(result["data"]))
             if len(result["data"]) > 0:
                 sample = result["data"][0]
-                print(f"   Sample: {sample.get('Category', 'N/A')}: {sample.get('LatestValue', 'N/A')}")
+                log.debug(
+                    "Sample: %s: %s",
+                    sample.get("Category", "N/A"), sample.get("LatestValue", "N/A")
+                )
         else:
-            print(f"\n⚠️ Trading Economics: {result.get('error', 'Unknown error')}")
+            log.debug("Trading Economics: %s", result.get("error", "Unknown error"))
 
 
+@pytest.mark.xdist_group(name="reddit")
 class TestRedditLive:
     """Live tests for Reddit API."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def fetcher(self):
-        from app.data.fetchers.reddit_fetcher import RedditFetcher
-        client_id = os.getenv("REDDIT_CLIENT_ID")
-        client_secret = os.getenv("REDDIT_CLIENT_SECRET")
-        if not client_id or not client_secret:
-            pytest.skip("Reddit credentials not set")
-        return RedditFetcher(client_id, client_secret, "FynRAG/1.0 test")
+        return RedditFetcher(
+            _credential("REDDIT_CLIENT_ID"),
+            _credential("REDDIT_CLIENT_SECRET"),
+            "FynRAG/1.0 test"
+        )
 
     def test_fetch_wsb_hot_posts(self, fetcher):
         """Test fetching hot posts from r/wallstreetbets."""
-        result = fetcher.fetch_subreddit_posts("wallstreetbets", limit=5, sort="hot")
+        result = fetcher.fetch_subreddit_posts(
+            "wallstreetbets", limit=5, sort="hot", fields=["title", "score"]
+        )
 
         assert result["success"] is True
         assert result["data"]["subreddit"] == "wallstreetbets"
         assert len(result["data"]["posts"]) > 0
 
-        print(f"\n✅ WSB Hot Posts: {len(result['data']['posts'])} fetched")
+        log.debug("WSB Hot Posts: %d fetched", len(result["data"]["posts"]))
         for post in result["data"]["posts"][:3]:
-            print(f"   - {post['title'][:60]}... (Score: {post['score']})")
+            log.debug("  - %.60s... (score %s)", post["title"], post["score"])
 
     def test_fetch_ticker_mentions_nvda(self, fetcher):
         """Test fetching NVDA mentions."""
         result = fetcher.fetch_ticker_mentions("NVDA", limit=10)
 
         if result["success"]:
-            print(f"\n✅ NVDA Mentions: {result['data']['count']} found")
+            log.debug("NVDA Mentions: %s found", result["data"]["count"])
         else:
-            print(f"\n⚠️ NVDA Mentions: {result.get('error', 'None found')}")
+            log.debug("NVDA Mentions: %s", result.get("error", "None found"))
 
 
+@pytest.mark.xdist_group(name="tool_executor")
 class TestToolExecutorLive:
     """Live tests for ToolExecutor with real APIs."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def executor(self):
-        from app.core.tools.tool_definitions import ToolExecutor
-        return ToolExecutor()
+        with pytest.MonkeyPatch.context() as mp:
+            if not RECORDING:
+                # Tools refuse to run without keys; cassettes answer the requests
+                for name in ("POLYGON_API_KEY", "FMP_API_KEY", "FRED_API_KEY"):
+                    if not getattr(settings, name):
+                        mp.setattr(settings, name, "replay")
+            yield ToolExecutor()
 
-    @pytest.mark.asyncio
     async def test_get_stock_price_live(self, executor):
         """Test stock price tool with real data."""
         result = await executor.execute("get_stock_price", {"ticker": "AAPL"})
 
         assert result["success"] is True
-        print(f"\n✅ Tool get_stock_price: {result['result']}")
+        log.debug("Tool get_stock_price: %s", result["result"])
 
-    @pytest.mark.asyncio
     async def test_get_fundamental_data_live(self, executor):
         """Test fundamental data tool with real data."""
         result = await executor.execute("get_fundamental_data", {
@@ -251,9 +358,8 @@ class TestToolExecutorLive:
         })
 
         assert result["success"] is True
-        print(f"\n✅ Tool get_fundamental_data executed")
+        log.debug("Tool get_fundamental_data executed")
 
-    @pytest.mark.asyncio
     async def test_get_economic_indicators_live(self, executor):
         """Test economic indicators tool."""
         result = await executor.execute("get_economic_indicators", {
@@ -261,10 +367,10 @@ class TestToolExecutorLive:
         })
 
         assert result["success"] is True
-        print(f"\n✅ Tool get_economic_indicators: {len(result['result'])} indicators")
+        log.debug("Tool get_economic_indicators: %d indicators", len(result["result"]))
 
 
 if __name__ == "__main__":
     # Run with live tests enabled
     os.environ["RUN_LIVE_TESTS"] = "1"
-    pytest.main([__file__, "-v", "-s"])
+    pytest.main([__file__, "-v", "--log-cli-level=DEBUG"])
@@ -3,70 +3,85 @@ Tests for orchestration and debate simulation.
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
-from datetime import datetime
+import itertools
+from dataclasses import replace
+from datetime import datetime, timedelta
+from types import MappingProxyType
 
 from app.core.orchestrator.orchestrator_agent import OrchestratorAgent
 from app.core.reasoning.debate_simulator import DebateSimulator
-from app.core.reasoning.agent_memory import AgentMemory, MemoryEntry, MemoryType
+from app.core.reasoning.agent_memory import AgentMemory, MemoryEntry
 from app.core.agents.base_agent import AgentRole, AgentResponse
 
+_VALID_RECS = frozenset({"BUY", "HOLD", "SELL"})
 
-@pytest.fixture
+_CANNED_RESPONSE = AgentResponse(
+    agent_role=AgentRole.VALUE_INVESTING,
+    analysis="Test analysis",
+    recommendation="BUY",
+    confidence=0.8,
+    supporting_data={},
+    frameworks_used=[],
+    concerns=[],
+    opportunities=[]
+)
+
+
+@pytest.fixture(scope="session")
 def sample_agent_responses():
-    """Sample responses from agents for testing."""
-    return {
+    """Sample responses from agents for testing (read-only, shared by the session)."""
+    return MappingProxyType({
         AgentRole.VALUE_INVESTING: AgentResponse(
             agent_role=AgentRole.VALUE_INVESTING,
             analysis="Strong value proposition with 30% margin of safety",
             recommendation="BUY",
             confidence=0.85,
-            supporting_data={"intrinsic_value": 200, "current_price": 140},
-            frameworks_used=["DCF", "Margin of Safety"],
-            concerns=["High valuation multiples"],
-            opportunities=["Undervalued relative to peers"]
+            supporting_data=MappingProxyType({"intrinsic_value": 200, "current_price": 140}),
+            frameworks_used=("DCF", "Margin of Safety"),
+            concerns=("High valuation multiples",),
+            opportunities=("Undervalued relative to peers",)
         ),
         AgentRole.GROWTH_VC: AgentResponse(
             agent_role=AgentRole.GROWTH_VC,
             analysis="Excellent growth metrics with Rule of 40 score of 45",
             recommendation="BUY",
             confidence=0.90,
-            supporting_data={"rule_of_40": 45, "ltv_cac_ratio": 4.5},
-            frameworks_used=["Rule of 40", "Unit Economics"],
-            concerns=["High burn rate"],
-            opportunities=["Large TAM", "Strong unit economics"]
+            supporting_data=MappingProxyType({"rule_of_40": 45, "ltv_cac_ratio": 4.5}),
+            frameworks_used=("Rule of 40", "Unit Economics"),
+            concerns=("High burn rate",),
+            opportunities=("Large TAM", "Strong unit economics")
         ),
         AgentRole.RISK_MANAGEMENT: AgentResponse(
             agent_role=AgentRole.RISK_MANAGEMENT,
             analysis="Moderate risk with acceptable volatility",
             recommendation="HOLD",
             confidence=0.70,
-            supporting_data={"var_95": -15.5, "beta": 1.2},
-            frameworks_used=["VaR", "Beta Analysis"],
-            concerns=["High beta", "Liquidity concerns"],
-            opportunities=["Diversification benefits"]
+            supporting_data=MappingProxyType({"var_95": -15.5, "beta": 1.2}),
+            frameworks_used=("VaR", "Beta Analysis"),
+            concerns=("High beta", "Liquidity concerns"),
+            opportunities=("Diversification benefits",)
         ),
         AgentRole.INDUSTRY_COMPETITIVE: AgentResponse(
             agent_role=AgentRole.INDUSTRY_COMPETITIVE,
             analysis="Strong competitive position in attractive industry",
             recommendation="BUY",
             confidence=0.80,
-            supporting_data={"industry_attractiveness": "high", "position": "leader"},
-            frameworks_used=["Porter's Five Forces", "SWOT"],
-            concerns=["Increasing competition"],
-            opportunities=["Market leadership", "High barriers to entry"]
+            supporting_data=MappingProxyType({"industry_attractiveness": "high", "position": "leader"}),
+            frameworks_used=("Porter's Five Forces", "SWOT"),
+            concerns=("Increasing competition",),
+            opportunities=("Market leadership", "High barriers to entry")
         ),
         AgentRole.FINANCIAL_FORENSICS: AgentResponse(
             agent_role=AgentRole.FINANCIAL_FORENSICS,
             analysis="Clean financials with no red flags detected",
             recommendation="BUY",
             confidence=0.95,
-            supporting_data={"m_score": -1.5, "z_score": 3.5},
-            frameworks_used=["M-Score", "Z-Score"],
-            concerns=[],
-            opportunities=["High quality earnings", "Strong cash flow"]
+            supporting_data=MappingProxyType({"m_score": -1.5, "z_score": 3.5}),
+            frameworks_used=("M-Score", "Z-Score"),
+            concerns=(),
+            opportunities=("High quality earnings", "Strong cash flow")
         )
-    }
+    })
 
 
 class TestOrchestratorAgent:
@@ -79,41 +94,32 @@ class TestOrchestratorAgent:
     
     def test_orchestrator_initialization(self, orchestrator):
         """Test orchestrator is properly initialized."""
-        assert orchestrator.name == "Orchestrator"
-        assert isinstance(orchestrator.available_agents, list)
-        assert len(orchestrator.available_agents) == 5
+        assert orchestrator.role == AgentRole.ORCHESTRATOR
+        assert orchestrator.name == "Investment Committee Orchestrator"
+        assert orchestrator.tasks == []
+        assert len(orchestrator.get_relevant_frameworks()) == 5
     
-    def test_task_decomposition(self, orchestrator):
+    async def test_task_decomposition(self, orchestrator):
         """Test task decomposition."""
         task = "Analyze AAPL for investment"
-        subtasks = orchestrator.decompose_task(task)
+        subtasks = await orchestrator._decompose_task(task, {"sector": "Technology"})
         
-        assert isinstance(subtasks, list)
-        assert len(subtasks) > 0
-        assert all(isinstance(st, dict) for st in subtasks)
+        assert [t.task_id for t in subtasks] == [
+            "value_analysis", "growth_analysis", "risk_analysis", "industry_analysis"
+        ]
+        assert orchestrator.get_task_status()["pending"] == 4
     
-    @pytest.mark.asyncio
     async def test_orchestrate_analysis(self, orchestrator):
-        """Test orchestrate analysis coordinates agents."""
+        """Test the orchestrator synthesizes registered agent responses."""
         task = "Analyze AAPL"
         context = {"ticker": "AAPL", "current_price": 180}
+        orchestrator.register_agent_response(AgentRole.VALUE_INVESTING, _CANNED_RESPONSE)
         
-        with patch.object(orchestrator, '_run_agent_analysis', new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = AgentResponse(
-                agent_role=AgentRole.VALUE_INVESTING,
-                analysis="Test analysis",
-                recommendation="BUY",
-                confidence=0.8,
-                supporting_data={},
-                frameworks_used=[],
-                concerns=[],
-                opportunities=[]
-            )
-            
-            results = await orchestrator.orchestrate_analysis(task, context, [])
-            
-            assert isinstance(results, dict)
-            assert len(results) > 0
+        result = await orchestrator.analyze(task, context)
+        
+        assert result.agent_role == AgentRole.ORCHESTRATOR
+        assert result.recommendation == "BUY"
+        assert result.supporting_data["agent_count"] == 1
 
 
 class TestDebateSimulator:
@@ -127,9 +133,8 @@ class TestDebateSimulator:
     def test_simulator_initialization(self, simulator):
         """Test simulator is properly initialized."""
         assert simulator.max_rounds == 3
-        assert hasattr(simulator, 'debate_history')
+        assert simulator.rounds == []
     
-    @pytest.mark.asyncio
     async def test_run_debate(self, simulator, sample_agent_responses):
         """Test debate simulation runs successfully."""
         context = {"ticker": "AAPL"}
@@ -143,74 +148,63 @@ class TestDebateSimulator:
         assert "debate_rounds" in results
         assert "synthesis" in results
     
-    @pytest.mark.asyncio
-    async def test_consensus_with_agreement(self, simulator):
-        """Test consensus is reached when agents agree."""
-        # All agents agree on BUY
-        responses = {
-            AgentRole.VALUE_INVESTING: AgentResponse(
-                agent_role=AgentRole.VALUE_INVESTING,
-                analysis="Buy recommendation",
-                recommendation="BUY",
-                confidence=0.9,
-                supporting_data={},
-                frameworks_used=[],
-                concerns=[],
-                opportunities=[]
-            ),
-            AgentRole.GROWTH_VC: AgentResponse(
-                agent_role=AgentRole.GROWTH_VC,
-                analysis="Buy recommendation",
-                recommendation="BUY",
-                confidence=0.85,
-                supporting_data={},
-                frameworks_used=[],
-                concerns=[],
-                opportunities=[]
-            )
-        }
+    @pytest.mark.parametrize(
+        "scenario, expected",
+        [("agreement", "BUY"), ("disagreement", None)]
+    )
+    async def test_consensus(self, simulator, sample_agent_responses, scenario, expected):
+        """Test consensus when agents agree and debate when they disagree."""
+        if scenario == "agreement":
+            # All agents agree on BUY
+            responses = {
+                role: replace(response, recommendation="BUY")
+                for role, response in sample_agent_responses.items()
+            }
+        else:
+            # Mix of recommendations
+            responses = sample_agent_responses
         
         results = await simulator.run_debate(responses, {})
         
-        assert results["consensus_reached"] is True
-        assert results["final_recommendation"] == "BUY"
-        assert results["confidence"] > 0.8
-    
-    @pytest.mark.asyncio
-    async def test_consensus_with_disagreement(self, simulator, sample_agent_responses):
-        """Test debate handles disagreement."""
-        # Mix of recommendations
-        results = await simulator.run_debate(sample_agent_responses, {})
-        
-        assert "final_recommendation" in results
-        assert results["final_recommendation"] in ["BUY", "HOLD", "SELL"]
+        assert results["final_recommendation"] in _VALID_RECS
         assert len(results["debate_rounds"]) > 0
+        if expected is not None:
+            assert results["consensus_reached"] is True
+            assert results["final_recommendation"] == expected
+            assert results["confidence"] > 0.8
     
-    def test_calculate_weighted_vote(self, simulator, sample_agent_responses):
+    async def test_calculate_weighted_vote(self, simulator, sample_agent_responses):
         """Test weighted voting calculation."""
-        vote_result = simulator._calculate_weighted_vote(sample_agent_responses)
+        simulator.agent_responses = sample_agent_responses
+        vote_result = await simulator._phase_consensus({})
         
-        assert "recommendation" in vote_result
-        assert "confidence" in vote_result
-        assert "vote_distribution" in vote_result
-        assert vote_result["recommendation"] in ["BUY", "HOLD", "SELL"]
+        assert vote_result["final_recommendation"] == "BUY"
+        assert vote_result["vote_distribution"]["BUY"] == pytest.approx(3.5 / 4.2)
+        assert vote_result["consensus_reached"] is True
     
     def test_identify_conflicts(self, simulator, sample_agent_responses):
         """Test conflict identification."""
-        conflicts = simulator._identify_conflicts(sample_agent_responses)
+        simulator.agent_responses = {
+            **sample_agent_responses,
+            AgentRole.RISK_MANAGEMENT: replace(
+                sample_agent_responses[AgentRole.RISK_MANAGEMENT], recommendation="SELL"
+            )
+        }
+        conflicts = simulator._identify_conflicts()
         
-        assert isinstance(conflicts, list)
-        # Should identify Risk Management's HOLD vs others' BUY
-        assert len(conflicts) > 0
+        # Risk Management's SELL conflicts with each of the four BUYs
+        assert len(conflicts) == 4
+        assert all("SELL" in c["disagreement"] for c in conflicts)
     
-    def test_synthesize_insights(self, simulator, sample_agent_responses):
+    async def test_synthesize_insights(self, simulator, sample_agent_responses):
         """Test insight synthesis."""
-        synthesis = simulator._synthesize_insights(sample_agent_responses)
+        simulator.agent_responses = sample_agent_responses
+        synthesis = await simulator._phase_synthesis()
         
         assert isinstance(synthesis, dict)
         assert "common_opportunities" in synthesis
         assert "common_concerns" in synthesis
-        assert "key_insights" in synthesis
+        assert set(synthesis["recommendation_distribution"]) == {"BUY", "HOLD"}
 
 
 class TestAgentMemory:
@@ -218,173 +212,172 @@ class TestAgentMemory:
     
     @pytest.fixture
     def memory(self):
-        """Create Agent Memory instance."""
-        return AgentMemory(agent_id="test_agent")
+        """Create Agent Memory instance on a deterministic one-second-per-tick clock."""
+        ticks = itertools.count()
+        return AgentMemory(
+            agent_id="test_agent",
+            clock=lambda: datetime(2024, 1, 1) + timedelta(seconds=next(ticks))
+        )
     
     def test_memory_initialization(self, memory):
         """Test memory is properly initialized."""
         assert memory.agent_id == "test_agent"
-        assert len(memory.short_term) == 0
-        assert len(memory.long_term) == 0
+        assert len(memory.short_term_memory) == 0
+        assert len(memory.long_term_memory) == 0
     
     def test_add_short_term_memory(self, memory):
         """Test adding short-term memory."""
-        memory.add_memory(
-            content="Test interaction",
-            memory_type=MemoryType.SHORT_TERM,
-            importance=0.5
-        )
+        memory.add_memory("analysis", {"text": "Test interaction"}, importance=0.5)
         
-        assert len(memory.short_term) == 1
-        assert memory.short_term[0].content == "Test interaction"
+        assert len(memory.short_term_memory) == 1
+        assert memory.short_term_memory[0].content == {"text": "Test interaction"}
+        assert len(memory.long_term_memory) == 0
     
     def test_add_long_term_memory(self, memory):
-        """Test adding long-term memory."""
-        memory.add_memory(
-            content="Important learning",
-            memory_type=MemoryType.LONG_TERM,
+        """Test important memories are also kept in long-term memory."""
+        entry_id = memory.add_memory(
+            "learning",
+            {"text": "Important learning"},
             importance=0.9,
-            metadata={"category": "valuation"}
+            tags=["valuation"]
         )
         
-        assert len(memory.long_term) == 1
-        entry = memory.long_term[0]
-        assert entry.content == "Important learning"
+        assert len(memory.long_term_memory) == 1
+        entry = memory.long_term_memory[entry_id]
+        assert entry.content == {"text": "Important learning"}
         assert entry.importance == 0.9
-        assert entry.metadata["category"] == "valuation"
+        assert entry.tags == ["valuation"]
     
     def test_short_term_capacity_limit(self, memory):
         """Test short-term memory respects capacity limit."""
-        # Add more than capacity
-        for i in range(60):
-            memory.add_memory(
-                content=f"Memory {i}",
-                memory_type=MemoryType.SHORT_TERM
-            )
+        entries = [
+            MemoryEntry(entry_id=f"mem_{i}", entry_type="analysis", content={"text": f"Memory {i}"})
+            for i in range(60)
+        ]
+        memory.short_term_memory.extend(entries)
         
-        # Should not exceed capacity (50)
-        assert len(memory.short_term) <= 50
+        # The bounded deque evicts the oldest entries past capacity (50)
+        assert len(memory.short_term_memory) == memory.short_term_capacity
+        assert memory.short_term_memory[0] is entries[10]
     
-    def test_retrieve_memories(self, memory):
+    def test_retrieve_context(self, memory):
         """Test memory retrieval."""
-        # Add some memories
-        memory.add_memory("Analysis of AAPL", MemoryType.SHORT_TERM)
-        memory.add_memory("DCF valuation method", MemoryType.LONG_TERM, importance=0.8)
-        memory.add_memory("Risk assessment", MemoryType.SHORT_TERM)
+        memory.add_memory("analysis", {"text": "Analysis of AAPL"})
+        memory.add_memory("learning", {"text": "DCF valuation method"}, importance=0.8)
+        memory.add_memory("analysis", {"text": "Risk assessment"})
         
-        # Retrieve all
-        all_memories = memory.retrieve_memories()
-        assert len(all_memories) == 3
+        # Retrieve all, without duplicating entries held in both memories
+        assert len(memory.retrieve_context()) == 3
         
         # Retrieve by type
-        short_term = memory.retrieve_memories(memory_type=MemoryType.SHORT_TERM)
-        assert len(short_term) == 2
-        
-        long_term = memory.retrieve_memories(memory_type=MemoryType.LONG_TERM)
-        assert len(long_term) == 1
+        assert len(memory.retrieve_context(entry_types=["analysis"])) == 2
+        assert len(memory.retrieve_context(entry_types=["learning"])) == 1
     
     def test_search_memories(self, memory):
         """Test memory search."""
-        memory.add_memory("AAPL valuation analysis", MemoryType.SHORT_TERM)
-        memory.add_memory("GOOGL growth metrics", MemoryType.SHORT_TERM)
-        memory.add_memory("AAPL risk assessment", MemoryType.LONG_TERM)
+        memory.add_memory("analysis", {"text": "AAPL valuation analysis"})
+        memory.add_memory("analysis", {"text": "GOOGL growth metrics"})
+        memory.add_memory("learning", {"text": "AAPL risk assessment"}, importance=0.8)
         
-        # Search for AAPL
         results = memory.search_memories("AAPL")
         assert len(results) == 2
-        assert all("AAPL" in r.content for r in results)
+        assert all("AAPL" in r.content["text"] for r in results)
+    
+    def test_search_requires_every_query_word(self, memory):
+        """Test search matches all query words across content and tags."""
+        memory.add_memory("analysis", {"text": "AAPL valuation"}, tags=["dcf"])
+        memory.add_memory("analysis", {"text": "AAPL momentum"})
+        
+        results = memory.search_memories("aapl DCF")
+        
+        assert [r.content["text"] for r in results] == ["AAPL valuation"]
+        assert results[0].access_count == 1
+        assert memory.search_memories("") == []
+    
+    def test_search_index_follows_eviction(self):
+        """Test entries evicted from both memories drop out of the search index."""
+        memory = AgentMemory(agent_id="test_agent", short_term_capacity=2)
+        memory.add_memory("analysis", {"text": "AAPL first"})
+        memory.add_memory("learning", {"text": "AAPL kept"}, importance=0.9)
+        memory.add_memory("analysis", {"text": "MSFT third"})
+        memory.add_memory("analysis", {"text": "MSFT fourth"})
+        
+        # "first" left short-term memory; "kept" survives in long-term memory
+        assert memory.search_memories("first") == []
+        assert [r.content["text"] for r in memory.search_memories("AAPL")] == ["AAPL kept"]
+        
+        memory.clear()
+        assert memory.search_memories("MSFT") == []
     
     def test_consolidate_memories(self, memory):
         """Test memory consolidation."""
-        # Add many short-term memories
         for i in range(10):
-            memory.add_memory(
-                f"Important insight {i}",
-                MemoryType.SHORT_TERM,
-                importance=0.8
-            )
+            memory.add_memory("analysis", {"text": f"Important insight {i}"}, importance=0.6)
         
-        initial_long_term = len(memory.long_term)
+        assert len(memory.long_term_memory) == 0
         
-        # Consolidate
-        consolidated = memory.consolidate_memories(threshold=0.7)
+        stats = memory.consolidate_memories()
         
-        # Some should be promoted to long-term
-        assert len(memory.long_term) > initial_long_term
-        assert consolidated > 0
+        assert stats["promoted"] == 10
+        assert len(memory.long_term_memory) == 10
     
-    def test_memory_relevance_scoring(self, memory):
+    def test_memory_relevance_scoring(self):
         """Test relevance scoring."""
-        import time
+        now = datetime(2024, 6, 1)
         
-        # Add old memory
+        # Old memory, accessed once
         old_entry = MemoryEntry(
-            content="Old memory",
-            memory_type=MemoryType.LONG_TERM,
-            importance=0.5
+            entry_id="old",
+            entry_type="analysis",
+            content={"text": "Old memory"},
+            timestamp=datetime(2020, 1, 1)
         )
-        old_entry.timestamp = datetime(2020, 1, 1)
-        old_entry.access_count = 1
-        memory.long_term.append(old_entry)
+        old_entry.access(now)
         
-        # Add recent memory
+        # Recent memory, accessed five times
         recent_entry = MemoryEntry(
-            content="Recent memory",
-            memory_type=MemoryType.LONG_TERM,
-            importance=0.5
+            entry_id="recent",
+            entry_type="analysis",
+            content={"text": "Recent memory"},
+            timestamp=now
         )
-        recent_entry.access_count = 5
-        memory.long_term.append(recent_entry)
+        for _ in range(5):
+            recent_entry.access(now)
         
         # Recent memory should have higher relevance
-        old_relevance = memory._calculate_relevance(old_entry)
-        recent_relevance = memory._calculate_relevance(recent_entry)
-        
-        assert recent_relevance > old_relevance
+        assert recent_entry.calculate_relevance(now) > old_entry.calculate_relevance(now)
     
-    def test_cleanup_expired_memories(self, memory):
-        """Test cleanup of expired memories."""
-        # Add expired memory
-        expired_entry = MemoryEntry(
-            content="Expired",
-            memory_type=MemoryType.SHORT_TERM
+    def test_long_term_pruning_keeps_most_relevant(self):
+        """Test long-term memory drops its least relevant entry past capacity."""
+        memory = AgentMemory(
+            agent_id="test_agent",
+            long_term_capacity=2,
+            clock=lambda: datetime(2024, 1, 1)
         )
-        expired_entry.timestamp = datetime(2020, 1, 1)
-        memory.short_term.append(expired_entry)
-        
-        # Add fresh memory
-        memory.add_memory("Fresh", MemoryType.SHORT_TERM)
         
-        # Cleanup
-        removed = memory.cleanup_expired(max_age_days=30)
+        low = memory.add_memory("learning", {"text": "Minor"}, importance=0.7)
+        memory.add_memory("learning", {"text": "Key"}, importance=0.95)
+        memory.add_memory("learning", {"text": "Useful"}, importance=0.8)
         
-        assert removed > 0
-        assert len(memory.short_term) == 1
-        assert memory.short_term[0].content == "Fresh"
+        assert len(memory.long_term_memory) == 2
+        assert low not in memory.long_term_memory
     
     def test_export_import_memories(self, memory):
         """Test memory export and import."""
-        # Add memories
-        memory.add_memory("Test memory 1", MemoryType.SHORT_TERM)
-        memory.add_memory("Test memory 2", MemoryType.LONG_TERM, importance=0.9)
-        
-        # Export
-        exported = memory.export_memories()
+        memory.add_memory("analysis", {"text": "Test memory 1"})
+        memory.add_memory("learning", {"text": "Test memory 2"}, importance=0.9)
         
-        assert isinstance(exported, dict)
-        assert "agent_id" in exported
-        assert "short_term" in exported
-        assert "long_term" in exported
+        exported = memory.export_to_json()
         
-        # Create new memory and import
         new_memory = AgentMemory(agent_id="test_agent_2")
-        new_memory.import_memories(exported)
+        new_memory.import_from_json(exported)
         
-        assert len(new_memory.short_term) == len(memory.short_term)
-        assert len(new_memory.long_term) == len(memory.long_term)
+        assert len(new_memory.short_term_memory) == len(memory.short_term_memory)
+        assert len(new_memory.long_term_memory) == len(memory.long_term_memory)
+        assert new_memory.search_memories("memory 2")[0].importance == 0.9
 
 
-@pytest.mark.asyncio
+@pytest.mark.slow
 async def test_full_orchestration_flow(sample_agent_responses):
     """Integration test: full orchestration flow."""
     orchestrator = OrchestratorAgent()
@@ -398,7 +391,7 @@ async def test_full_orchestration_flow(sample_agent_responses):
     debate_results = await simulator.run_debate(sample_agent_responses, context)
     
     # Validate results
-    assert debate_results["final_recommendation"] in ["BUY", "HOLD", "SELL"]
+    assert debate_results["final_recommendation"] in _VALID_RECS
     assert 0 <= debate_results["confidence"] <= 1
     assert len(debate_results["debate_rounds"]) > 0
     
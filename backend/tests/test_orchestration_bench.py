@@ -0,0 +1,54 @@
+"""
+Micro-benchmarks for the debate simulator's per-round helpers.
+
+Run with: pytest tests/test_orchestration_bench.py --benchmark-only
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.core.reasoning.debate_simulator import DebateSimulator
+from app.core.agents.base_agent import AgentRole, AgentResponse
+
+
+@pytest.fixture(scope="module")
+def simulator():
+    """Debate simulator loaded with a mixed five-agent committee."""
+    recommendations = ["BUY", "SELL", "HOLD", "BUY", "SELL"]
+    roles = [role for role in AgentRole if role != AgentRole.ORCHESTRATOR]
+    
+    sim = DebateSimulator(max_rounds=3)
+    sim.agent_responses = {
+        role: AgentResponse(
+            agent_role=role,
+            analysis=f"{role.value} analysis",
+            recommendation=recommendation,
+            confidence=0.5 + 0.1 * i,
+            supporting_data={"metric": i},
+            frameworks_used=["DCF"],
+            concerns=["Valuation", f"Concern {i}"],
+            opportunities=["Market share", f"Opportunity {i}"]
+        )
+        for i, (role, recommendation) in enumerate(zip(roles, recommendations))
+    }
+    return sim
+
+
+def test_identify_conflicts_bench(benchmark, simulator):
+    """Benchmark pairwise conflict detection."""
+    conflicts = benchmark(simulator._identify_conflicts)
+    
+    assert len(conflicts) == 4
+
+
+def test_check_consensus_bench(benchmark, simulator):
+    """Benchmark the per-round consensus check."""
+    assert benchmark(simulator._check_consensus) is False
+
+
+def test_find_common_items_bench(benchmark, simulator):
+    """Benchmark common concern detection."""
+    concerns = [c for r in simulator.agent_responses.values() for c in r.concerns]
+    
+    assert benchmark(simulator._find_common_items, concerns) == ["Valuation"]
@@ -2,6 +2,7 @@
 Tests for RAG System.
 """
 
+import numpy as np
 import pytest
 from pathlib import Path
 
@@ -45,22 +46,26 @@ class TestDataPreparation:
         assert len(chunks) > 0
         assert all(isinstance(chunk, FrameworkChunk) for chunk in chunks)
         assert any(chunk.chunk_type == "overview" for chunk in chunks)
+        
+        # Chunks are immutable value objects, so duplicates collapse in a set
+        assert len(set(chunks + chunks)) == len(chunks)
+        with pytest.raises(AttributeError):
+            chunks[0].content = "changed"
 
 
 class TestEmbeddingIndexer:
     """Tests for EmbeddingIndexer class."""
     
     @pytest.mark.slow
-    def test_load_model(self):
+    @pytest.mark.xdist_group(name="embedding")
+    def test_load_model(self, minilm_indexer):
         """Test loading sentence-transformers model."""
-        indexer = EmbeddingIndexer(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        indexer.load_model()
-        
-        assert indexer.model is not None
-        assert indexer.model.get_sentence_embedding_dimension() > 0
+        assert minilm_indexer.model is not None
+        assert minilm_indexer.model.get_sentence_embedding_dimension() > 0
     
     @pytest.mark.slow
-    def test_generate_embeddings(self, tmp_path):
+    @pytest.mark.xdist_group(name="embedding")
+    def test_generate_embeddings(self, tmp_path, minilm_indexer):
         """Test generating embeddings from chunks."""
         # Create test chunks
         chunks_file = tmp_path / "chunks.json"
@@ -74,13 +79,130 @@ class TestEmbeddingIndexer:
         }]''')
         
         indexer = EmbeddingIndexer(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        indexer.load_model()
+        indexer.model = minilm_indexer.model
         indexer.load_chunks(str(chunks_file))
         embeddings = indexer.generate_embeddings()
         
         assert embeddings is not None
         assert len(embeddings) == 1
         assert embeddings.shape[1] > 0
+    
+    @pytest.mark.slow
+    @pytest.mark.xdist_group(name="embedding")
+    @pytest.mark.parametrize("n_chunks", [1, 256])
+    def test_generate_embeddings_batched(self, n_chunks, minilm_indexer):
+        """Test embedding many chunks in one normalized, batched encode call."""
+        indexer = EmbeddingIndexer(
+            model_name="sentence-transformers/all-MiniLM-L6-v2",
+            max_batch_size=64
+        )
+        indexer.model = minilm_indexer.model
+        indexer.chunks = [{"content": f"Synthetic chunk {i}"} for i in range(n_chunks)]
+        embeddings = indexer.generate_embeddings()
+        
+        assert embeddings.shape[0] == n_chunks
+        assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
+    
+    def test_int8_index_stores_one_byte_per_dimension(self):
+        """Test the INT8 index quantizes vectors and still finds exact matches."""
+        pytest.importorskip("faiss")
+        
+        rng = np.random.default_rng(0)
+        indexer = EmbeddingIndexer(index_type="int8")
+        indexer.embeddings = rng.standard_normal((50, 384)).astype(np.float32)
+        index = indexer.create_index()
+        
+        assert index.ntotal == 50
+        assert index.code_size == 384
+        
+        _, indices = index.search(indexer.embeddings[:5], 1)
+        assert indices[:, 0].tolist() == [0, 1, 2, 3, 4]
+    
+    def test_two_stage_recall(self):
+        """Test INT8 shortlisting plus FP32 rescoring matches exact search."""
+        faiss = pytest.importorskip("faiss")
+        
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((1000, 64)).astype(np.float32)
+        queries = rng.standard_normal((50, 64)).astype(np.float32)
+        
+        indexer = EmbeddingIndexer(index_type="int8_refine")
+        indexer.embeddings = vectors
+        index = indexer.create_index()
+        exact = faiss.IndexFlatL2(64)
+        exact.add(vectors)
+        
+        _, approx_ids = index.search(queries, 10)
+        _, exact_ids = exact.search(queries, 10)
+        overlap = np.mean([
+            len(set(a) & set(b)) / 10 for a, b in zip(approx_ids, exact_ids)
+        ])
+        
+        assert overlap >= 0.95
+    
+    def test_flatip_index_ranks_by_cosine(self):
+        """Test the inner-product index returns the most similar vector first."""
+        pytest.importorskip("faiss")
+        
+        indexer = EmbeddingIndexer(index_type="flatip")
+        indexer.embeddings = np.array(
+            [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]], dtype=np.float32
+        )
+        index = indexer.create_index()
+        
+        scores, indices = index.search(np.array([[0.0, 1.0]], dtype=np.float32), 3)
+        assert indices[0].tolist() == [2, 1, 0]
+        assert scores[0].tolist() == pytest.approx([1.0, 0.8, 0.0])
+    
+    def test_save_and_load_index(self, tmp_path):
+        """Test a saved index can be loaded back and searched."""
+        pytest.importorskip("faiss")
+        
+        rng = np.random.default_rng(0)
+        builder = EmbeddingIndexer(index_type="int8")
+        builder.embeddings = rng.standard_normal((20, 64)).astype(np.float32)
+        builder.create_index()
+        builder.save_index(str(tmp_path / "faiss.index"))
+        
+        loader = EmbeddingIndexer()
+        index = loader.load_index(str(tmp_path / "faiss.index"))
+        
+        _, indices = index.search(builder.embeddings[:3], 1)
+        assert index.ntotal == 20
+        assert indices[:, 0].tolist() == [0, 1, 2]
+
+
+class TestQuerySystem:
+    """Tests for QuerySystem class."""
+    
+    def test_rerank_returns_top_k_sorted(self, tmp_path):
+        """Test reranking keeps only the best-scoring candidates, best first."""
+        class LengthReranker:
+            def predict(self, pairs):
+                return [float(len(content)) for _, content in pairs]
+        
+        query_system = QuerySystem(
+            index_path=str(tmp_path / "faiss.index"),
+            metadata_path=str(tmp_path / "metadata.json")
+        )
+        query_system.reranker = LengthReranker()
+        query_system.chunks = [
+            {
+                "chunk_id": f"chunk_{i}",
+                "framework_name": f"Framework {i}",
+                "framework_category": "Test",
+                "chunk_type": "overview",
+                "content": "x" * length
+            }
+            for i, length in enumerate([3, 9, 1, 7, 5])
+        ]
+        
+        candidates = [(i, 0.0) for i in range(5)]
+        results = query_system._rerank("query", candidates, top_k=3)
+        
+        assert [r.chunk_id for r in results] == ["chunk_1", "chunk_3", "chunk_4"]
+        assert [r.score for r in results] == [9.0, 7.0, 5.0]
+        assert query_system._rerank("query", candidates, top_k=10)[-1].chunk_id == "chunk_2"
 
 
 class TestRAGSystem:
@@ -101,8 +223,54 @@ class TestRAGSystem:
         assert rag.kb_path.exists()
         assert not rag._initialized
     
+    def test_query_cache_hit(self, tmp_path):
+        """Test repeating a query is served from the RAG cache."""
+        class CountingQuerySystem:
+            calls = 0
+            
+            def retrieve(self, query, top_k, rerank_top_k, min_score):
+                self.calls += 1
+                return [f"result for {query}"]
+        
+        rag = RAGSystem(kb_path=str(tmp_path / "kb.json"), index_dir=str(tmp_path / "index"))
+        rag.query_system = CountingQuerySystem()
+        rag._initialized = True
+        
+        first = rag.query("How to value a company?", top_k=3)
+        second = rag.query("How to value a company?", top_k=3)
+        rag.query("How to value a company?", top_k=5)
+        
+        assert first == second == ["result for How to value a company?"]
+        assert rag.query_system.calls == 2
+    
+    def test_query_cache_keyed_by_models_and_cleared_on_build(self, tmp_path, monkeypatch):
+        """Test cached results are not shared across models or index rebuilds."""
+        class CountingQuerySystem:
+            calls = 0
+            
+            def retrieve(self, query, top_k, rerank_top_k, min_score):
+                self.calls += 1
+                return [f"result for {query}"]
+        
+        monkeypatch.setattr("app.core.rag.rag_system.build_index", lambda **kwargs: None)
+        kb_file = tmp_path / "kb.json"
+        kb_file.write_text('[{"name": "Test", "category": "Test", "description": "Test"}]')
+        
+        rag = RAGSystem(kb_path=str(kb_file), index_dir=str(tmp_path / "index"))
+        rag.query_system = CountingQuerySystem()
+        rag._initialized = True
+        
+        rag.query("What is a moat?")
+        rag.reranker_model = "cross-encoder/other"
+        rag.query("What is a moat?")
+        rag.build_index(force_rebuild=True)
+        rag.query("What is a moat?")
+        
+        assert rag.query_system.calls == 3
+    
     @pytest.mark.slow
-    def test_build_and_query(self, tmp_path):
+    @pytest.mark.xdist_group(name="embedding")
+    def test_build_and_query(self, tmp_path, minilm_indexer):
         """Test building index and querying."""
         # Create test knowledge base
         kb_file = tmp_path / "kb.json"
@@ -120,7 +288,8 @@ class TestRAGSystem:
         rag = RAGSystem(
             kb_path=str(kb_file),
             index_dir=str(index_dir),
-            embedding_model="sentence-transformers/all-MiniLM-L6-v2"
+            embedding_model="sentence-transformers/all-MiniLM-L6-v2",
+            embedding_model_instance=minilm_indexer.model
         )
         
         # Build index
@@ -135,6 +304,22 @@ class TestRAGSystem:
         assert len(results) > 0
         assert results[0].framework_name == "DCF Valuation"
         assert results[0].score > 0
+    
+    @pytest.mark.slow
+    @pytest.mark.xdist_group(name="embedding")
+    def test_faiss_index_persisted(self, tmp_path, sample_kb_path, minilm_indexer):
+        """Test building writes the FAISS index and metadata to the index dir."""
+        rag = RAGSystem(
+            kb_path=str(sample_kb_path),
+            index_dir=str(tmp_path / "index"),
+            embedding_model="sentence-transformers/all-MiniLM-L6-v2",
+            embedding_model_instance=minilm_indexer.model
+        )
+        
+        rag.build_index()
+        
+        assert rag.index_path.is_file()
+        assert rag.metadata_path.is_file()
 
 
 @pytest.fixture
@@ -3,8 +3,8 @@ Tests for utility modules: caching, rate limiting, and monitoring.
 """
 
 import pytest
-import time
 import asyncio
+import threading
 from datetime import datetime, timedelta
 
 from app.core.utils.caching import (
@@ -29,13 +29,38 @@ from app.core.utils.monitoring import (
 )
 
 
+class FakeClock:
+    """Manually advanced clock for the cache and rate limiter time seams."""
+    
+    def __init__(self):
+        self.seconds = 1_000.0
+    
+    def advance(self, seconds: float) -> None:
+        """Move time forward."""
+        self.seconds += seconds
+    
+    def monotonic(self) -> float:
+        """Seconds on a monotonic scale, like time.monotonic()."""
+        return self.seconds
+    
+    def utcnow(self) -> datetime:
+        """Naive UTC timestamp, like datetime.utcnow()."""
+        return datetime(2024, 1, 1) + timedelta(seconds=self.seconds)
+
+
+@pytest.fixture
+def clock():
+    """Provide a fresh fake clock."""
+    return FakeClock()
+
+
 class TestInMemoryCache:
     """Tests for InMemoryCache."""
     
     @pytest.fixture
-    def cache(self):
-        """Create cache instance."""
-        return InMemoryCache(max_size=10, default_ttl=5)
+    def cache(self, clock):
+        """Create cache instance on a fake clock."""
+        return InMemoryCache(max_size=10, default_ttl=5, clock=clock.utcnow)
     
     def test_cache_initialization(self, cache):
         """Test cache is properly initialized."""
@@ -52,12 +77,12 @@ class TestInMemoryCache:
         """Test getting nonexistent key returns None."""
         assert cache.get("nonexistent") is None
     
-    def test_ttl_expiration(self, cache):
+    def test_ttl_expiration(self, cache, clock):
         """Test TTL expiration."""
         cache.set("key1", "value1", ttl=1)
         assert cache.get("key1") == "value1"
         
-        time.sleep(1.5)
+        clock.advance(1.5)
         assert cache.get("key1") is None
     
     def test_lru_eviction(self, cache):
@@ -76,6 +101,20 @@ class TestInMemoryCache:
         assert cache.get("key1") is None  # Should be evicted
         assert cache.get("key10") is not None  # New key
     
+    def test_lru_eviction_at_scale(self):
+        """Test bookkeeping stays bounded when most inserts trigger an eviction."""
+        cache = InMemoryCache(max_size=1000, default_ttl=60)
+        
+        for i in range(10_000):
+            cache.set(f"key{i}", i)
+            cache.get(f"key{i}")
+        
+        assert len(cache.cache) == 1000
+        assert cache.get("key8999") is None
+        assert cache.get("key9000") == 9000
+        # Stale expiry entries for evicted keys are compacted away
+        assert len(cache._expiry_heap) <= 2 * cache.max_size + 1
+    
     def test_delete(self, cache):
         """Test deleting keys."""
         cache.set("key1", "value1")
@@ -106,19 +145,66 @@ class TestInMemoryCache:
         assert stats["size"] == 1
         assert stats["hit_rate"] == 0.5
     
-    def test_cleanup_expired(self, cache):
+    def test_cleanup_expired(self, cache, clock):
         """Test cleanup of expired entries."""
         cache.set("key1", "value1", ttl=1)
         cache.set("key2", "value2", ttl=10)
         
-        time.sleep(1.5)
+        clock.advance(1.5)
         
         removed = cache.cleanup_expired()
         
         assert removed == 1
         assert cache.get("key1") is None
         assert cache.get("key2") is not None
+    
+    def test_cleanup_scales(self):
+        """Test cleanup only visits expired entries."""
+        cache = InMemoryCache(max_size=10_000, default_ttl=60)
+        for i in range(10_000):
+            cache.set(f"key{i}", i, ttl=-1 if i % 2 else 60)
+        
+        removed = cache.cleanup_expired()
+        
+        assert removed == 5_000
+        assert len(cache.cache) == 5_000
+        # Live entries were never popped off the expiry heap
+        assert len(cache._expiry_heap) == 5_000
 
+    
+    def test_concurrent_access(self):
+        """Test worker threads can share a cache while it evicts."""
+        cache = InMemoryCache(max_size=50, default_ttl=60)
+        errors = []
+        
+        def worker(offset):
+            try:
+                for i in range(2_000):
+                    cache.set(f"key{offset + i % 100}", i)
+                    cache.get(f"key{offset + (i * 7) % 100}")
+                    cache.cleanup_expired()
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(n * 50,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert len(cache.cache) == 50
+    
+    def test_copy_values(self):
+        """Test a copying cache is unaffected by callers mutating values."""
+        cache = InMemoryCache(copy_values=True)
+        response = {"data": {"price": 100}}
+        cache.set("key1", response)
+        
+        response["data"]["price"] = 0
+        cache.get("key1")["data"]["price"] = -1
+        
+        assert cache.get("key1") == {"data": {"price": 100}}
 
 class TestCacheManager:
     """Tests for CacheManager."""
@@ -145,14 +231,13 @@ class TestCacheManager:
     
     def test_cleanup_all(self, manager):
         """Test cleanup of all caches."""
-        # Add expired entries
-        manager.api_cache.set("key1", "value1", ttl=1)
-        time.sleep(1.5)
+        # Add an already-expired entry
+        manager.api_cache.set("key1", "value1", ttl=-1)
         
         results = manager.cleanup_all()
         
         assert isinstance(results, dict)
-        assert "api" in results
+        assert results["api"] == 1
     
     def test_get_all_statistics(self, manager):
         """Test getting statistics for all caches."""
@@ -172,6 +257,11 @@ def test_generate_cache_key():
     
     assert key1 == key2  # Same args should produce same key
     assert key1 != key3  # Different args should produce different key
+    assert len(key1) == 32
+    
+    # Values orjson cannot encode natively still produce stable keys
+    assert generate_cache_key(2**70, when=datetime(2024, 1, 1)) == \
+        generate_cache_key(2**70, when=datetime(2024, 1, 1))
 
 
 def test_cached_decorator():
@@ -200,7 +290,6 @@ def test_cached_decorator():
     assert call_count == 2
 
 
-@pytest.mark.asyncio
 async def test_cached_async_decorator():
     """Test cached_async decorator."""
     call_count = 0
@@ -234,9 +323,9 @@ class TestTokenBucket:
         assert bucket.refill_rate == 1.0
         assert bucket.tokens == 10
     
-    def test_consume_tokens(self):
+    def test_consume_tokens(self, clock):
         """Test consuming tokens."""
-        bucket = TokenBucket(capacity=10, refill_rate=1.0)
+        bucket = TokenBucket(capacity=10, refill_rate=1.0, clock=clock.monotonic)
         
         assert bucket.consume(5) is True
         assert bucket.tokens == 5
@@ -246,17 +335,17 @@ class TestTokenBucket:
         
         assert bucket.consume(1) is False  # No tokens left
     
-    def test_token_refill(self):
+    def test_token_refill(self, clock):
         """Test token refill over time."""
-        bucket = TokenBucket(capacity=10, refill_rate=10.0)  # 10 tokens/second
+        bucket = TokenBucket(capacity=10, refill_rate=10.0, clock=clock.monotonic)  # 10 tokens/second
         
         bucket.consume(10)  # Empty bucket
         assert bucket.tokens == 0
         
-        time.sleep(0.5)  # Wait for refill
+        clock.advance(0.5)  # Wait for refill
         bucket._refill()
         
-        assert bucket.tokens >= 4  # Should have refilled ~5 tokens
+        assert bucket.tokens == 5
     
     def test_wait_time_calculation(self):
         """Test wait time calculation."""
@@ -266,6 +355,23 @@ class TestTokenBucket:
         
         wait_time = bucket.wait_time(5)
         assert wait_time >= 4.5  # Need to wait for 5 tokens at 1/sec
+    
+    def test_concurrent_consume(self):
+        """Test concurrent consumers never over-allow."""
+        bucket = TokenBucket(capacity=100, refill_rate=0.001)
+        allowed = []
+        
+        def worker():
+            for _ in range(50):
+                allowed.append(bucket.consume())
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sum(allowed) == 100
 
 
 class TestSlidingWindowCounter:
@@ -287,9 +393,9 @@ class TestSlidingWindowCounter:
         
         assert window.is_allowed() is False  # Exceeded limit
     
-    def test_window_sliding(self):
+    def test_window_sliding(self, clock):
         """Test window slides over time."""
-        window = SlidingWindowCounter(max_requests=3, window_seconds=1)
+        window = SlidingWindowCounter(max_requests=3, window_seconds=1, clock=clock.monotonic)
         
         # Fill window
         for i in range(3):
@@ -298,9 +404,33 @@ class TestSlidingWindowCounter:
         assert window.is_allowed() is False
         
         # Wait for window to slide
-        time.sleep(1.1)
+        clock.advance(1.1)
         
         assert window.is_allowed() is True  # Window has slid
+    
+    def test_wait_time_when_full(self):
+        """Test wait time is bounded by the window once it is full."""
+        window = SlidingWindowCounter(max_requests=2, window_seconds=1, buckets=4)
+        
+        assert window.wait_time() == 0.0
+        
+        window.is_allowed()
+        window.is_allowed()
+        
+        assert 0.0 < window.wait_time() <= 1.0
+    
+    def test_sliding_window_large_volume(self, clock):
+        """Test a saturated window keeps denying without growing its state."""
+        window = SlidingWindowCounter(
+            max_requests=1000, window_seconds=60, clock=clock.monotonic
+        )
+        
+        allowed = sum(window.is_allowed() for _ in range(100_000))
+        
+        assert allowed == 1000
+        # Denied requests are not recorded; state is one count per bucket
+        assert window._total == 1000
+        assert len(window._counts) == window.buckets
 
 
 class TestRateLimiter:
@@ -331,18 +461,59 @@ class TestRateLimiter:
         # Should be rate limited
         assert limiter.check_user_limit(user_id) is False
     
+    def test_user_limiters_evict_lru(self, limiter):
+        """Test least recently seen user buckets are evicted at capacity."""
+        limiter.MAX_TRACKED_USERS = 3
+        
+        for user_id in ("user_a", "user_b", "user_c"):
+            limiter.check_user_limit(user_id)
+        
+        limiter.check_user_limit("user_a")  # Refresh user_a
+        limiter.check_user_limit("user_d")
+        
+        assert list(limiter.user_limiters) == ["user_c", "user_a", "user_d"]
+    
+    def test_user_limiters_concurrent_eviction(self, limiter):
+        """Test request threads can share the user LRU while it evicts."""
+        limiter.MAX_TRACKED_USERS = 20
+        errors = []
+        
+        def worker(offset):
+            try:
+                for i in range(2_000):
+                    limiter.check_user_limit(f"user_{(offset + i) % 60}")
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert len(limiter.user_limiters) == 20
+    
     def test_check_endpoint_limit(self, limiter):
         """Test endpoint rate limiting."""
         endpoint = "/api/analyze"
         
         assert limiter.check_endpoint_limit(endpoint) is True
     
+    def test_register_endpoints(self, limiter):
+        """Test endpoints registered up front use the configured window."""
+        limiter.register_endpoints(["/api/v1/data"], max_requests=2, window_seconds=60)
+        
+        assert limiter.endpoint_limiters["/api/v1/data"].max_requests == 2
+        assert limiter.check_endpoint_limit("/api/v1/data") is True
+        assert limiter.check_endpoint_limit("/api/v1/data") is True
+        assert limiter.check_endpoint_limit("/api/v1/data") is False
+    
     def test_check_external_api_limit(self, limiter):
         """Test external API rate limiting."""
         assert limiter.check_external_api_limit("openai") is True
         assert limiter.check_external_api_limit("anthropic") is True
     
-    @pytest.mark.asyncio
     async def test_wait_for_external_api(self, limiter):
         """Test waiting for external API quota."""
         # This should complete without error
@@ -404,6 +575,20 @@ class TestMetricsCollector:
         
         assert stats["count"] == 2
         assert stats["mean"] == 0.15
+    
+    def test_histogram_memory_is_bounded(self, collector):
+        """Test histograms keep a fixed-size window of recent samples."""
+        for i in range(5000):
+            collector.record_histogram("latency", float(i))
+        
+        window = collector.histograms["latency"]
+        stats = collector.get_histogram_stats("latency")
+        
+        assert window._buf.nbytes == 1000 * 8
+        assert stats["count"] == 1000
+        assert stats["min"] == 4000.0
+        assert stats["max"] == 4999.0
+        assert stats["median"] == 4500.0
 
 
 class TestPerformanceMonitor:
@@ -458,7 +643,6 @@ class TestPerformanceMonitor:
         assert "cache_metrics" in report
 
 
-@pytest.mark.asyncio
 async def test_track_performance_decorator():
     """Test track_performance decorator."""
     monitor = get_performance_monitor()
@@ -0,0 +1,35 @@
+"""
+Micro-benchmarks for the cache and rate limiter hot paths.
+
+Run with: pytest tests/test_utils_bench.py --benchmark-only
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.core.utils.caching import InMemoryCache
+from app.core.utils.rate_limiter import SlidingWindowCounter
+
+
+def test_cache_set_get_with_eviction_bench(benchmark):
+    """Benchmark set+get on a full cache, where every insert evicts."""
+    def run():
+        cache = InMemoryCache(max_size=1000, default_ttl=60)
+        for i in range(10_000):
+            cache.set(f"key{i}", i)
+            cache.get(f"key{i}")
+        return cache
+    
+    cache = benchmark(run)
+    
+    assert len(cache.cache) == 1000
+
+
+def test_sliding_window_saturated_bench(benchmark):
+    """Benchmark allow/deny decisions on a window that fills up and saturates."""
+    def run():
+        window = SlidingWindowCounter(max_requests=1000, window_seconds=60)
+        return sum(window.is_allowed() for _ in range(100_000))
+    
+    assert benchmark(run) == 1000
@@ -3,72 +3,94 @@ Sprint 1 Validation Script
 Validates that all components are properly implemented.
 """
 
+import os
 import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-def check_file_exists(path: str, description: str) -> bool:
-    """Check if a file exists."""
-    if Path(path).exists():
+# (section heading, [(path, description), ...]) in report order
+CHECKS = [
+    ("📚 RAG System Components:", [
+        ("backend/app/core/rag/data_preparation.py", "Data Preparation"),
+        ("backend/app/core/rag/embedding_indexer.py", "Embedding Indexer"),
+        ("backend/app/core/rag/query_system.py", "Query System"),
+        ("backend/app/core/rag/rag_system.py", "RAG System Integration"),
+        ("backend/app/core/rag/investment_kb_enriched.json", "Knowledge Base"),
+    ]),
+    ("📊 Data Fetchers:", [
+        ("backend/app/data/fetchers/polygon_fetcher.py", "Polygon.io Fetcher"),
+        ("backend/app/data/fetchers/fmp_fetcher.py", "FMP Fetcher"),
+        ("backend/app/data/fetchers/fred_fetcher.py", "FRED Fetcher"),
+        ("backend/app/data/fetchers/trading_economics_fetcher.py", "Trading Economics Fetcher"),
+        ("backend/app/data/fetchers/reddit_fetcher.py", "Reddit Fetcher"),
+    ]),
+    ("📄 Document Processors:", [
+        ("backend/app/data/processors/pdf_processor.py", "PDF Processor"),
+        ("backend/app/data/processors/docx_processor.py", "DOCX Processor"),
+        ("backend/app/data/processors/xlsx_processor.py", "XLSX Processor"),
+        ("backend/app/data/processors/document_processor.py", "Document Processor Integration"),
+    ]),
+    ("🌐 API Endpoints:", [
+        ("backend/app/api/endpoints/rag.py", "RAG Endpoints"),
+        ("backend/app/api/endpoints/data.py", "Data Endpoints"),
+        ("backend/app/api/schemas/rag_schemas.py", "RAG Schemas"),
+        ("backend/app/api/schemas/data_schemas.py", "Data Schemas"),
+    ]),
+    ("🧪 Tests:", [
+        ("backend/tests/test_rag_system.py", "RAG System Tests"),
+        ("backend/tests/test_data_layer.py", "Data Layer Tests"),
+        ("backend/tests/conftest.py", "Test Configuration"),
+    ]),
+    ("🐳 Infrastructure:", [
+        ("docker-compose.yml", "Docker Compose"),
+        ("backend/Dockerfile", "Backend Dockerfile"),
+        (".env", "Environment Variables"),
+        ("backend/requirements.txt", "Python Requirements"),
+    ]),
+    ("📖 Documentation:", [
+        ("README.md", "Main README"),
+        (".gitignore", "Git Ignore"),
+    ]),
+]
+
+def list_directory(directory: str) -> set[str]:
+    """List the entry names of a directory (empty if it is missing)."""
+    try:
+        with os.scandir(directory or ".") as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def check_file_exists(path: str, listings: dict[str, set[str]]) -> bool:
+    """Check if a file exists, using the pre-read directory listings."""
+    directory, name = os.path.split(path)
+    return name in listings[directory]
+
+def report(description: str, exists: bool) -> bool:
+    """Print the result line for one check."""
+    if exists:
         print(f"✓ {description}")
-        return True
     else:
         print(f"✗ {description} - NOT FOUND")
-        return False
+    return exists
 
 def main():
     print("=" * 60)
     print("Fyn RAG - Sprint 1 Validation")
     print("=" * 60)
     
-    all_passed = True
-    
-    # Core RAG System
-    print("\n📚 RAG System Components:")
-    all_passed &= check_file_exists("backend/app/core/rag/data_preparation.py", "Data Preparation")
-    all_passed &= check_file_exists("backend/app/core/rag/embedding_indexer.py", "Embedding Indexer")
-    all_passed &= check_file_exists("backend/app/core/rag/query_system.py", "Query System")
-    all_passed &= check_file_exists("backend/app/core/rag/rag_system.py", "RAG System Integration")
-    all_passed &= check_file_exists("backend/app/core/rag/investment_kb_enriched.json", "Knowledge Base")
+    # Read each directory once, concurrently, instead of stat-ing every path
+    directories = list(dict.fromkeys(
+        os.path.dirname(path) for _, checks in CHECKS for path, _ in checks
+    ))
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        listings = dict(zip(directories, executor.map(list_directory, directories)))
     
-    # Data Fetchers
-    print("\n📊 Data Fetchers:")
-    all_passed &= check_file_exists("backend/app/data/fetchers/polygon_fetcher.py", "Polygon.io Fetcher")
-    all_passed &= check_file_exists("backend/app/data/fetchers/fmp_fetcher.py", "FMP Fetcher")
-    all_passed &= check_file_exists("backend/app/data/fetchers/fred_fetcher.py", "FRED Fetcher")
-    all_passed &= check_file_exists("backend/app/data/fetchers/trading_economics_fetcher.py", "Trading Economics Fetcher")
-    all_passed &= check_file_exists("backend/app/data/fetchers/reddit_fetcher.py", "Reddit Fetcher")
-    
-    # Document Processors
-    print("\n📄 Document Processors:")
-    all_passed &= check_file_exists("backend/app/data/processors/pdf_processor.py", "PDF Processor")
-    all_passed &= check_file_exists("backend/app/data/processors/docx_processor.py", "DOCX Processor")
-    all_passed &= check_file_exists("backend/app/data/processors/xlsx_processor.py", "XLSX Processor")
-    all_passed &= check_file_exists("backend/app/data/processors/document_processor.py", "Document Processor Integration")
-    
-    # API Endpoints
-    print("\n🌐 API Endpoints:")
-    all_passed &= check_file_exists("backend/app/api/endpoints/rag.py", "RAG Endpoints")
-    all_passed &= check_file_exists("backend/app/api/endpoints/data.py", "Data Endpoints")
-    all_passed &= check_file_exists("backend/app/api/schemas/rag_schemas.py", "RAG Schemas")
-    all_passed &= check_file_exists("backend/app/api/schemas/data_schemas.py", "Data Schemas")
-    
-    # Tests
-    print("\n🧪 Tests:")
-    all_passed &= check_file_exists("backend/tests/test_rag_system.py", "RAG System Tests")
-    all_passed &= check_file_exists("backend/tests/test_data_layer.py", "Data Layer Tests")
-    all_passed &= check_file_exists("backend/tests/conftest.py", "Test Configuration")
-    
-    # Infrastructure
-    print("\n🐳 Infrastructure:")
-    all_passed &= check_file_exists("docker-compose.yml", "Docker Compose")
-    all_passed &= check_file_exists("backend/Dockerfile", "Backend Dockerfile")
-    all_passed &= check_file_exists(".env", "Environment Variables")
-    all_passed &= check_file_exists("backend/requirements.txt", "Python Requirements")
+    all_passed = True
     
-    # Documentation
-    print("\n📖 Documentation:")
-    all_passed &= check_file_exists("README.md", "Main README")
-    all_passed &= check_file_exists(".gitignore", "Git Ignore")
+    for heading, checks in CHECKS:
+        print(f"\n{heading}")
+        for path, description in checks:
+            all_passed &= report(description, check_file_exists(path, listings))
     
     print("\n" + "=" * 60)
     if all_passed: